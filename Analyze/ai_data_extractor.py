@@ -4,34 +4,790 @@ AI-Powered Data Extraction Module
 Uses Groq API to extract structured data from resume text.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
-from typing import Dict, List
+import tempfile
+import time
+import weakref
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import dotenv
-from groq import Groq
+from asgiref.sync import async_to_sync, sync_to_async
+from groq import AsyncGroq, BadRequestError, Groq, RateLimitError
+
+from .cache_backends import (
+    CacheBackend,
+    DatabaseCacheBackend,
+    DiskCacheBackend,
+    DjangoCacheBackend,
+    MemoryCacheBackend,
+)
+from .groq_transport import GroqTransport
+from .prompt_compaction import compact_resume_text, estimate_tokens
+from .rate_limiter import (
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TOKENS_PER_MINUTE,
+    RateLimiter,
+    retry_after_seconds,
+)
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    get_circuit_breaker,
+    is_outage_error,
+)
+from .section_extraction import (
+    DEFAULT_SECTION_MIN_TOKENS,
+    get_section_pool,
+    plan_section_prompts,
+)
+from .streaming_json import IncrementalJSONObjectParser
+from .structured_output import failed_generation, parse_extraction
 
 # Load environment variables
 dotenv.load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
+
+# Bump whenever the prompt or the response mapping changes so cached results
+# produced by the old version are ignored
+PROMPT_VERSION = "2"
+
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60  # One week, in seconds
+
+# Groq requests one process keeps in flight on the async path
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Estimated tokens of resume text sent with the prompt; longer resumes lose
+# their least useful sections first
+DEFAULT_PROMPT_TOKEN_BUDGET = 6000
+
+# Name of the Groq API's circuit breaker, see resilience.py
+GROQ_CIRCUIT = "groq"
+
+# Times a batch item is retried after a 429 before it is reported as failed
+DEFAULT_RATE_LIMIT_RETRIES = 3
+
+# Output tokens of an extraction; long resumes can run past it, see
+# _continuation_request
+MAX_COMPLETION_TOKENS = 1024
+
+
+# Keys of the prompt's JSON format -> database field names
+GROQ_FIELD_MAPPING = {
+    "Full Name": "full_name",
+    "Email Address": "email_address",
+    "Phone Number": "phone_number",
+    "Education Details": "education_details",
+    "Work Experience": "work_experience",
+    "Skills": "skills",
+    "Certifications": "certifications",
+    "Projects": "projects",
+    "Languages Spoken": "languages_spoken",
+    "Hobbies/Interests": "hobbies_interests",
+    "Achievements": "achievements",
+}
+
+
+def normalize_resume_text(resume_text: str) -> str:
+    """
+    Collapse whitespace so re-extractions of the same resume share a cache key
+    """
+    return " ".join(resume_text.split())
+
+
+class StructuredDataCache:
+    """
+    Cache of mapped Groq extraction results
+
+    Entries are keyed by the SHA-256 of the normalized resume text, the model
+    name and PROMPT_VERSION, and expire after ``ttl`` seconds (0 = never).
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int = DEFAULT_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_environment(cls) -> Optional["StructuredDataCache"]:
+        """
+        Build the cache configured by LLM_CACHE_* environment variables
+
+        Returns None when caching is disabled (LLM_CACHE_BACKEND=none).
+        """
+        backend_name = os.environ.get("LLM_CACHE_BACKEND", "database")
+        max_entries = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 10000))
+
+        if backend_name == "none":
+            return None
+        if backend_name == "database":
+            backend = DatabaseCacheBackend("structured-data", max_entries=max_entries)
+        elif backend_name == "disk":
+            backend = DiskCacheBackend(
+                directory=os.environ.get(
+                    "LLM_CACHE_DIR",
+                    os.path.join(tempfile.gettempdir(), "resume-llm-cache"),
+                ),
+                max_bytes=int(os.environ.get("LLM_CACHE_MAX_BYTES", 100 * 1024 * 1024)),
+            )
+        elif backend_name == "memory":
+            backend = MemoryCacheBackend(max_entries=max_entries)
+        elif backend_name == "django":
+            backend = DjangoCacheBackend(
+                alias=os.environ.get("LLM_CACHE_ALIAS", "default")
+            )
+        else:
+            raise ValueError(f"Unknown LLM cache backend '{backend_name}'")
+
+        return cls(backend, ttl=int(os.environ.get("LLM_CACHE_TTL", DEFAULT_CACHE_TTL)))
+
+    def make_key(self, resume_text: str, model: str) -> str:
+        content = json.dumps(
+            [normalize_resume_text(resume_text), model, PROMPT_VERSION]
+        )
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return f"structured-data:{digest}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            value = self.backend.get(key)
+            entry = json.loads(value) if value is not None else None
+            if entry is not None and entry["expires_at"] is not None:
+                if entry["expires_at"] < time.time():
+                    self.backend.delete(key)
+                    entry = None
+        except Exception as e:
+            logger.warning(f"Structured data cache read failed: {e}")
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._record_lookup(entry is not None)
+        return entry["data"] if entry is not None else None
+
+    def set(self, key: str, data: Dict):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        try:
+            self.backend.set(key, json.dumps({"expires_at": expires_at, "data": data}))
+        except Exception as e:
+            logger.warning(f"Structured data cache write failed: {e}")
+
+    def _record_lookup(self, hit: bool):
+        try:
+            self.backend.record_lookup(hit)
+        except Exception as e:
+            logger.warning(f"Could not record structured data cache statistics: {e}")
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
 
 class AIDataExtractor:
     """
     Handles AI-powered extraction of structured data from resume text
     """
 
-    def __init__(self):
-        self.groq_client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+    def __init__(
+        self,
+        cache: Optional[StructuredDataCache] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Optional[GroqTransport] = None,
+        fallback: Optional[Callable[[str], Dict]] = None,
+        base_url: Optional[str] = None,
+    ):
+        """
+        Args:
+            base_url: Groq-compatible API to call instead of Groq's (e.g. a
+                FakeGroqServer for load tests); defaults to GROQ_BASE_URL.
+                Ignored when a transport is given.
+        """
+        self.transport = transport or GroqTransport.from_environment(base_url=base_url)
+        self._groq_client = None  # Set to override the transport's client
+        self.model = os.environ.get("GROQ_MODEL", DEFAULT_MODEL)
+        self.max_concurrency = max_concurrency or int(
+            os.environ.get("GROQ_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        )
+        # Event loop -> concurrency semaphore, see _async_client
+        self._semaphores = weakref.WeakKeyDictionary()
+        # Shared by all batches, since the limits are per account
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_minute=float(
+                os.environ.get("GROQ_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)
+            ),
+            tokens_per_minute=float(
+                os.environ.get("GROQ_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)
+            ),
+        )
+        self.rate_limit_retries = int(
+            os.environ.get("GROQ_RATE_LIMIT_RETRIES", DEFAULT_RATE_LIMIT_RETRIES)
+        )
+        self.batch_stats = None  # Stats of the last extract_many call
+        self.retry_policy = RetryPolicy.from_environment()
+        # Called with the resume text when Groq fails or its circuit is open
+        self.fallback = fallback
+        self.compaction = os.environ.get("PROMPT_COMPACTION", "true").lower() == "true"
+        self.token_budget = int(
+            os.environ.get("PROMPT_TOKEN_BUDGET", DEFAULT_PROMPT_TOKEN_BUDGET)
+        )
+        self.compaction_stats = {
+            "requests": 0,
+            "original_tokens": 0,
+            "tokens": 0,
+            "tokens_saved": 0,
+        }
+        # Ask for a JSON object with response_format (not for streams, which
+        # Groq's JSON mode does not support)
+        self.json_mode = os.environ.get("GROQ_JSON_MODE", "true").lower() == "true"
+        # Request only the fields lost to truncated output
+        self.continuation = (
+            os.environ.get("GROQ_CONTINUATION", "true").lower() == "true"
+        )
+        # Extract long resumes with one prompt per group of sections, sent
+        # concurrently, see section_extraction.py
+        self.section_prompts = (
+            os.environ.get("GROQ_SECTION_PROMPTS", "false").lower() == "true"
+        )
+        self.section_min_tokens = int(
+            os.environ.get("GROQ_SECTION_MIN_TOKENS", DEFAULT_SECTION_MIN_TOKENS)
+        )
+        self.output_stats = {
+            "repaired": 0,
+            "continuations": 0,
+            "recovered_fields": 0,
+            "sectioned": 0,
+        }
+        self.cache = (
+            cache if cache is not None else StructuredDataCache.from_environment()
+        )
+
+    @property
+    def groq_client(self) -> Groq:
+        """
+        Groq client of the calling process or thread, see GroqTransport
+        """
+        if self._groq_client is not None:
+            return self._groq_client
+        return self.transport.groq_client()
+
+    @groq_client.setter
+    def groq_client(self, client: Groq):
+        self._groq_client = client
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """
+        Circuit breaker of the Groq API, shared by the whole process
+        """
+        return get_circuit_breaker(GROQ_CIRCUIT)
 
     def extract_structured_data(self, resume_text: str) -> Dict:
         """
         Extract structured data from resume text using Groq API
+
+        Results for text already seen with the same model and prompt version
+        are served from the cache without calling the API. Transient API
+        errors are retried with backoff; when the call still fails, or the
+        circuit breaker is open, the fallback extractor's result (or {}) is
+        returned.
+
+        With GROQ_SECTION_PROMPTS, resumes of GROQ_SECTION_MIN_TOKENS or more
+        are extracted by one prompt per group of sections, sent concurrently.
+        """
+        cache_key, cached_data = self._cache_lookup(resume_text)
+        if cached_data is not None:
+            return cached_data
+
+        try:
+            compaction = self._compact_resume_text(resume_text)
+            plan = self._section_plan(compaction)
+            if plan is not None:
+                pool = get_section_pool(self.max_concurrency)
+                parsed = self._merge_sections(
+                    list(pool.map(lambda part: self._extract_section(*part), plan))
+                )
+            else:
+                parsed = self._extract_section(None, compaction["text"])
+            structured_data = self._structured_data(parsed)
+        except Exception as e:
+            return self._fallback_data(resume_text, e, "extract_structured_data")
+
+        if structured_data and cache_key is not None:
+            self.cache.set(cache_key, structured_data)
+        return structured_data
+
+    async def extract_structured_data_async(self, resume_text: str) -> Dict:
+        """
+        Extract structured data from resume text using the asynchronous Groq
+        client
+
+        Returns the same result as extract_structured_data, but waits for the
+        API without blocking a thread, so one process can keep many
+        extractions in flight. At most ``max_concurrency`` requests per event
+        loop are sent at a time; the rest queue on a semaphore.
+        """
+        cache_key, cached_data = await sync_to_async(self._cache_lookup)(resume_text)
+        if cached_data is not None:
+            return cached_data
+
+        try:
+            compaction = self._compact_resume_text(resume_text)
+            plan = self._section_plan(compaction)
+            if plan is not None:
+                parsed = self._merge_sections(
+                    await asyncio.gather(
+                        *(self._extract_section_async(*part) for part in plan)
+                    )
+                )
+            else:
+                parsed = await self._extract_section_async(None, compaction["text"])
+            structured_data = self._structured_data(parsed)
+        except Exception as e:
+            return self._fallback_data(resume_text, e, "extract_structured_data_async")
+
+        if structured_data and cache_key is not None:
+            await sync_to_async(self.cache.set)(cache_key, structured_data)
+        return structured_data
+
+    def stream_structured_data(self, resume_text: str) -> Iterator[Dict]:
+        """
+        Extract structured data with a streamed completion, field by field
+
+        Each top-level field of the model's JSON is mapped and yielded as soon
+        as its value is complete, so callers can show or score partial
+        results while the rest is still being generated.
+
+        Yields:
+            {"event": "field", "field": db_key, "value": value, "elapsed": s}
+            for each field, then once {"event": "complete", "data": dict,
+            "timing": dict}. "data" equals what extract_structured_data
+            returns ({} on failure); any field the stream did not produce is
+            yielded with its default before it. "timing" has the seconds to
+            the first token, the first field and the whole completion.
+        """
+        started = time.monotonic()
+        timing = {"cached": False, "first_token": None, "first_field": None}
+
+        cache_key, cached_data = self._cache_lookup(resume_text)
+        if cached_data is not None:
+            for field, value in cached_data.items():
+                yield self._field_event(field, value, started, timing)
+            timing.update(cached=True, total=time.monotonic() - started)
+            yield {"event": "complete", "data": cached_data, "timing": timing}
+            return
+
+        parser = IncrementalJSONObjectParser()
+        streamed = {}
+        content = []
+        structured_data = {}
+        try:
+            compaction = self._compact_resume_text(resume_text)
+            stream = self.circuit_breaker.call(
+                self.retry_policy.call,
+                self.groq_client.chat.completions.create,
+                **self._completion_request(compaction["text"], stream=True),
+            )
+            for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                text = chunk.choices[0].delta.content
+                if timing["first_token"] is None:
+                    timing["first_token"] = time.monotonic() - started
+                content.append(text)
+
+                for groq_key, raw_value in parser.feed(text):
+                    if groq_key not in GROQ_FIELD_MAPPING:
+                        continue
+                    field = GROQ_FIELD_MAPPING[groq_key]
+                    value = self._map_groq_response({groq_key: raw_value})[field]
+                    streamed[field] = value
+                    yield self._field_event(field, value, started, timing)
+
+            # The complete text is authoritative: it also covers output the
+            # incremental parser had to skip
+            parsed = self._parse_output("".join(content))
+            continuation = self._continuation_request(compaction["text"], parsed)
+            if continuation is not None:
+                parsed = self._merge_continuation(
+                    parsed, self._request_content(continuation)
+                )
+            structured_data = self._structured_data(parsed)
+        except Exception as e:
+            structured_data = self._fallback_data(
+                resume_text, e, "stream_structured_data"
+            )
+            cache_key = None  # Fallback results are not cached
+
+        for field, value in structured_data.items():
+            if streamed.get(field) != value:
+                yield self._field_event(field, value, started, timing)
+
+        timing["total"] = time.monotonic() - started
+        logger.info(
+            "Streamed extraction: "
+            + ", ".join(
+                f"{name.replace('_', ' ')} {timing[name]:.2f}s"
+                for name in ("first_token", "first_field", "total")
+                if timing[name] is not None
+            )
+        )
+        if structured_data and cache_key is not None:
+            self.cache.set(cache_key, structured_data)
+        yield {"event": "complete", "data": structured_data, "timing": timing}
+
+    def _field_event(self, field: str, value, started: float, timing: Dict) -> Dict:
+        elapsed = time.monotonic() - started
+        if timing["first_field"] is None:
+            timing["first_field"] = elapsed
+        return {"event": "field", "field": field, "value": value, "elapsed": elapsed}
+
+    def extract_many(self, resume_texts: List[str]) -> Dict:
+        """
+        Extract structured data from a batch of resumes
+
+        Calls are paced by the rate limiter so large recruiter batches stay
+        within the account's request and token limits instead of running
+        into 429s; when one happens anyway, every call waits out the
+        response's retry-after before the failed one is retried. Use
+        extract_many_async from async code.
+
+        Args:
+            resume_texts: Resume texts to extract
+
+        Returns:
+            Dictionary with "results", one per text in input order, each
+            {"success", "data", "error"}, and "stats" with batch throughput
+        """
+        return async_to_sync(self.extract_many_async)(resume_texts)
+
+    async def extract_many_async(self, resume_texts: List[str]) -> Dict:
+        """
+        Asynchronous extract_many
+        """
+        stats = {
+            "items": len(resume_texts),
+            "succeeded": 0,
+            "failed": 0,
+            "cache_hits": 0,
+            "api_calls": 0,
+            "rate_limited": 0,
+            "throttle_wait": 0.0,
+            "tokens_used": 0,
+            "tokens_saved": 0,
+            "fallbacks": 0,
+        }
+        started = time.monotonic()
+
+        results = await asyncio.gather(
+            *(self._extract_batch_item(text, stats) for text in resume_texts)
+        )
+
+        elapsed = time.monotonic() - started
+        stats["elapsed"] = elapsed
+        stats["items_per_second"] = len(resume_texts) / elapsed if elapsed else 0.0
+        stats["tokens_per_minute"] = (
+            stats["tokens_used"] * 60 / elapsed if elapsed else 0.0
+        )
+        self.batch_stats = stats
+        logger.info(
+            f"Extracted {stats['succeeded']}/{stats['items']} resumes in "
+            f"{elapsed:.1f}s ({stats['items_per_second']:.2f}/s, "
+            f"{stats['rate_limited']} rate limited)"
+        )
+        return {"results": list(results), "stats": stats}
+
+    async def _extract_batch_item(self, resume_text: str, stats: Dict) -> Dict:
+        """
+        Extract one resume of a batch, reporting failure instead of raising
+        """
+        try:
+            cache_key, cached_data = await sync_to_async(self._cache_lookup)(
+                resume_text
+            )
+            if cached_data is not None:
+                stats["cache_hits"] += 1
+                stats["succeeded"] += 1
+                return {"success": True, "data": cached_data, "error": None}
+
+            compaction = self._compact_resume_text(resume_text)
+            stats["tokens_saved"] += compaction["tokens_saved"]
+            request = self._completion_request(compaction["text"])
+            reserved_tokens = (
+                estimate_tokens(request["messages"][0]["content"])
+                + request["max_completion_tokens"]
+            )
+            client, semaphore = self._async_client()
+
+            for attempt in range(self.rate_limit_retries + 1):
+                stats["throttle_wait"] += await self.rate_limiter.acquire(
+                    reserved_tokens
+                )
+                try:
+                    async with semaphore:
+                        stats["api_calls"] += 1
+                        # Rate limits are handled here, for the whole batch
+                        # at once; the retry policy only covers outages
+                        completion = await self.circuit_breaker.call_async(
+                            self.retry_policy.call_async,
+                            client.chat.completions.create,
+                            retry_on=is_outage_error,
+                            **request,
+                        )
+                    content = completion.choices[0].message.content or ""
+                    break
+                except BadRequestError as e:
+                    content = failed_generation(e)
+                    if content is None:
+                        raise
+                    completion = None
+                    break
+                except RateLimitError as e:
+                    stats["rate_limited"] += 1
+                    if attempt == self.rate_limit_retries:
+                        raise
+                    self.rate_limiter.pause(retry_after_seconds(e))
+
+            used_tokens = getattr(
+                getattr(completion, "usage", None), "total_tokens", None
+            )
+            if isinstance(used_tokens, int):
+                stats["tokens_used"] += used_tokens
+                self.rate_limiter.tokens.refund(max(0, reserved_tokens - used_tokens))
+
+            parsed = self._parse_output(content)
+            continuation = self._continuation_request(compaction["text"], parsed)
+            if continuation is not None:
+                stats["throttle_wait"] += await self.rate_limiter.acquire(
+                    estimate_tokens(continuation["messages"][0]["content"])
+                    + continuation["max_completion_tokens"]
+                )
+                stats["api_calls"] += 1
+                async with semaphore:
+                    parsed = self._merge_continuation(
+                        parsed, await self._request_content_async(client, continuation)
+                    )
+            structured_data = self._structured_data(parsed)
+            if not structured_data:
+                raise ValueError("The model did not return valid JSON")
+
+            if cache_key is not None:
+                await sync_to_async(self.cache.set)(cache_key, structured_data)
+            stats["succeeded"] += 1
+            return {"success": True, "data": structured_data, "error": None}
+
+        except Exception as e:
+            fallback_data = self._fallback_data(resume_text, e, "extract_many")
+            if fallback_data:
+                stats["fallbacks"] += 1
+                stats["succeeded"] += 1
+                return {
+                    "success": True,
+                    "data": fallback_data,
+                    "error": str(e),
+                    "fallback": True,
+                }
+            stats["failed"] += 1
+            return {"success": False, "data": {}, "error": str(e)}
+
+    def _fallback_data(self, resume_text: str, error: Exception, source: str) -> Dict:
         """
+        Log a failed extraction and return the fallback extractor's result,
+        or {} without one
+        """
+        if isinstance(error, CircuitOpenError):
+            logger.warning(f"{source}: {error}, not calling Groq")
+        else:
+            logger.error(f"Error in {source}: {error}")
+
+        if self.fallback is None:
+            return {}
         try:
-            prompt = f"""{resume_text}
+            structured_data = self.fallback(resume_text)
+        except Exception as e:
+            logger.error(f"Fallback extraction failed: {e}")
+            return {}
+        logger.info("Using the fallback extraction result")
+        return structured_data
+
+    def _async_client(self) -> Tuple[AsyncGroq, asyncio.Semaphore]:
+        """
+        Return the AsyncGroq client and concurrency semaphore of the running
+        event loop, creating the semaphore on first use
+
+        Both are bound to the loop they were first used in, so each loop
+        (the ASGI server's, or the per-request loops Django runs async views
+        in under WSGI) gets its own pair; the transport closes the client
+        when the loop shuts down.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self.transport.async_groq_client(), semaphore
+
+    def _cache_lookup(self, resume_text: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Return the cache key for the text and the cached result, if any
+        """
+        if self.cache is None:
+            return None, None
+
+        # Answers from another API (a fake server) must not be served as
+        # Groq's, or the other way around
+        model = self.model
+        if self.transport.base_url:
+            model = f"{model}@{self.transport.base_url}"
+        cache_key = self.cache.make_key(resume_text, model)
+        cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            logger.info("Structured data cache hit")
+        return cache_key, cached_data
+
+    def _compact_resume_text(self, resume_text: str) -> Dict:
+        """
+        Compact the resume text for the prompt and record the tokens saved
+
+        Returns:
+            compact_resume_text's result (the text unchanged when compaction
+            is disabled)
+        """
+        if self.compaction:
+            compaction = compact_resume_text(resume_text, self.token_budget)
+        else:
+            tokens = estimate_tokens(resume_text)
+            compaction = {
+                "text": resume_text,
+                "original_tokens": tokens,
+                "tokens": tokens,
+                "tokens_saved": 0,
+                "trimmed_sections": [],
+            }
+
+        self.compaction_stats["requests"] += 1
+        for key in ("original_tokens", "tokens", "tokens_saved"):
+            self.compaction_stats[key] += compaction[key]
+
+        logger.info(
+            f"Prompt resume text: {compaction['tokens']} tokens, "
+            f"{compaction['tokens_saved']} saved of {compaction['original_tokens']}"
+        )
+        if compaction["trimmed_sections"]:
+            logger.warning(
+                f"Resume over the {self.token_budget} token budget, trimmed: "
+                f"{', '.join(compaction['trimmed_sections'])}"
+            )
+        return compaction
+
+    def _section_plan(self, compaction: Dict) -> Optional[List[Tuple[List, str]]]:
+        """
+        plan_section_prompts' prompts for a compacted resume, or None when it
+        is extracted with a single prompt
+        """
+        if not self.section_prompts or compaction["tokens"] < self.section_min_tokens:
+            return None
+        plan = plan_section_prompts(compaction["text"])
+        if plan is not None:
+            self.output_stats["sectioned"] += 1
+            logger.info(
+                f"Extracting {compaction['tokens']} tokens of resume text with "
+                f"{len(plan)} section prompts"
+            )
+        return plan
+
+    def _extract_section(self, keys: Optional[List[str]], resume_text: str) -> Dict:
+        """
+        Extract the given prompt keys (all of them for None) from resume
+        text, with a continuation for what truncated output lost
+
+        Returns:
+            The parse result, restricted to the keys
+        """
+        if keys is None:
+            request = self._completion_request(resume_text)
+        else:
+            request = self._fields_request(resume_text, keys)
+        parsed = self._section_result(keys, self._request_content(request))
+        continuation = self._continuation_request(resume_text, parsed)
+        if continuation is not None:
+            parsed = self._merge_continuation(
+                parsed, self._request_content(continuation)
+            )
+        return parsed
+
+    async def _extract_section_async(
+        self, keys: Optional[List[str]], resume_text: str
+    ) -> Dict:
+        """
+        Asynchronous _extract_section; every prompt holds a slot of the
+        concurrency semaphore
+        """
+        client, semaphore = self._async_client()
+        if keys is None:
+            request = self._completion_request(resume_text)
+        else:
+            request = self._fields_request(resume_text, keys)
+        async with semaphore:
+            parsed = self._section_result(
+                keys, await self._request_content_async(client, request)
+            )
+            continuation = self._continuation_request(resume_text, parsed)
+            if continuation is not None:
+                parsed = self._merge_continuation(
+                    parsed, await self._request_content_async(client, continuation)
+                )
+        return parsed
+
+    def _section_result(self, keys: Optional[List[str]], content: str) -> Dict:
+        """
+        _parse_output's result for a prompt's output, without the keys the
+        prompt did not ask for
+        """
+        parsed = self._parse_output(content)
+        if keys is None:
+            return parsed
+        return {
+            **parsed,
+            "fields": {
+                key: value for key, value in parsed["fields"].items() if key in keys
+            },
+            "missing": [key for key in parsed["missing"] if key in keys],
+        }
+
+    def _merge_sections(self, results: List[Dict]) -> Dict:
+        """
+        Combine the parse results of a resume's section prompts into one
+        """
+        return {
+            "fields": {
+                key: value
+                for parsed in results
+                for key, value in parsed["fields"].items()
+            },
+            "missing": [key for parsed in results for key in parsed["missing"]],
+            "repaired": any(parsed["repaired"] for parsed in results),
+        }
+
+    def _completion_request(self, resume_text: str, stream: bool = False) -> Dict:
+        """
+        Keyword arguments of the chat completion request for a resume
+        """
+        prompt = f"""{resume_text}
 
 From the above resume text, extract the following information and return it in the exact JSON format shown below:
 
@@ -58,44 +814,135 @@ Important:
 - Return only the JSON object, no additional text or explanation
 """
 
-            completion = self.groq_client.chat.completions.create(
-                model="meta-llama/llama-4-scout-17b-16e-instruct",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,  # Lower temperature for more consistent extraction
-                max_completion_tokens=1024,
-                top_p=1,
-                stop=None,
-            )
+        return self._chat_request(prompt, stream=stream)
 
-            json_output_string = completion.choices[0].message.content.strip()
+    def _continuation_request(self, resume_text: str, parsed: Dict) -> Optional[Dict]:
+        """
+        Request for only the fields a truncated or invalid output lost, or
+        None when there is nothing to ask for
 
-            # Clean up the JSON string
-            json_output_string = self._clean_json_output(json_output_string)
+        Much shorter than the full output, so it fits where the first one
+        ran out of tokens; when nothing could be parsed at all, there is no
+        partial result to complete and None is returned.
+        """
+        if not (self.continuation and parsed["fields"] and parsed["missing"]):
+            return None
 
-            # Parse JSON
-            try:
-                raw_data = json.loads(json_output_string)
+        keys = parsed["missing"]
+        logger.info(f"Requesting the missing fields {keys}")
+        self.output_stats["continuations"] += 1
+        return self._fields_request(resume_text, keys)
 
-                # Log the raw AI response for debugging
-                logger.info("=== RAW AI RESPONSE ===")
-                logger.info(json.dumps(raw_data, indent=2, ensure_ascii=False))
+    def _fields_request(self, resume_text: str, keys: List[str]) -> Dict:
+        """
+        Request for only the given fields (prompt keys) of a resume
+        """
+        prompt = f"""{resume_text}
 
-                # Map the keys to match our database fields
-                structured_data = self._map_groq_response(raw_data)
+From the above resume text, extract only the following fields and return them as a JSON object with exactly these keys: {json.dumps(keys)}
 
-                # Log the mapped data for debugging
-                logger.info("=== MAPPED DATA ===")
-                logger.info(json.dumps(structured_data, indent=2, ensure_ascii=False))
+- Full Name, Email Address and Phone Number are strings; every other field is an array of strings
+- For Work Experience use "Job Title at Company (Duration)", for Education Details "Degree at Institution (Year)" and for Projects "Project Name - Description"
+- Keep each entry short; if information is not found, use an empty string or empty array
+- Return only the JSON object, no additional text or explanation
+"""
+        return self._chat_request(prompt)
 
-                return structured_data
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON parsing error: {e}")
-                logger.error(f"Raw output: {json_output_string}")
-                return {}
+    def _chat_request(self, prompt: str, stream: bool = False) -> Dict:
+        request = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.1,  # Lower temperature for more consistent extraction
+            "max_completion_tokens": MAX_COMPLETION_TOKENS,
+            "top_p": 1,
+            "stop": None,
+        }
+        if stream:
+            request["stream"] = True
+        elif self.json_mode:
+            request["response_format"] = {"type": "json_object"}
+        return request
 
-        except Exception as e:
-            logger.error(f"Error in extract_structured_data: {e}")
+    def _request_content(self, request: Dict) -> str:
+        """
+        Send a completion request and return the output text
+
+        Output that JSON mode rejected comes back with the error, so it is
+        returned for repair instead of failing the extraction.
+        """
+        try:
+            completion = self.circuit_breaker.call(
+                self.retry_policy.call,
+                self.groq_client.chat.completions.create,
+                **request,
+            )
+        except BadRequestError as e:
+            content = failed_generation(e)
+            if content is None:
+                raise
+            logger.warning("JSON mode rejected the output, repairing it")
+            return content
+        return completion.choices[0].message.content or ""
+
+    async def _request_content_async(self, client: AsyncGroq, request: Dict) -> str:
+        """
+        Asynchronous _request_content
+        """
+        try:
+            completion = await self.circuit_breaker.call_async(
+                self.retry_policy.call_async,
+                client.chat.completions.create,
+                **request,
+            )
+        except BadRequestError as e:
+            content = failed_generation(e)
+            if content is None:
+                raise
+            logger.warning("JSON mode rejected the output, repairing it")
+            return content
+        return completion.choices[0].message.content or ""
+
+    def _parse_output(self, content: str) -> Dict:
+        """
+        parse_extraction's result for the model's output, logged
+        """
+        parsed = parse_extraction(content)
+        if parsed["repaired"]:
+            self.output_stats["repaired"] += 1
+            logger.warning(
+                f"Repaired malformed model output, recovered "
+                f"{len(parsed['fields'])} fields"
+            )
+        if not parsed["fields"]:
+            logger.error(f"No JSON object in the model's output: {content[:500]!r}")
+        return parsed
+
+    def _merge_continuation(self, parsed: Dict, content: str) -> Dict:
+        """
+        Add the fields a continuation returned to a partial parse result
+        """
+        extra = parse_extraction(content)["fields"]
+        recovered = {key: extra[key] for key in parsed["missing"] if key in extra}
+        self.output_stats["recovered_fields"] += len(recovered)
+        logger.info(
+            f"Continuation recovered {len(recovered)} of "
+            f"{len(parsed['missing'])} missing fields"
+        )
+        return {
+            **parsed,
+            "fields": {**parsed["fields"], **recovered},
+            "missing": [key for key in parsed["missing"] if key not in recovered],
+        }
+
+    def _structured_data(self, parsed: Dict) -> Dict:
+        """
+        Map a parse result to the database fields, or {} if nothing parsed
+        """
+        if not parsed["fields"]:
             return {}
+        structured_data = self._map_groq_response(parsed["fields"])
+        logger.debug("Mapped data: " + json.dumps(structured_data, ensure_ascii=False))
+        return structured_data
 
     def _map_groq_response(self, raw_data: Dict) -> Dict:
         """
@@ -104,19 +951,7 @@ Important:
         mapped_data = {}
 
         # Map direct fields
-        mapping = {
-            "Full Name": "full_name",
-            "Email Address": "email_address",
-            "Phone Number": "phone_number",
-            "Education Details": "education_details",
-            "Work Experience": "work_experience",
-            "Skills": "skills",
-            "Certifications": "certifications",
-            "Projects": "projects",
-            "Languages Spoken": "languages_spoken",
-            "Hobbies/Interests": "hobbies_interests",
-            "Achievements": "achievements",
-        }
+        mapping = GROQ_FIELD_MAPPING
 
         for groq_key, db_key in mapping.items():
             if groq_key in raw_data:
@@ -175,16 +1010,6 @@ Important:
 
         return mapped_data
 
-    def _clean_json_output(self, json_string: str) -> str:
-        """
-        Clean and prepare JSON string for parsing
-        """
-        # Remove markdown code blocks
-        json_string = json_string.replace("```json", "").replace("```", "")
-        # Remove extra whitespace
-        json_string = json_string.strip()
-        return json_string
-
     def _normalize_list_field(self, value) -> List:
         """
         Normalize a field to ensure it's a proper list.
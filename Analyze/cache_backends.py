@@ -0,0 +1,259 @@
+"""
+Cache Backends Module
+
+Small key/value stores used to cache expensive analysis results. Values are
+strings (callers serialize to JSON); every backend bounds its size and evicts
+least recently used entries first.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Interface shared by all cache backends
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def record_lookup(self, hit: bool):
+        """
+        Count a hit or miss where other processes can see it
+
+        Only backends that share statistics implement this.
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache bounded by number of entries
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    File-per-entry cache in a local directory, bounded by total size
+
+    The directory can be shared by every worker process on the machine.
+    File modification times track recency: reads touch the file, and writes
+    evict the oldest files until the directory fits in ``max_bytes``.
+    """
+
+    name = "disk"
+
+    def __init__(self, directory: str, max_bytes: int = 100 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # Keys may contain characters that are not valid in file names
+        safe_key = "".join(char if char.isalnum() else "_" for char in key)
+        return os.path.join(self.directory, safe_key)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                value = cache_file.read()
+            os.utime(path)
+            return value
+        except OSError:
+            return None
+
+    def set(self, key: str, value: str):
+        # Write to a temporary file first so readers never see partial entries
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                cache_file.write(value)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write cache entry: {e}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return
+
+        self._evict()
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_bytes
+        """
+        entries = []
+        total_size = 0
+        with os.scandir(self.directory) as directory:
+            for entry in directory:
+                if entry.name.endswith(".tmp") or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total_size -= size
+            except OSError:
+                pass  # Already evicted by another process
+
+
+class DjangoCacheBackend(CacheBackend):
+    """
+    Stores entries in one of the project's Django caches
+
+    Size bounds and LRU eviction are enforced by the configured cache
+    (``MAX_ENTRIES`` for the local-memory, file and database caches, the
+    server's eviction policy for Redis or Memcached).
+    """
+
+    name = "django"
+
+    def __init__(self, alias: str = "default", timeout: Optional[int] = None):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    def get(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: str):
+        self.cache.set(key, value, timeout=self.timeout)
+
+    def delete(self, key: str):
+        self.cache.delete(key)
+
+
+class DatabaseCacheBackend(CacheBackend):
+    """
+    Cache rows in the project database, shared by every worker process
+
+    Entries are stored in a_resume's CacheEntry model under a namespace per
+    cache. Reads refresh the access time, and writes evict the least recently
+    used rows beyond ``max_entries``. Lookups are counted in CacheStatistics,
+    where the admin shows the hit rate.
+    """
+
+    name = "database"
+
+    def __init__(self, namespace: str, max_entries: int = 10000):
+        self.namespace = namespace
+        self.max_entries = max_entries
+
+    @property
+    def models(self):
+        from a_resume import models
+
+        return models
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[str]:
+        from django.db.models import F
+        from django.utils import timezone
+
+        entries = self.models.CacheEntry.objects.filter(key=self._key(key))
+        value = entries.values_list("value", flat=True).first()
+        if value is not None:
+            entries.update(last_accessed_at=timezone.now(), hits=F("hits") + 1)
+        return value
+
+    def set(self, key: str, value: str):
+        from django.utils import timezone
+
+        self.models.CacheEntry.objects.update_or_create(
+            key=self._key(key),
+            defaults={
+                "namespace": self.namespace,
+                "value": value,
+                "last_accessed_at": timezone.now(),
+            },
+        )
+        self._evict()
+
+    def delete(self, key: str):
+        self.models.CacheEntry.objects.filter(key=self._key(key)).delete()
+
+    def record_lookup(self, hit: bool):
+        from django.db.models import F
+        from django.utils import timezone
+
+        field = "hits" if hit else "misses"
+        statistics = self.models.CacheStatistics.objects.filter(name=self.namespace)
+        changes = {field: F(field) + 1, "updated_at": timezone.now()}
+        if not statistics.update(**changes):
+            self.models.CacheStatistics.objects.get_or_create(name=self.namespace)
+            statistics.update(**changes)
+
+    def _evict(self):
+        """
+        Delete least recently used rows beyond max_entries
+        """
+        entries = self.models.CacheEntry.objects.filter(namespace=self.namespace)
+        stale_keys = list(
+            entries.order_by("-last_accessed_at").values_list("key", flat=True)[
+                self.max_entries :
+            ]
+        )
+        if stale_keys:
+            entries.filter(key__in=stale_keys).delete()
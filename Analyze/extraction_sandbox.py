@@ -0,0 +1,165 @@
+"""
+Extraction Sandbox Module
+
+Runs document extraction in a short-lived child process with a wall-clock
+timeout and a memory limit, so that a malformed or huge upload cannot hang or
+exhaust the web worker that received it. Failures are reported as
+ExtractionError subclasses.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from .ocr_engine import shutdown_ocr_pool, shutdown_text_pool
+
+logger = logging.getLogger(__name__)
+
+# The child inherits the parent's memory (including the uploaded file) instead
+# of having it pickled, and does not re-import the Django project on start-up
+SANDBOX_START_METHOD = "fork"
+SANDBOX_AVAILABLE = SANDBOX_START_METHOD in multiprocessing.get_all_start_methods()
+
+DEFAULT_TIMEOUT = 60  # Seconds; well below gunicorn's worker timeout
+DEFAULT_MAX_MEMORY_MB = 2048
+DEFAULT_PAGE_LIMIT = 50
+
+
+class ExtractionError(Exception):
+    """
+    Base class for errors that abort text extraction of a document
+    """
+
+
+class ExtractionTimeout(ExtractionError):
+    """
+    Extraction did not finish within the wall-clock timeout
+    """
+
+
+class ExtractionMemoryError(ExtractionError):
+    """
+    Extraction ran out of memory under the sandbox limit
+    """
+
+
+class ExtractionCrashed(ExtractionError):
+    """
+    The extraction process died without returning a result
+    """
+
+
+class PageLimitExceeded(ExtractionError):
+    """
+    The document has more pages than extraction is allowed to process
+    """
+
+
+def _sandbox_worker(connection, function, args, max_memory_bytes):
+    """
+    Child process entry point: apply limits, run the function, send the outcome
+    """
+    # Own process group, so a timeout also kills pdftoppm/tesseract children
+    os.setsid()
+    if max_memory_bytes and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+
+    try:
+        outcome = (True, function(*args))
+    except ExtractionError as e:
+        outcome = (False, e)
+    except MemoryError:
+        outcome = (
+            False,
+            ExtractionMemoryError(
+                f"Text extraction exceeded the {max_memory_bytes // 2**20} MB "
+                "memory limit"
+            ),
+        )
+    except Exception as e:
+        # Library exceptions are not always picklable, keep the message only
+        outcome = (False, RuntimeError(f"{e.__class__.__name__}: {e}"))
+    finally:
+        shutdown_ocr_pool(wait=True)
+        shutdown_text_pool(wait=True)
+
+    try:
+        connection.send(outcome)
+    finally:
+        connection.close()
+
+
+def _kill_process_group(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass  # Already exited along with any children
+    process.join()
+
+
+def run_sandboxed(
+    function: Callable,
+    *args,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_memory_mb: Optional[int] = DEFAULT_MAX_MEMORY_MB,
+) -> Any:
+    """
+    Call function(*args) in a forked child process under resource limits
+
+    Args:
+        function: Callable to run; its return value must be picklable
+        *args: Arguments passed to the function
+        timeout: Wall-clock seconds before the child is killed
+        max_memory_mb: Address space limit of the child, or None for no limit
+
+    Returns:
+        The function's return value
+
+    Raises:
+        ExtractionTimeout: The child did not finish in time
+        ExtractionMemoryError: The child ran out of memory
+        ExtractionCrashed: The child died without sending a result
+        ExtractionError: Any ExtractionError raised by the function
+        RuntimeError: Any other exception raised by the function
+    """
+    context = multiprocessing.get_context(SANDBOX_START_METHOD)
+    receiver, sender = context.Pipe(duplex=False)
+    max_memory_bytes = max_memory_mb * 2**20 if max_memory_mb else None
+    process = context.Process(
+        target=_sandbox_worker,
+        args=(sender, function, args, max_memory_bytes),
+        daemon=False,  # Daemonic processes may not start an OCR pool
+    )
+    process.start()
+    sender.close()
+
+    try:
+        if not receiver.poll(timeout):
+            logger.warning(f"Killing extraction process {process.pid} after {timeout}s")
+            raise ExtractionTimeout(f"Text extraction timed out after {timeout:g}s")
+        succeeded, payload = receiver.recv()
+    except EOFError:
+        process.join()
+        if process.exitcode == -signal.SIGKILL:
+            # Nothing but the kernel's OOM killer sends SIGKILL before we do
+            raise ExtractionMemoryError(
+                "Text extraction process was killed, most likely for running "
+                "out of memory"
+            )
+        raise ExtractionCrashed(
+            f"Text extraction process exited with code {process.exitcode}"
+        )
+    finally:
+        receiver.close()
+        _kill_process_group(process)
+
+    if succeeded:
+        return payload
+    raise payload
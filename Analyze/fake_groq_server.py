@@ -0,0 +1,390 @@
+"""
+Fake Groq Server Module
+
+Minimal Groq-compatible HTTP server for benchmarks, load tests and tests.
+It answers chat completion requests, plain or streamed (server-sent events),
+with a canned resume extraction in the prompt's JSON schema. It can simulate
+the cost of opening a connection (TCP + TLS handshake to a remote API), a
+latency distribution for generating a completion, generation time per
+output token, and a share of server errors and 429 rate limits, all
+reproducible from a seed. Like the real API it answers only the keys the
+prompt asks for and cuts output off at max_completion_tokens. Connections,
+requests and injected faults are counted, and the peak of requests in
+flight kept, so reuse, retries and concurrency can be measured. Point the
+app at it with GROQ_BASE_URL (see run_fake_groq_server).
+"""
+
+import json
+import math
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+from .prompt_compaction import estimate_tokens
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+CANNED_EXTRACTION = {
+    "Full Name": "Jane Candidate",
+    "Email Address": "jane.candidate@example.com",
+    "Phone Number": "+1 555 010 2030",
+    "Education Details": ["B.Tech in Computer Science at State University (2016)"],
+    "Work Experience": [
+        "Senior Software Engineer at Example Corp (2019 - Present)",
+        "Software Engineer at Sample Labs (2016 - 2019)",
+    ],
+    "Skills": ["Python", "Django", "PostgreSQL", "Docker", "AWS", "React"],
+    "Certifications": ["AWS Certified Developer - Associate"],
+    "Projects": [],
+    "Languages Spoken": [],
+    "Hobbies/Interests": [],
+    "Achievements": ["Reduced report generation time by 40 percent"],
+}
+
+
+class FakeGroqRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive needs HTTP/1.1
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, delayed
+        # ACKs stall every response on a kept-alive connection by ~40 ms
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        if server.handshake_delay:
+            time.sleep(server.handshake_delay)
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            self._respond(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _respond(self, body):
+        server = self.server
+        if self.path != COMPLETIONS_PATH:
+            self._send_json(404, {"error": {"message": f"No route {self.path}"}})
+            return
+
+        request = json.loads(body or b"{}")
+        fault, latency = server.plan_response()
+        if fault == 429:
+            # Rejected up front, like a real rate limiter
+            self._send_json(
+                429,
+                error_body("Rate limit reached", "rate_limit_exceeded"),
+                headers={"retry-after": f"{server.retry_after:g}"},
+            )
+            return
+
+        if latency:
+            time.sleep(latency)
+        if fault == 500:
+            self._send_json(500, error_body("Internal server error", "server_error"))
+            return
+
+        model = request.get("model", "")
+        content, finish_reason = truncate_content(
+            json.dumps(requested_fields(request, server.extraction)),
+            request.get("max_completion_tokens") or request.get("max_tokens"),
+        )
+        usage = usage_counts(request, content)
+        if request.get("stream"):
+            self._send_stream(model, content, usage, finish_reason)
+            return
+        if server.token_delay:
+            time.sleep(server.token_delay * usage["completion_tokens"])
+        self._send_json(200, completion_response(model, content, usage, finish_reason))
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, model, content, usage, finish_reason="stop"):
+        """
+        Send the completion as server-sent events, a few tokens per chunk
+        """
+        server = self.server
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        size = server.stream_chunk_chars
+        pieces = [
+            content[start : start + size] for start in range(0, len(content), size)
+        ]
+        for index, piece in enumerate(pieces):
+            delay = server.token_delay * estimate_tokens(piece)
+            if index:
+                delay += server.stream_chunk_delay
+            if delay:
+                time.sleep(delay)
+            self._send_event(chunk_response(model, piece))
+        self._send_event(chunk_response(model, None, usage, finish_reason))
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._send_chunk(b"")
+
+    def _send_event(self, payload):
+        self._send_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    def _send_chunk(self, data):
+        # HTTP/1.1 chunked transfer encoding; an empty chunk ends the body
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass  # Benchmarks would drown in access logs
+
+
+def error_body(message: str, error_type: str) -> dict:
+    return {"error": {"message": message, "type": error_type}}
+
+
+def requested_fields(request: dict, extraction: dict) -> dict:
+    """
+    The fields of the extraction whose keys the prompt names in quotes: all
+    of them for the full extraction prompt, a few for a prompt asking for
+    only some fields
+    """
+    prompt = " ".join(
+        str(message.get("content", "")) for message in request.get("messages", [])
+    )
+    requested = {
+        key: value for key, value in extraction.items() if f'"{key}"' in prompt
+    }
+    return requested or extraction
+
+
+def truncate_content(content: str, max_tokens: Optional[int]) -> Tuple[str, str]:
+    """
+    Cut the content off at max_tokens estimated tokens, like a completion
+    that ran out of tokens
+
+    Returns:
+        The content and the finish reason, "length" when it was cut off
+    """
+    if not max_tokens or estimate_tokens(content) <= max_tokens:
+        return content, "stop"
+    low, high = 0, len(content)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(content[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return content[:low], "length"
+
+
+def usage_counts(request: dict, content: str) -> dict:
+    """
+    Token usage of a completion, estimated like the rate limiter does
+    """
+    prompt_tokens = sum(
+        estimate_tokens(str(message.get("content", "")))
+        for message in request.get("messages", [])
+    )
+    completion_tokens = estimate_tokens(content)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def chunk_response(
+    model: str,
+    content: Optional[str],
+    usage: dict = None,
+    finish_reason: str = "stop",
+) -> dict:
+    """
+    A streamed chat completion chunk; content None makes the final chunk,
+    which carries the usage like Groq's x_groq field
+    """
+    chunk = {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "delta": {} if content is None else {"content": content},
+                "finish_reason": finish_reason if content is None else None,
+            }
+        ],
+    }
+    if usage is not None:
+        chunk["x_groq"] = {"id": "req-fake", "usage": usage}
+    return chunk
+
+
+def completion_response(
+    model: str,
+    content: str = None,
+    usage: dict = None,
+    finish_reason: str = "stop",
+) -> dict:
+    """
+    A chat completion response body in the OpenAI/Groq format
+    """
+    if content is None:
+        content = json.dumps(CANNED_EXTRACTION)
+    if usage is None:
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }
+        ],
+        "usage": usage,
+    }
+
+
+class FakeGroqServer(ThreadingHTTPServer):
+    """
+    Fake Groq API on a local port, run in a background thread
+
+    Usage:
+        with FakeGroqServer(latency=0.01) as server:
+            Groq(api_key="test", base_url=server.base_url)
+
+    Completion latencies are log-normally distributed around ``latency``
+    (their median) with ``latency_spread`` as sigma; 0 makes them fixed.
+    ``token_delay`` is added for every output token, so long outputs take
+    longer, as they do on the real API.
+    """
+
+    daemon_threads = True
+    # Load tests open many connections at once; the default backlog of 5
+    # makes the rest wait out a SYN retransmit (a second or more)
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        handshake_delay: float = 0.0,
+        latency_spread: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        stream_chunk_chars: int = 16,
+        stream_chunk_delay: float = 0.0,
+        token_delay: float = 0.0,
+        extraction: Optional[dict] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            latency: Median seconds a completion takes (to its first token
+                when streamed)
+            handshake_delay: Seconds added to every new connection
+            latency_spread: Sigma of the log-normal latency distribution
+            error_rate: Share of requests answered with a 500
+            rate_limit_rate: Share of requests answered with a 429
+            retry_after: Seconds in the retry-after header of 429s
+            stream_chunk_chars: Characters of content per streamed chunk
+            stream_chunk_delay: Seconds between streamed chunks
+            token_delay: Seconds of generation per output token
+            extraction: Resume JSON to answer with (default CANNED_EXTRACTION)
+            seed: Seed of the latency and fault draws, for repeatable runs
+        """
+        super().__init__((host, port), FakeGroqRequestHandler)
+        self.latency = latency
+        self.handshake_delay = handshake_delay
+        self.latency_spread = latency_spread
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self.stream_chunk_delay = stream_chunk_delay
+        self.token_delay = token_delay
+        self.extraction = CANNED_EXTRACTION if extraction is None else extraction
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        # Requests being answered, and the most ever answered at once
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def plan_response(self):
+        """
+        Draw the fault (429, 500 or None) and latency of the next response
+        """
+        with self.lock:
+            draw = self.random.random()
+            latency = self.latency
+            if self.latency_spread and latency:
+                latency *= math.exp(self.random.gauss(0, self.latency_spread))
+            if draw < self.rate_limit_rate:
+                self.rate_limited += 1
+                return 429, 0.0
+            if draw < self.rate_limit_rate + self.error_rate:
+                self.errors += 1
+                return 500, latency
+            return None, latency
+
+    def reset_counters(self):
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+            self.errors = 0
+            self.rate_limited = 0
+            self.peak_in_flight = self.in_flight
+
+    def start(self) -> "FakeGroqServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeGroqServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,230 @@
+"""
+Groq Transport Module
+
+Builds the Groq API clients with an explicitly configured httpx transport:
+connection pool limits, keep-alive, optional HTTP/2 and separate connect,
+read, write and pool timeouts. Clients are shared per process (httpx clients
+are thread-safe) or kept per thread, and are rebuilt in forked children,
+which must not reuse the parent's sockets. Async clients are kept per event
+loop and closed when their loop shuts down.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+from groq import AsyncGroq, Groq
+
+try:
+    import h2  # noqa: F401  # Needed by httpx for HTTP/2
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_PROCESS = "process"
+STRATEGY_THREAD = "thread"
+CLIENT_STRATEGIES = (STRATEGY_PROCESS, STRATEGY_THREAD)
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept open
+
+# Seconds; a completion of 1024 tokens can take a while to generate, but
+# connecting and sending the prompt should be quick
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_WRITE_TIMEOUT = 10.0
+DEFAULT_POOL_TIMEOUT = 10.0
+
+# Sent without GROQ_API_KEY to a base_url other than Groq's (e.g. a
+# FakeGroqServer, which checks no key); the SDK will not build a client
+# without one
+PLACEHOLDER_API_KEY = "fake"
+
+
+class GroqTransport:
+    """
+    Factory and owner of the Groq clients of a process
+
+    ``strategy`` "process" shares one client and connection pool between all
+    threads of a process; "thread" gives every thread its own, which keeps
+    threads from queueing on each other's pool at the cost of more open
+    connections.
+    """
+
+    def __init__(
+        self,
+        strategy: str = STRATEGY_PROCESS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        write_timeout: float = DEFAULT_WRITE_TIMEOUT,
+        pool_timeout: float = DEFAULT_POOL_TIMEOUT,
+        base_url: Optional[str] = None,
+    ):
+        if strategy not in CLIENT_STRATEGIES:
+            raise ValueError(f"Unknown Groq client strategy '{strategy}'")
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but the h2 package is not installed")
+            http2 = False
+
+        self.strategy = strategy
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout,
+        )
+        self.http2 = http2
+        self.base_url = base_url
+
+        self._lock = threading.Lock()
+        self._process_client = None
+        self._process_client_pid = None
+        self._thread_clients = threading.local()
+        # Event loop -> (AsyncGroq client, task that closes it), see
+        # async_groq_client
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_environment(cls, base_url: Optional[str] = None) -> "GroqTransport":
+        """
+        Build the transport configured by GROQ_HTTP_* environment variables
+
+        Args:
+            base_url: API to call, overriding GROQ_BASE_URL (unset means
+                Groq's own)
+        """
+        return cls(
+            strategy=os.environ.get("GROQ_HTTP_CLIENT_STRATEGY", STRATEGY_PROCESS),
+            max_connections=int(
+                os.environ.get("GROQ_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+            ),
+            max_keepalive_connections=int(
+                os.environ.get(
+                    "GROQ_HTTP_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+                )
+            ),
+            keepalive_expiry=float(
+                os.environ.get("GROQ_HTTP_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)
+            ),
+            http2=os.environ.get("GROQ_HTTP2", "false").lower() == "true",
+            connect_timeout=float(
+                os.environ.get("GROQ_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)
+            ),
+            read_timeout=float(
+                os.environ.get("GROQ_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)
+            ),
+            write_timeout=float(
+                os.environ.get("GROQ_WRITE_TIMEOUT", DEFAULT_WRITE_TIMEOUT)
+            ),
+            pool_timeout=float(
+                os.environ.get("GROQ_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)
+            ),
+            base_url=base_url or os.environ.get("GROQ_BASE_URL") or None,
+        )
+
+    def groq_client(self) -> Groq:
+        """
+        Return the Groq client for the calling process or thread
+        """
+        pid = os.getpid()
+        if self.strategy == STRATEGY_THREAD:
+            local = self._thread_clients
+            if getattr(local, "pid", None) != pid:
+                local.client, local.pid = self._new_groq_client(), pid
+            return local.client
+
+        if self._process_client_pid != pid:
+            with self._lock:
+                if self._process_client_pid != pid:
+                    self._process_client = self._new_groq_client()
+                    self._process_client_pid = pid
+        return self._process_client
+
+    def async_groq_client(self) -> AsyncGroq:
+        """
+        Return the AsyncGroq client of the running event loop, creating it on
+        first use
+
+        Async clients belong to the event loop they are used in. Each comes
+        with a task that closes it once the loop shuts down (asyncio.run and
+        async_to_sync cancel a loop's remaining tasks before closing it), so
+        the per-request loops of async views under WSGI leave no clients or
+        sockets behind.
+        """
+        loop = asyncio.get_running_loop()
+        state = self._async_clients.get(loop)
+        if state is None:
+            client = self._new_async_groq_client()
+            closer = loop.create_task(self._close_at_loop_shutdown(loop, client))
+            state = self._async_clients[loop] = (client, closer)
+        return state[0]
+
+    async def _close_at_loop_shutdown(self, loop, client: AsyncGroq):
+        """
+        Wait until cancelled by the loop's shutdown, then close the client
+        """
+        try:
+            await loop.create_future()
+        finally:
+            # The entry's task refers to the loop, so it must go explicitly
+            self._async_clients.pop(loop, None)
+            await client.close()
+
+    def _api_key(self) -> Optional[str]:
+        api_key = os.environ.get("GROQ_API_KEY")
+        if not api_key and self.base_url:
+            return PLACEHOLDER_API_KEY
+        return api_key
+
+    def _new_async_groq_client(self) -> AsyncGroq:
+        return AsyncGroq(
+            api_key=self._api_key(),
+            base_url=self.base_url,
+            timeout=self.timeout,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=self.limits, timeout=self.timeout, http2=self.http2
+            ),
+        )
+
+    def _new_groq_client(self) -> Groq:
+        # The timeout is also passed to Groq, which would otherwise send its
+        # own defaults with every request. Retries are left to the caller's
+        # RetryPolicy and circuit breaker (see resilience.py).
+        return Groq(
+            api_key=self._api_key(),
+            base_url=self.base_url,
+            timeout=self.timeout,
+            max_retries=0,
+            http_client=httpx.Client(
+                limits=self.limits, timeout=self.timeout, http2=self.http2
+            ),
+        )
+
+    def close(self):
+        """
+        Close the process-wide client's connections
+        """
+        with self._lock:
+            if self._process_client is not None and self._process_client_pid == (
+                os.getpid()
+            ):
+                self._process_client.close()
+            self._process_client = self._process_client_pid = None
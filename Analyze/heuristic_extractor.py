@@ -0,0 +1,552 @@
+"""
+Heuristic Extractor Module
+
+Local, deterministic resume extraction that needs neither the network nor an
+API key. It produces the same fields as AIDataExtractor from precompiled
+regexes for contact details, section-heading segmentation and a word trie of
+known skills, degrees, certifications and languages, in a few milliseconds.
+Less accurate than the LLM, it stands in while Groq is unavailable or can be
+selected as the primary extractor (see EXTRACTION_MODE).
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .prompt_compaction import BULLET_PATTERN
+
+logger = logging.getLogger(__name__)
+
+MODE_LLM = "llm"
+MODE_HEURISTIC = "heuristic"
+EXTRACTION_MODES = (MODE_LLM, MODE_HEURISTIC)
+
+FALLBACK_HEURISTIC = "heuristic"
+FALLBACK_NONE = "none"
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}")
+PHONE_PATTERN = re.compile(r"\+?\(?\d[\d\s().-]{5,}\d")
+YEAR_RANGE_PATTERN = re.compile(r"^(?:19|20)\d{2}\s*[-–/]\s*(?:19|20)\d{2}$")
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+DURATION_PATTERN = re.compile(
+    r"\b(?:(?:19|20)\d{2}|present|current|now)\b"
+    r"|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{2,4}\b",
+    re.IGNORECASE,
+)
+CERTIFICATION_PATTERN = re.compile(r"\bcertifi(?:ed|cation|cate)\b", re.IGNORECASE)
+QUANTIFIED_PATTERN = re.compile(
+    r"\d+(?:\.\d+)?\s*(?:%|percent|x\b|k\b|\+)", re.IGNORECASE
+)
+URL_PATTERN = re.compile(r"https?://|www\.|linkedin\.com|github\.com", re.IGNORECASE)
+ITEM_SEPARATOR_PATTERN = re.compile(r"\s*(?:[,;|•·]|\s-\s)\s*")
+LABEL_PATTERN = re.compile(r"^[A-Za-z][\w &/-]{0,30}:\s*")
+# Words as the trie sees them: keeps "c++", "c#", "node.js" and "ci/cd" whole
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+
+# Section headings -> the field their lines go to; None marks sections whose
+# lines belong to no field (so they are not mistaken for the previous one)
+SECTION_HEADINGS = {
+    "education": "education_details",
+    "academic background": "education_details",
+    "academic qualifications": "education_details",
+    "educational qualifications": "education_details",
+    "qualifications": "education_details",
+    "experience": "work_experience",
+    "work experience": "work_experience",
+    "professional experience": "work_experience",
+    "employment": "work_experience",
+    "employment history": "work_experience",
+    "work history": "work_experience",
+    "internships": "work_experience",
+    "internship": "work_experience",
+    "skills": "skills",
+    "technical skills": "skills",
+    "key skills": "skills",
+    "core competencies": "skills",
+    "technologies": "skills",
+    "tools": "skills",
+    "skills & tools": "skills",
+    "skills and tools": "skills",
+    "certifications": "certifications",
+    "certification": "certifications",
+    "certificates": "certifications",
+    "licenses & certifications": "certifications",
+    "licenses and certifications": "certifications",
+    "courses & certifications": "certifications",
+    "projects": "projects",
+    "academic projects": "projects",
+    "personal projects": "projects",
+    "key projects": "projects",
+    "languages": "languages_spoken",
+    "languages known": "languages_spoken",
+    "languages spoken": "languages_spoken",
+    "hobbies": "hobbies_interests",
+    "interests": "hobbies_interests",
+    "hobbies and interests": "hobbies_interests",
+    "hobbies & interests": "hobbies_interests",
+    "achievements": "achievements",
+    "awards": "achievements",
+    "honors": "achievements",
+    "honors & awards": "achievements",
+    "awards & achievements": "achievements",
+    "accomplishments": "achievements",
+    "summary": None,
+    "professional summary": None,
+    "profile": None,
+    "objective": None,
+    "career objective": None,
+    "about me": None,
+    "personal details": None,
+    "personal information": None,
+    "contact": None,
+    "references": None,
+    "declaration": None,
+}
+
+STRING_FIELDS = ("full_name", "email_address", "phone_number")
+LIST_FIELDS = (
+    "education_details",
+    "work_experience",
+    "skills",
+    "certifications",
+    "projects",
+    "languages_spoken",
+    "hobbies_interests",
+    "achievements",
+)
+
+# fmt: off
+KNOWN_SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Go",
+    "Golang", "Rust", "Ruby", "PHP", "Kotlin", "Swift", "Scala", "R", "MATLAB",
+    "Perl", "Dart", "Bash", "Shell Scripting", "SQL", "NoSQL", "HTML", "CSS",
+    "Sass", "Django", "Flask", "FastAPI", "Spring", "Spring Boot", "Hibernate",
+    "Node.js", "Express", "Express.js", "React", "React.js", "React Native",
+    "Angular", "Vue", "Vue.js", "Next.js", "Svelte", "jQuery", "Bootstrap",
+    "Tailwind CSS", "Redux", "GraphQL", "REST", "REST APIs", "gRPC", ".NET",
+    "ASP.NET", "Laravel", "Rails", "Ruby on Rails", "Flutter", "Android", "iOS",
+    "PostgreSQL", "MySQL", "SQLite", "MongoDB", "Redis", "Cassandra",
+    "Elasticsearch", "DynamoDB", "Oracle", "SQL Server", "Firebase", "Kafka",
+    "RabbitMQ", "Celery", "Spark", "Apache Spark", "Hadoop", "Airflow",
+    "Snowflake", "Databricks", "dbt", "Tableau", "Power BI", "Excel", "Pandas",
+    "NumPy", "SciPy", "scikit-learn", "TensorFlow", "PyTorch", "Keras",
+    "OpenCV", "NLP", "Machine Learning", "Deep Learning", "Computer Vision",
+    "Data Analysis", "Data Science", "Data Visualization", "Statistics",
+    "LLM", "LangChain", "Docker", "Kubernetes", "Terraform", "Ansible",
+    "Jenkins", "GitHub Actions", "GitLab CI", "CI/CD", "AWS", "Azure", "GCP",
+    "Google Cloud", "Heroku", "Linux", "Unix", "Nginx", "Git", "GitHub",
+    "Jira", "Agile", "Scrum", "Microservices", "System Design", "Selenium",
+    "Pytest", "JUnit", "Jest", "Cypress", "Figma", "Photoshop", "Illustrator",
+    "SEO", "Salesforce", "SAP", "Communication", "Leadership", "Teamwork",
+    "Problem Solving", "Project Management", "Time Management",
+)
+
+KNOWN_DEGREES = (
+    "B.Tech", "B.E.", "B.E", "BE", "B.Sc", "B.Sc.", "BSc", "B.S.", "BS", "B.A.",
+    "BA", "B.Com", "BCA", "BBA", "M.Tech", "M.E.", "M.Sc", "M.Sc.", "MSc",
+    "M.S.", "MS", "M.A.", "MA", "M.Com", "MCA", "MBA", "Ph.D", "Ph.D.", "PhD",
+    "Bachelor", "Bachelors", "Bachelor's", "Master", "Masters", "Master's",
+    "Doctorate", "Associate Degree", "Diploma", "High School",
+    "Higher Secondary", "Secondary School", "HSC", "SSC", "12th", "10th",
+    "Intermediate",
+)
+
+KNOWN_CERTIFICATIONS = (
+    "AWS Certified", "Azure Fundamentals", "Azure Administrator",
+    "Google Cloud Certified", "Certified Kubernetes", "CKA", "CKAD", "PMP",
+    "CAPM", "Scrum Master", "CSM", "PSM", "ITIL", "CCNA", "CCNP",
+    "CompTIA", "Security+", "CISSP", "CEH", "OCA", "OCP", "Oracle Certified",
+    "Six Sigma", "TOEFL", "IELTS", "Coursera", "Udemy", "edX", "NPTEL",
+)
+
+KNOWN_LANGUAGES = (
+    "English", "Hindi", "Spanish", "French", "German", "Italian", "Portuguese",
+    "Russian", "Chinese", "Mandarin", "Cantonese", "Japanese", "Korean",
+    "Arabic", "Bengali", "Bangla", "Urdu", "Punjabi", "Marathi", "Gujarati",
+    "Tamil", "Telugu", "Kannada", "Malayalam", "Odia", "Nepali", "Turkish",
+    "Dutch", "Swedish", "Norwegian", "Danish", "Finnish", "Polish", "Greek",
+    "Hebrew", "Persian", "Farsi", "Thai", "Vietnamese", "Indonesian", "Malay",
+    "Swahili", "Tagalog", "Filipino", "Ukrainian", "Czech", "Romanian",
+)
+
+# Skills that are also everyday words; only taken from a skills section
+AMBIGUOUS_SKILLS = {
+    "C", "R", "Go", "Dart", "Express", "Spring", "Swift", "Excel", "Rails",
+    "Oracle", "REST", "Communication", "Leadership", "Teamwork",
+}
+# fmt: on
+
+INSTITUTION_WORDS = ("university", "college", "institute", "school", "academy")
+
+
+def _words(text: str) -> List[str]:
+    return WORD_PATTERN.findall(text.casefold())
+
+
+class KeywordTrie:
+    """
+    Word-level trie of known phrases, matched longest first
+
+    Each word of a text is visited once per phrase start, so matching a whole
+    resume against hundreds of phrases costs about as much as tokenizing it.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.root = {}
+        for phrase in phrases:
+            words = _words(phrase)
+            if not words:
+                continue
+            node = self.root
+            for word in words:
+                node = node.setdefault(word, {})
+            # The first spelling listed is the canonical one
+            node.setdefault(None, phrase)
+
+    def find_all(self, text: str) -> List[str]:
+        """
+        Canonical spellings of the phrases in text, in order of appearance
+        """
+        words = _words(text)
+        found = []
+        position = 0
+        while position < len(words):
+            node, match, end = self.root, None, position
+            for index in range(position, len(words)):
+                node = node.get(words[index])
+                if node is None:
+                    break
+                if None in node:
+                    match, end = node[None], index + 1
+            if match is None:
+                position += 1
+            else:
+                found.append(match)
+                position = end
+        return found
+
+    def contains(self, text: str) -> bool:
+        return bool(self.find_all(text))
+
+
+SKILL_TRIE = KeywordTrie(KNOWN_SKILLS)
+DEGREE_TRIE = KeywordTrie(KNOWN_DEGREES)
+CERTIFICATION_TRIE = KeywordTrie(KNOWN_CERTIFICATIONS)
+LANGUAGE_TRIE = KeywordTrie(KNOWN_LANGUAGES)
+
+
+def section_heading(line: str) -> Tuple[bool, Optional[str], str]:
+    """
+    Whether a line opens a section, the section's field and any content
+    after the heading on the same line
+    """
+    name, _, rest = line.partition(":")
+    key = name.strip().casefold()
+    if key in SECTION_HEADINGS and len(key) <= 40:
+        return True, SECTION_HEADINGS[key], rest.strip()
+    return False, None, ""
+
+
+def _dedupe(items: Iterable[str]) -> List[str]:
+    seen = set()
+    unique = []
+    for item in items:
+        key = item.casefold()
+        if item and key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+class HeuristicExtractor:
+    """
+    Rule-based resume extractor with the interface of AIDataExtractor
+
+    Usable as AIDataExtractor's fallback (instances are callable) or in its
+    place as the primary extractor.
+    """
+
+    def __call__(self, resume_text: str) -> Dict:
+        return self.extract_structured_data(resume_text)
+
+    def extract_structured_data(self, resume_text: str) -> Dict:
+        """
+        Extract structured data from resume text
+
+        Args:
+            resume_text: Raw text extracted from the resume
+
+        Returns:
+            Dictionary with the fields of AIDataExtractor._map_groq_response;
+            missing fields are "" or []
+        """
+        lines = self._clean_lines(resume_text)
+        preamble, sections = self._split_sections(lines)
+
+        structured_data = {
+            "full_name": self._full_name(preamble or lines),
+            "email_address": self._email(resume_text),
+            "phone_number": self._phone(resume_text),
+            "education_details": self._education(sections, lines),
+            "work_experience": self._work_experience(sections),
+            "skills": self._skills(sections, resume_text),
+            "certifications": self._certifications(sections, lines),
+            "projects": self._projects(sections),
+            "languages_spoken": self._languages(sections, lines),
+            "hobbies_interests": self._items(sections.get("hobbies_interests", [])),
+            "achievements": self._achievements(sections, lines),
+        }
+        return structured_data
+
+    async def extract_structured_data_async(self, resume_text: str) -> Dict:
+        """
+        Asynchronous extract_structured_data; runs inline, it takes
+        milliseconds
+        """
+        return self.extract_structured_data(resume_text)
+
+    def stream_structured_data(self, resume_text: str) -> Iterator[Dict]:
+        """
+        Extract structured data, yielding the events of
+        AIDataExtractor.stream_structured_data
+        """
+        started = time.monotonic()
+        structured_data = self.extract_structured_data(resume_text)
+        elapsed = time.monotonic() - started
+        for field, value in structured_data.items():
+            yield {"event": "field", "field": field, "value": value, "elapsed": elapsed}
+        timing = {
+            "cached": False,
+            "first_token": None,
+            "first_field": elapsed,
+            "total": elapsed,
+        }
+        yield {"event": "complete", "data": structured_data, "timing": timing}
+
+    def extract_many(self, resume_texts: List[str]) -> Dict:
+        """
+        Extract a batch of resumes, in the format of
+        AIDataExtractor.extract_many
+        """
+        started = time.monotonic()
+        results = [
+            {"success": True, "data": self.extract_structured_data(text), "error": None}
+            for text in resume_texts
+        ]
+        elapsed = time.monotonic() - started
+        stats = {
+            "items": len(resume_texts),
+            "succeeded": len(results),
+            "failed": 0,
+            "cache_hits": 0,
+            "api_calls": 0,
+            "elapsed": elapsed,
+            "items_per_second": len(results) / elapsed if elapsed else 0.0,
+        }
+        return {"results": results, "stats": stats}
+
+    async def extract_many_async(self, resume_texts: List[str]) -> Dict:
+        return await asyncio.to_thread(self.extract_many, resume_texts)
+
+    def _clean_lines(self, resume_text: str) -> List[str]:
+        lines = []
+        for line in resume_text.splitlines():
+            line = " ".join(line.split())
+            if line:
+                lines.append(line)
+        return lines
+
+    def _split_sections(self, lines: List[str]) -> Tuple[List[str], Dict]:
+        """
+        Lines before the first heading, and the lines of each field's
+        sections (a field's sections are concatenated)
+        """
+        preamble = []
+        sections = {}
+        current = preamble
+        for line in lines:
+            is_heading, field, rest = section_heading(line)
+            if is_heading:
+                current = sections.setdefault(field, []) if field else []
+                if rest:
+                    # A one-line section ("Hobbies: Chess, Trekking"); what
+                    # follows belongs to no known section
+                    current.append(rest)
+                    current = []
+            else:
+                current.append(line)
+        return preamble, sections
+
+    def _full_name(self, lines: List[str]) -> str:
+        for line in lines[:5]:
+            if EMAIL_PATTERN.search(line) or URL_PATTERN.search(line):
+                continue
+            if any(character.isdigit() for character in line):
+                continue
+            words = line.split()
+            if 2 <= len(words) <= 4 and all(
+                word.replace(".", "").replace("-", "").replace("'", "").isalpha()
+                and word[0].isupper()
+                for word in words
+            ):
+                return line.title() if line.isupper() else line
+        return ""
+
+    def _email(self, resume_text: str) -> str:
+        match = EMAIL_PATTERN.search(resume_text)
+        return match.group() if match else ""
+
+    def _phone(self, resume_text: str) -> str:
+        fallback = ""
+        for match in PHONE_PATTERN.finditer(resume_text):
+            candidate = match.group().strip()
+            digits = sum(character.isdigit() for character in candidate)
+            if YEAR_RANGE_PATTERN.match(candidate) or not 7 <= digits <= 15:
+                continue
+            if digits >= 10 or candidate.startswith("+"):
+                return candidate[:20]
+            fallback = fallback or candidate[:20]
+        return fallback
+
+    def _strip_bullet(self, line: str) -> Tuple[bool, str]:
+        stripped = BULLET_PATTERN.sub("", line)
+        if stripped == line and line.startswith("- "):
+            stripped = line[2:]
+        return stripped != line, stripped.strip()
+
+    def _items(self, lines: List[str]) -> List[str]:
+        """
+        Short list items of a section, one per line or separated by commas
+        """
+        items = []
+        for line in lines:
+            _, line = self._strip_bullet(line)
+            line = LABEL_PATTERN.sub("", line)
+            items.extend(
+                item.strip(" .")
+                for item in ITEM_SEPARATOR_PATTERN.split(line)
+                if item.strip(" .")
+            )
+        return _dedupe(items)
+
+    def _entries(self, lines: List[str]) -> List[str]:
+        """
+        Entries of a section, one per non-bullet line
+        """
+        entries = []
+        for line in lines:
+            is_bullet, text = self._strip_bullet(line)
+            if text and not is_bullet:
+                entries.append(text)
+        return entries
+
+    def _merge_date_lines(self, entries: List[str]) -> List[str]:
+        """
+        Attach lines holding only a date ("2019 - 2020") to the entry above
+        """
+        merged = []
+        for entry in entries:
+            if merged and not re.search(r"\w", DURATION_PATTERN.sub("", entry)):
+                merged[-1] = f"{merged[-1]} ({entry})"
+            else:
+                merged.append(entry)
+        return merged
+
+    def _has_institution(self, text: str) -> bool:
+        return any(word in text.casefold() for word in INSTITUTION_WORDS)
+
+    def _education(self, sections: Dict, lines: List[str]) -> List[str]:
+        if "education_details" in sections:
+            entries = []
+            for text in self._merge_date_lines(
+                self._entries(sections["education_details"])
+            ):
+                # "Degree" on one line and "Institution, years" on the next
+                if (
+                    entries
+                    and not DEGREE_TRIE.contains(text)
+                    and DEGREE_TRIE.contains(entries[-1])
+                    and not self._has_institution(entries[-1])
+                ):
+                    entries[-1] = f"{entries[-1]}, {text}"
+                else:
+                    entries.append(text)
+            candidates = [
+                text
+                for text in entries
+                if DEGREE_TRIE.contains(text)
+                or YEAR_PATTERN.search(text)
+                or self._has_institution(text)
+            ]
+            return _dedupe(candidates or entries)
+        return _dedupe(
+            self._strip_bullet(line)[1]
+            for line in lines
+            if DEGREE_TRIE.contains(line) and self._has_institution(line)
+        )
+
+    def _work_experience(self, sections: Dict) -> List[str]:
+        entries = self._merge_date_lines(
+            self._entries(sections.get("work_experience", []))
+        )
+        dated = [
+            entry
+            for entry in entries
+            if DURATION_PATTERN.search(entry) or " at " in entry
+        ]
+        return _dedupe(dated or entries)
+
+    def _skills(self, sections: Dict, resume_text: str) -> List[str]:
+        listed = [
+            item
+            for item in self._items(sections.get("skills", []))
+            if len(item.split()) <= 4
+        ]
+        mentioned = [
+            skill
+            for skill in SKILL_TRIE.find_all(resume_text)
+            if skill not in AMBIGUOUS_SKILLS
+        ]
+        return _dedupe(listed + mentioned)
+
+    def _certifications(self, sections: Dict, lines: List[str]) -> List[str]:
+        if "certifications" in sections:
+            return _dedupe(self._entries(sections["certifications"]))
+        return _dedupe(
+            self._strip_bullet(line)[1]
+            for line in lines
+            if CERTIFICATION_TRIE.contains(line) or CERTIFICATION_PATTERN.search(line)
+        )
+
+    def _projects(self, sections: Dict) -> List[str]:
+        projects = []
+        for line in sections.get("projects", []):
+            is_bullet, text = self._strip_bullet(line)
+            if not text:
+                continue
+            if is_bullet and projects:
+                separator = " - " if " - " not in projects[-1] else " "
+                projects[-1] = f"{projects[-1]}{separator}{text}"
+            else:
+                projects.append(text)
+        return _dedupe(projects)
+
+    def _languages(self, sections: Dict, lines: List[str]) -> List[str]:
+        source = sections.get("languages_spoken")
+        if source is None:
+            source = [line for line in lines if line.casefold().startswith("languages")]
+        return _dedupe(LANGUAGE_TRIE.find_all("\n".join(source)))
+
+    def _achievements(self, sections: Dict, lines: List[str]) -> List[str]:
+        achievements = [
+            self._strip_bullet(line)[1] for line in sections.get("achievements", [])
+        ]
+        # Quantified results anywhere, usually bullets under a job
+        achievements += [
+            text
+            for is_bullet, text in map(self._strip_bullet, lines)
+            if is_bullet and QUANTIFIED_PATTERN.search(text)
+        ]
+        return _dedupe(achievements)
@@ -0,0 +1,193 @@
+"""
+Image Preprocessing Module
+
+Cleans up page images before OCR: grayscale conversion, adaptive
+binarization, deskewing and margin cropping. The output is a small 1-bit
+image, so tesseract has fewer pixels to scan and pytesseract less to encode.
+Uploaded photos are also oriented and downscaled to OCR resolution.
+"""
+
+import logging
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Bradley-Roth thresholding: a pixel is ink when it is this much darker than
+# the mean of its neighbourhood
+BINARIZE_THRESHOLD = 0.15
+
+# Skew search range and resolution, in degrees
+MAX_SKEW_ANGLE = 5.0
+SKEW_ANGLE_STEP = 0.25
+
+# Skew is estimated on a copy at most this wide
+SKEW_SAMPLE_WIDTH = 800
+
+# White border kept around the cropped text, in pixels
+CROP_PADDING = 20
+
+# Longest side of an uploaded image after downscaling: a US Letter page at
+# 300 DPI, beyond which tesseract gains nothing but time
+MAX_IMAGE_SIDE = 3300
+
+
+def draft_for_ocr(image: Image.Image, max_side: int = MAX_IMAGE_SIDE):
+    """
+    Have an opened JPEG decode at a reduced scale, in grayscale
+
+    libjpeg can decode at 1/2, 1/4 or 1/8 scale; the smallest that keeps the
+    longest side at least max_side is used, leaving fit_for_ocr to resample
+    only the rest. Other formats ignore the request. Must be called before
+    the image is loaded (or copied).
+    """
+    if max(image.size) > max_side:
+        scale = max_side / max(image.size)
+        image.draft(
+            "L", (math.ceil(image.width * scale), math.ceil(image.height * scale))
+        )
+
+
+def fit_for_ocr(image: Image.Image, max_side: int = MAX_IMAGE_SIDE) -> Image.Image:
+    """
+    Downscale a photo or screenshot to OCR resolution and turn it upright
+
+    Args:
+        image: Uploaded image (modified in place when downscaled)
+        max_side: Longest side allowed, in pixels
+
+    Returns:
+        Image no larger than max_side on either side, EXIF rotation applied
+    """
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side))
+    return ImageOps.exif_transpose(image)
+
+
+def to_grayscale(image: Image.Image) -> np.ndarray:
+    """
+    Return the image as a 2-D uint8 array of luminance values
+    """
+    # PIL's converter is a single C pass over the buffer; no need to redo the
+    # ITU-R 601 weighting in NumPy
+    return np.asarray(image.convert("L"))
+
+
+def binarize_adaptive(
+    gray: np.ndarray,
+    window: Optional[int] = None,
+    threshold: float = BINARIZE_THRESHOLD,
+) -> np.ndarray:
+    """
+    Separate ink from background with a locally adaptive threshold
+
+    Each pixel is compared with the mean of the window around it, so uneven
+    lighting and grey scanner backgrounds do not swallow faint text. The
+    local means come from PIL's box blur, which is several times faster than
+    an integral image over int64 arrays.
+
+    Args:
+        gray: Grayscale image as a 2-D uint8 array
+        window: Neighbourhood size in pixels (default: 1/40 of the width)
+        threshold: How much darker than the local mean counts as ink
+
+    Returns:
+        Boolean array, True where there is ink
+    """
+    if window is None:
+        window = max(15, gray.shape[1] // 40)
+    local_mean = np.asarray(
+        Image.fromarray(gray).filter(ImageFilter.BoxBlur(window // 2))
+    )
+
+    # gray < mean * (1 - threshold) in integer arithmetic (255 * 100 fits
+    # in uint16)
+    scale = round((1 - threshold) * 100)
+    return gray.astype(np.uint16) * 100 < local_mean.astype(np.uint16) * scale
+
+
+def estimate_skew(
+    ink: np.ndarray,
+    max_angle: float = MAX_SKEW_ANGLE,
+    step: float = SKEW_ANGLE_STEP,
+) -> float:
+    """
+    Estimate the rotation of the text lines in degrees
+
+    Ink pixels are sheared by each candidate angle and projected onto the
+    vertical axis; the angle that lines text up into the sharpest row profile
+    wins. Positive angles mean lines run downhill to the right.
+
+    Args:
+        ink: Boolean ink mask
+        max_angle: Largest skew considered, in either direction
+        step: Angle resolution
+
+    Returns:
+        Skew angle in degrees (0.0 for pages with too little ink)
+    """
+    stride = max(1, ink.shape[1] // SKEW_SAMPLE_WIDTH)
+    ys, xs = np.nonzero(ink[::stride, ::stride])
+    if len(ys) < 100:
+        return 0.0
+
+    angles = np.arange(-max_angle, max_angle + step / 2, step)
+    best_angle, best_score = 0.0, -1
+    for angle in angles:
+        shifted = np.rint(ys - xs * np.tan(np.radians(angle))).astype(np.int64)
+        profile = np.bincount(shifted - shifted.min())
+        score = int(np.dot(profile, profile))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+
+    return best_angle
+
+
+def content_box(
+    ink: np.ndarray, padding: int = CROP_PADDING
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Bounding box (left, top, right, bottom) of the ink plus padding, or None
+    """
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if not len(rows):
+        return None
+
+    height, width = ink.shape
+    return (
+        max(0, int(cols[0]) - padding),
+        max(0, int(rows[0]) - padding),
+        min(width, int(cols[-1]) + padding + 1),
+        min(height, int(rows[-1]) + padding + 1),
+    )
+
+
+def preprocess_page(image: Image.Image) -> Image.Image:
+    """
+    Prepare a rendered page for OCR
+
+    Args:
+        image: Page image in any PIL mode
+
+    Returns:
+        Deskewed, margin-cropped 1-bit image with black text on white
+    """
+    ink = binarize_adaptive(to_grayscale(image))
+
+    angle = estimate_skew(ink)
+    # PIL "1" images store ink as 0 (black)
+    page = Image.fromarray(~ink)
+    if angle:
+        logger.debug(f"Deskewing page by {angle:.2f} degrees")
+        page = page.rotate(angle, expand=True, fillcolor=1)
+        ink = ~np.asarray(page)
+
+    box = content_box(ink)
+    if box is not None:
+        page = page.crop(box)
+
+    return page
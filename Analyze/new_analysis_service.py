@@ -7,14 +7,26 @@ structured data extraction using AI, and comprehensive scoring.
 
 import json
 import logging
+import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+
+from asgiref.sync import sync_to_async
 
 # Import our modular components
 from .ai_data_extractor import AIDataExtractor
+from .extraction_sandbox import ExtractionError
+from .heuristic_extractor import (
+    EXTRACTION_MODES,
+    FALLBACK_HEURISTIC,
+    FALLBACK_NONE,
+    MODE_HEURISTIC,
+    MODE_LLM,
+    HeuristicExtractor,
+)
 from .recommendations_generator import RecommendationsGenerator
 from .scoring_engine import ResumeScoringEngine
-from .text_extractor import ResumeTextExtractor
+from .text_extractor import ResumeSource, ResumeTextExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -26,77 +38,229 @@ class NewResumeAnalysisService:
 
     def __init__(self):
         self.text_extractor = ResumeTextExtractor()
-        self.data_extractor = AIDataExtractor()
+        self.data_extractor = self._build_data_extractor()
         self.scoring_engine = ResumeScoringEngine()
         self.recommendations_generator = RecommendationsGenerator()
 
-    def extract_resume_text(self, pdf_path: str) -> str:
+    def _build_data_extractor(self):
+        """
+        Structured data extractor selected by EXTRACTION_MODE and
+        EXTRACTION_FALLBACK
+
+        "llm" (the default) uses Groq, falling back to the heuristic
+        extractor when Groq fails or its circuit is open; "heuristic" skips
+        Groq entirely, as does a missing GROQ_API_KEY unless GROQ_BASE_URL
+        points at another API (e.g. a fake server, which needs no key).
+        """
+        mode = os.environ.get("EXTRACTION_MODE", MODE_LLM).lower()
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode '{mode}'")
+        if (
+            mode == MODE_LLM
+            and not os.environ.get("GROQ_API_KEY")
+            and not os.environ.get("GROQ_BASE_URL")
+        ):
+            logger.warning("GROQ_API_KEY is not set, using heuristic extraction")
+            mode = MODE_HEURISTIC
+        if mode == MODE_HEURISTIC:
+            return HeuristicExtractor()
+
+        fallback = os.environ.get("EXTRACTION_FALLBACK", FALLBACK_HEURISTIC).lower()
+        if fallback not in (FALLBACK_HEURISTIC, FALLBACK_NONE):
+            raise ValueError(f"Unknown extraction fallback '{fallback}'")
+        return AIDataExtractor(
+            fallback=HeuristicExtractor() if fallback == FALLBACK_HEURISTIC else None
+        )
+
+    def extract_resume_text(self, resume_file: ResumeSource) -> str:
         """
         Extract text from resume PDF using the text extractor module
         """
-        return self.text_extractor.extract_text(pdf_path)
+        return self.text_extractor.extract_text(resume_file)
 
-    def extract_and_analyze_resume(self, file_path: str) -> Dict:
+    def extract_and_analyze_resume(self, resume_file: ResumeSource) -> Dict:
         """
         Extract text from resume and analyze it using Groq API
 
         Args:
-            file_path: Path to uploaded resume file
+            resume_file: Path to the uploaded resume file, its bytes, or a
+                binary file object
 
         Returns:
             Dictionary with extraction and analysis results
         """
         try:
             # Step 1: Extract text from resume
-            resume_text = self.extract_resume_text(file_path)
+            extraction = self.text_extractor.extract_text_with_stats(resume_file)
+            resume_text = extraction.pop("text")
 
             if not resume_text:
-                return {
-                    "success": False,
-                    "error": "Could not extract text from resume",
-                    "extracted_data": {},
-                    "analysis": {},
-                }
+                return self._failure("Could not extract text from resume")
 
             # Step 2: Use Groq API to extract structured data
             structured_data = self._extract_structured_data(resume_text)
 
-            if not structured_data:
-                return {
-                    "success": False,
-                    "error": "Could not extract structured data from resume",
-                    "extracted_data": {},
-                    "analysis": {},
-                }
+            # Steps 3 and 4: Validate the data and analyze it
+            return self._analysis_result(resume_text, extraction, structured_data)
 
-            # Step 3: Validate and normalize data to prevent type errors
-            structured_data = self._validate_and_normalize_data(structured_data)
+        except ExtractionError as e:
+            return self._extraction_failure(e)
+        except Exception as e:
+            logger.error(f"Error in extract_and_analyze_resume: {e}")
+            return self._failure(str(e))
+
+    async def extract_and_analyze_resume_async(self, resume_file: ResumeSource) -> Dict:
+        """
+        Asynchronous extract_and_analyze_resume for ASGI views
 
-            # Log final structured data for debugging
-            logger.info("=== FINAL STRUCTURED DATA ===")
-            logger.info(json.dumps(structured_data, indent=2, ensure_ascii=False))
+        Text extraction runs in a worker thread and the Groq call on the
+        asynchronous client, so the event loop keeps serving other requests
+        while either is in progress.
 
-            # Step 4: Generate analysis and recommendations
-            analysis_result = self._generate_analysis(structured_data, resume_text)
+        Args:
+            resume_file: Path to the uploaded resume file, its bytes, or a
+                binary file object
 
-            return {
-                "success": True,
-                "resume_text": resume_text,
+        Returns:
+            Dictionary with extraction and analysis results
+        """
+        try:
+            extraction = await sync_to_async(
+                self.text_extractor.extract_text_with_stats, thread_sensitive=False
+            )(resume_file)
+            resume_text = extraction.pop("text")
+
+            if not resume_text:
+                return self._failure("Could not extract text from resume")
+
+            structured_data = await self.data_extractor.extract_structured_data_async(
+                resume_text
+            )
+
+            return self._analysis_result(resume_text, extraction, structured_data)
+
+        except ExtractionError as e:
+            return self._extraction_failure(e)
+        except Exception as e:
+            logger.error(f"Error in extract_and_analyze_resume_async: {e}")
+            return self._failure(str(e))
+
+    def stream_analysis(self, resume_file: ResumeSource) -> Iterator[Dict]:
+        """
+        Extract and analyze a resume, reporting progress as it happens
+
+        The Groq completion is streamed, so each structured field is passed
+        on, with the score of the fields seen so far, while the model is
+        still writing the rest.
+
+        Args:
+            resume_file: Path to the uploaded resume file, its bytes, or a
+                binary file object
+
+        Yields:
+            {"event": "text", "word_count", "char_count"} once the text is
+            extracted, {"event": "field", "field", "value", "elapsed",
+            "partial_score"} per structured field, and finally
+            {"event": "result", "result", "timing"} where "result" is what
+            extract_and_analyze_resume returns
+        """
+        try:
+            extraction = self.text_extractor.extract_text_with_stats(resume_file)
+            resume_text = extraction.pop("text")
+
+            if not resume_text:
+                yield {
+                    "event": "result",
+                    "result": self._failure("Could not extract text from resume"),
+                    "timing": {},
+                }
+                return
+
+            yield {
+                "event": "text",
                 "word_count": len(resume_text.split()),
                 "char_count": len(resume_text),
-                "extracted_data": structured_data,
-                "analysis": analysis_result,
             }
 
-        except Exception as e:
-            logger.error(f"Error in extract_and_analyze_resume: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "extracted_data": {},
-                "analysis": {},
+            fields = {}
+            for event in self.data_extractor.stream_structured_data(resume_text):
+                if event["event"] == "field":
+                    fields[event["field"]] = event["value"]
+                    # A lower bound: fields still to come count as empty
+                    partial_score = self.scoring_engine.calculate_overall_score(
+                        self._validate_and_normalize_data(fields)
+                    )
+                    yield {**event, "partial_score": partial_score}
+                else:
+                    structured_data, timing = event["data"], event["timing"]
+
+            yield {
+                "event": "result",
+                "result": self._analysis_result(
+                    resume_text, extraction, structured_data
+                ),
+                "timing": timing,
             }
 
+        except ExtractionError as e:
+            yield {
+                "event": "result",
+                "result": self._extraction_failure(e),
+                "timing": {},
+            }
+        except Exception as e:
+            logger.error(f"Error in stream_analysis: {e}")
+            yield {"event": "result", "result": self._failure(str(e)), "timing": {}}
+
+    def _analysis_result(
+        self, resume_text: str, extraction: Dict, structured_data: Dict
+    ) -> Dict:
+        """
+        Validate the structured data, analyze it and build the service result
+        """
+        if not structured_data:
+            return self._failure("Could not extract structured data from resume")
+
+        # Validate and normalize data to prevent type errors
+        structured_data = self._validate_and_normalize_data(structured_data)
+
+        # Log final structured data for debugging
+        logger.info("=== FINAL STRUCTURED DATA ===")
+        logger.info(json.dumps(structured_data, indent=2, ensure_ascii=False))
+
+        # Generate analysis and recommendations
+        analysis_result = self._generate_analysis(structured_data, resume_text)
+
+        return {
+            "success": True,
+            "resume_text": resume_text,
+            "word_count": len(resume_text.split()),
+            "char_count": len(resume_text),
+            "extraction": extraction,
+            "extracted_data": structured_data,
+            "analysis": analysis_result,
+        }
+
+    def _extraction_failure(self, error: ExtractionError) -> Dict:
+        """
+        Result for an upload rejected during text extraction
+        """
+        # The upload itself is at fault (too large, too slow, too many pages);
+        # report why so the user can fix the file
+        logger.warning(f"Resume rejected during text extraction: {error}")
+        return {
+            **self._failure(str(error)),
+            "error_type": error.__class__.__name__,
+        }
+
+    def _failure(self, error: str) -> Dict:
+        return {
+            "success": False,
+            "error": error,
+            "extracted_data": {},
+            "analysis": {},
+        }
+
     def _extract_structured_data(self, resume_text: str) -> Dict:
         """
         Extract structured data from resume text using AI data extractor
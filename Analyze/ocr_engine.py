@@ -0,0 +1,728 @@
+"""
+OCR Engine Module
+
+Renders PDF pages to images and recognizes them with tesseract. Pages can be
+processed serially in the calling process, spread across a bounded, reusable
+process pool, or recognized together in a single tesseract run.
+"""
+
+import atexit
+import functools
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from .cache_backends import MemoryCacheBackend
+from .image_preprocessing import preprocess_page
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pytesseract
+    from pdf2image import convert_from_path, pdfinfo_from_path
+
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+    logger.warning(
+        "OCR libraries not available. Only text-based PDFs will be supported."
+    )
+
+DEFAULT_DPI = 300  # High DPI for better OCR
+DEFAULT_LANG = "eng"
+
+# OCR_LANG=auto detects the script of each document before OCR
+LANG_AUTO = "auto"
+
+# Script detection runs on a low-resolution render of one page
+SCRIPT_DETECTION_DPI = 100
+MIN_SCRIPT_CONFIDENCE = 1.0  # tesseract OSD script confidence
+
+# Tesseract OSD script name -> language pack used for the full OCR pass
+SCRIPT_LANGUAGES = {
+    "Latin": "eng",
+    "Arabic": "ara",
+    "Bengali": "ben",
+    "Cyrillic": "rus",
+    "Devanagari": "hin",
+    "Greek": "ell",
+    "Gujarati": "guj",
+    "Gurmukhi": "pan",
+    "Han": "chi_sim",
+    "Hangul": "kor",
+    "Hebrew": "heb",
+    "Japanese": "jpn",
+    "Kannada": "kan",
+    "Malayalam": "mal",
+    "Tamil": "tam",
+    "Telugu": "tel",
+    "Thai": "tha",
+}
+
+# Mean tesseract word confidence (0-100) below which a page rendered at a
+# lower DPI is re-rendered at the next DPI level
+DEFAULT_MIN_CONFIDENCE = 70
+
+OCR_MODE_SERIAL = "serial"
+OCR_MODE_PARALLEL = "parallel"
+OCR_MODE_BATCH = "batch"
+OCR_MODES = (OCR_MODE_SERIAL, OCR_MODE_PARALLEL, OCR_MODE_BATCH)
+
+# Tesseract's text renderer ends every page with this separator
+PAGE_SEPARATOR = "\f"
+
+
+def render_pdf_page(pdf_path: str, page_number: int, dpi: int):
+    """
+    Render a single PDF page to a PIL image, or None if the page is missing
+    """
+    images = convert_from_path(
+        pdf_path, dpi=dpi, first_page=page_number, last_page=page_number
+    )
+    return images[0] if images else None
+
+
+def recognize_image(image, lang: str = DEFAULT_LANG) -> Tuple[str, float]:
+    """
+    OCR an image and report tesseract's mean word confidence
+
+    Text is rebuilt line by line from ``image_to_data`` so that a single
+    tesseract run yields both the text and the confidences.
+
+    Returns:
+        Tuple of (recognized text, mean word confidence from 0 to 100)
+    """
+    data = pytesseract.image_to_data(
+        image, lang=lang, output_type=pytesseract.Output.DICT
+    )
+
+    lines = {}
+    confidences = []
+    for index, word in enumerate(data["text"]):
+        word = (word or "").strip()
+        if not word:
+            continue
+        confidence = float(data["conf"][index])
+        if confidence >= 0:
+            confidences.append(confidence)
+        line_key = (
+            data["block_num"][index],
+            data["par_num"][index],
+            data["line_num"][index],
+        )
+        lines.setdefault(line_key, []).append(word)
+
+    text = "\n".join(" ".join(words) for words in lines.values())
+    mean_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return text, mean_confidence
+
+
+def ocr_pdf_page(
+    pdf_path: str,
+    page_number: int,
+    dpi_levels: Sequence[int] = (DEFAULT_DPI,),
+    lang: str = DEFAULT_LANG,
+    min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    preprocess: bool = False,
+) -> str:
+    """
+    Render a single PDF page and run OCR on it
+
+    With several DPI levels the page is first OCRed at the lowest one and only
+    re-rendered at the next level while tesseract's mean word confidence stays
+    below ``min_confidence``. The most confident result is returned.
+
+    Module-level so it can be pickled and executed inside pool workers.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_number: 1-based page number to render
+        dpi_levels: Rendering resolutions to try, in increasing order
+        lang: Tesseract language pack(s)
+        min_confidence: Confidence needed to stop escalating
+        preprocess: Clean up the page image (binarize, deskew, crop) first
+
+    Returns:
+        Recognized text for the page
+    """
+    if len(dpi_levels) == 1:
+        image = render_pdf_page(pdf_path, page_number, dpi_levels[0])
+        if image is None:
+            return ""
+        if preprocess:
+            image = preprocess_page(image)
+        return pytesseract.image_to_string(image, lang=lang)
+
+    best_text, best_confidence = "", -1.0
+    for dpi in dpi_levels:
+        image = render_pdf_page(pdf_path, page_number, dpi)
+        if image is None:
+            return ""
+        if preprocess:
+            image = preprocess_page(image)
+        text, confidence = recognize_image(image, lang=lang)
+        del image  # Release the page before rendering the next level
+
+        if confidence > best_confidence:
+            best_text, best_confidence = text, confidence
+        if confidence >= min_confidence:
+            break
+        logger.debug(
+            f"  Page {page_number} OCR confidence {confidence:.0f} at {dpi} DPI, "
+            "escalating..."
+        )
+
+    return best_text
+
+
+@functools.lru_cache(maxsize=1)
+def installed_languages() -> frozenset:
+    """
+    Language packs installed for tesseract (empty if they cannot be listed)
+    """
+    try:
+        return frozenset(pytesseract.get_languages(config=""))
+    except Exception as e:
+        logger.warning(f"Could not list tesseract languages: {e}")
+        return frozenset()
+
+
+def detect_script(image) -> Optional[str]:
+    """
+    Detect the dominant writing system of a page image with tesseract OSD
+
+    Returns:
+        OSD script name (e.g. "Latin", "Devanagari"), or None when there is
+        too little text to tell or OSD data is not installed
+    """
+    try:
+        osd = pytesseract.image_to_osd(
+            image, config="--psm 0", output_type=pytesseract.Output.DICT
+        )
+    except pytesseract.TesseractError as e:
+        logger.debug(f"Script detection failed: {e}")
+        return None
+
+    if float(osd.get("script_conf", 0)) < MIN_SCRIPT_CONFIDENCE:
+        return None
+    return osd.get("script")
+
+
+def languages_for_script(script: Optional[str]) -> str:
+    """
+    Smallest set of language packs for a script, as a tesseract lang string
+
+    Resumes in other scripts still carry English names, e-mail addresses and
+    skills, so English is kept alongside the script's own pack. Packs that are
+    not installed are dropped.
+    """
+    languages = [SCRIPT_LANGUAGES.get(script, DEFAULT_LANG)]
+    if DEFAULT_LANG not in languages:
+        languages.append(DEFAULT_LANG)
+
+    installed = installed_languages()
+    if installed:
+        languages = [language for language in languages if language in installed]
+    return "+".join(languages) or DEFAULT_LANG
+
+
+def _page_runs(page_numbers: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    Group page numbers into (first, last) runs of consecutive pages, in order
+    """
+    runs = []
+    for page_number in page_numbers:
+        if runs and page_number == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page_number)
+        else:
+            runs.append((page_number, page_number))
+    return runs
+
+
+def _page_confidences(tsv_text: str, page_count: int) -> List[float]:
+    """
+    Mean word confidence per page from tesseract's TSV output
+    """
+    confidences = [[] for _ in range(page_count)]
+    rows = tsv_text.splitlines()
+    header = rows[0].split("\t") if rows else []
+    for row in rows[1:]:
+        fields = dict(zip(header, row.split("\t")))
+        if not fields.get("text", "").strip() or float(fields["conf"]) < 0:
+            continue
+        confidences[int(fields["page_num"]) - 1].append(float(fields["conf"]))
+    return [sum(values) / len(values) if values else 0.0 for values in confidences]
+
+
+def ocr_pdf_batch(
+    pdf_path: str,
+    page_numbers: Sequence[int],
+    dpi: int = DEFAULT_DPI,
+    lang: str = DEFAULT_LANG,
+    with_confidence: bool = False,
+    preprocess: bool = False,
+) -> List[Tuple[str, Optional[float]]]:
+    """
+    Recognize several PDF pages with a single tesseract process
+
+    pdftoppm writes the pages straight to uncompressed grayscale files, and
+    tesseract reads them from a list file, so there is no per-page process
+    start-up and no PIL round trip or PNG encoding. The text output is split
+    back into pages on tesseract's page separator.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: 1-based pages to recognize
+        dpi: Rendering resolution
+        lang: Tesseract language pack(s)
+        with_confidence: Also report each page's mean word confidence
+        preprocess: Clean up the page images (binarize, deskew, crop) first
+
+    Returns:
+        (text, confidence) for each requested page in the order requested;
+        the confidence is None unless with_confidence is set
+
+    Raises:
+        RuntimeError: tesseract failed or returned a different page count
+    """
+    with tempfile.TemporaryDirectory(prefix="ocr-batch-") as work_dir:
+        image_paths = []
+        for index, (first_page, last_page) in enumerate(_page_runs(page_numbers)):
+            image_paths += convert_from_path(
+                pdf_path,
+                dpi=dpi,
+                first_page=first_page,
+                last_page=last_page,
+                output_folder=work_dir,
+                output_file=f"run{index:04d}-",
+                fmt="ppm",
+                grayscale=True,
+                paths_only=True,
+            )
+        if len(image_paths) != len(page_numbers):
+            raise RuntimeError(
+                f"Rendered {len(image_paths)} of {len(page_numbers)} pages"
+            )
+
+        if preprocess:
+            # 1-bit pages are written as PBM, which tesseract reads natively
+            for index, image_path in enumerate(image_paths):
+                with Image.open(image_path) as image:
+                    page = preprocess_page(image)
+                image_paths[index] = os.path.splitext(image_path)[0] + ".pbm"
+                page.save(image_paths[index], format="PPM")
+
+        list_path = os.path.join(work_dir, "pages.txt")
+        with open(list_path, "w", encoding="utf-8") as list_file:
+            list_file.write("\n".join(image_paths) + "\n")
+
+        output_base = os.path.join(work_dir, "ocr")
+        command = [
+            pytesseract.pytesseract.tesseract_cmd,
+            list_path,
+            output_base,
+            "-l",
+            lang,
+            "txt",
+        ]
+        if with_confidence:
+            command.append("tsv")
+        completed = subprocess.run(command, capture_output=True)
+        if completed.returncode != 0:
+            raise RuntimeError(
+                f"tesseract exited with code {completed.returncode}: "
+                f"{completed.stderr.decode(errors='replace').strip()}"
+            )
+
+        with open(output_base + ".txt", encoding="utf-8") as text_file:
+            texts = text_file.read().split(PAGE_SEPARATOR)
+        # The separator follows every page, leaving an empty trailing item
+        if texts and not texts[-1].strip():
+            texts.pop()
+        if len(texts) != len(page_numbers):
+            raise RuntimeError(
+                f"tesseract returned {len(texts)} pages, expected {len(page_numbers)}"
+            )
+
+        confidences = [None] * len(texts)
+        if with_confidence:
+            with open(output_base + ".tsv", encoding="utf-8") as tsv_file:
+                confidences = _page_confidences(tsv_file.read(), len(texts))
+
+    return list(zip(texts, confidences))
+
+
+# Process pool shared by every OCREngine in this process. Creating worker
+# processes is expensive, so the pool is created lazily and reused across
+# requests until it breaks. It keeps the size it was created with: replacing
+# it for a caller that asks for another size would shut it down under other
+# requests still submitting to it.
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_size = 0
+_ocr_pool_lock = threading.Lock()
+
+# Pool for the text extractor's parallel text-layer reads, kept apart from the
+# OCR pool because its size is configured separately (PDF_TEXT_WORKERS vs
+# OCR_MAX_WORKERS) and a document can need both
+_text_pool: Optional[ProcessPoolExecutor] = None
+_text_pool_size = 0
+_text_pool_lock = threading.Lock()
+
+
+def get_ocr_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared OCR process pool, creating it if needed
+    """
+    global _ocr_pool, _ocr_pool_size
+
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            logger.debug(f"Starting OCR process pool with {max_workers} workers")
+            _ocr_pool = ProcessPoolExecutor(max_workers=max_workers)
+            _ocr_pool_size = max_workers
+        elif _ocr_pool_size != max_workers:
+            logger.debug(
+                f"Sharing the {_ocr_pool_size}-worker OCR pool with a caller "
+                f"asking for {max_workers} workers"
+            )
+
+        return _ocr_pool
+
+
+def shutdown_ocr_pool(wait: bool = True):
+    """
+    Shut down the shared OCR process pool if it is running
+    """
+    global _ocr_pool, _ocr_pool_size
+
+    with _ocr_pool_lock:
+        if _ocr_pool is not None:
+            _ocr_pool.shutdown(wait=wait)
+            _ocr_pool = None
+            _ocr_pool_size = 0
+
+
+def get_text_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared text-layer process pool, creating it if needed
+    """
+    global _text_pool, _text_pool_size
+
+    with _text_pool_lock:
+        if _text_pool is None:
+            logger.debug(f"Starting text process pool with {max_workers} workers")
+            _text_pool = ProcessPoolExecutor(max_workers=max_workers)
+            _text_pool_size = max_workers
+        elif _text_pool_size != max_workers:
+            logger.debug(
+                f"Sharing the {_text_pool_size}-worker text pool with a caller "
+                f"asking for {max_workers} workers"
+            )
+
+        return _text_pool
+
+
+def shutdown_text_pool(wait: bool = True):
+    """
+    Shut down the shared text-layer process pool if it is running
+    """
+    global _text_pool, _text_pool_size
+
+    with _text_pool_lock:
+        if _text_pool is not None:
+            _text_pool.shutdown(wait=wait)
+            _text_pool = None
+            _text_pool_size = 0
+
+
+def _forget_pools():
+    """
+    Drop the inherited pool references in a forked child
+
+    The pools' worker processes and management threads belong to the parent,
+    so the child must start its own pools if it needs them.
+    """
+    global _ocr_pool, _ocr_pool_size, _ocr_pool_lock
+    global _text_pool, _text_pool_size, _text_pool_lock
+
+    _ocr_pool = None
+    _ocr_pool_size = 0
+    _ocr_pool_lock = threading.Lock()
+    _text_pool = None
+    _text_pool_size = 0
+    _text_pool_lock = threading.Lock()
+
+
+atexit.register(shutdown_ocr_pool, wait=False)
+atexit.register(shutdown_text_pool, wait=False)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pools)
+
+
+class OCREngine:
+    """
+    Handles OCR of image-based PDF pages
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        dpi_levels: Optional[Sequence[int]] = None,
+        lang: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        preprocess: Optional[bool] = None,
+    ):
+        self.mode = mode or os.environ.get("OCR_MODE", OCR_MODE_SERIAL)
+        if self.mode not in OCR_MODES:
+            raise ValueError(
+                f"Unknown OCR mode '{self.mode}', expected one of {OCR_MODES}"
+            )
+
+        if max_workers is None:
+            max_workers = int(
+                os.environ.get("OCR_MAX_WORKERS", min(4, os.cpu_count() or 1))
+            )
+        self.max_workers = max(1, max_workers)
+
+        # e.g. OCR_DPI_LEVELS=200,300 OCRs at 200 DPI and re-renders only the
+        # low-confidence pages at 300 DPI
+        if dpi_levels is None:
+            dpi_levels = [
+                int(dpi)
+                for dpi in os.environ.get("OCR_DPI_LEVELS", str(DEFAULT_DPI)).split(",")
+            ]
+        self.dpi_levels = tuple(sorted(dpi_levels))
+
+        if min_confidence is None:
+            min_confidence = float(
+                os.environ.get("OCR_MIN_CONFIDENCE", DEFAULT_MIN_CONFIDENCE)
+            )
+        self.min_confidence = min_confidence
+
+        # A tesseract lang string such as "eng" or "hin+eng", or "auto"
+        self.lang = lang or os.environ.get("OCR_LANG", DEFAULT_LANG)
+        self._document_languages = MemoryCacheBackend(max_entries=256)
+
+        if preprocess is None:
+            preprocess = os.environ.get("OCR_PREPROCESS", "false").lower() == "true"
+        self.preprocess = preprocess
+
+    def get_page_count(self, pdf_path: str) -> int:
+        """
+        Return the number of pages in the PDF without rendering it
+        """
+        return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+    def ocr_pdf(
+        self, pdf_path: str, page_numbers: Optional[List[int]] = None
+    ) -> List[str]:
+        """
+        OCR the pages of a PDF
+
+        Pages are rendered one at a time (batch mode renders them to disk), so
+        memory use is bounded by a single page image per process regardless of
+        document length.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: 1-based pages to OCR (default: every page)
+
+        Returns:
+            Recognized text for each requested page, in the order requested
+        """
+        if page_numbers is None:
+            page_numbers = list(range(1, self.get_page_count(pdf_path) + 1))
+        if not page_numbers:
+            return []
+
+        lang = self.lang
+        if lang == LANG_AUTO:
+            lang = self.detect_languages(pdf_path, page_numbers[0])
+
+        if (
+            self.mode == OCR_MODE_PARALLEL
+            and self.max_workers > 1
+            and len(page_numbers) > 1
+        ):
+            return self._ocr_parallel(pdf_path, page_numbers, lang)
+
+        if self.mode == OCR_MODE_BATCH and len(page_numbers) > 1:
+            return self._ocr_batch(pdf_path, page_numbers, lang)
+
+        return self._ocr_serial(pdf_path, page_numbers, lang)
+
+    def ocr_images(self, images: Iterable) -> List[str]:
+        """
+        OCR images that already are pages (photos, screenshots, TIFF scans)
+
+        Nothing is rendered, so DPI escalation does not apply; preprocessing
+        and language selection do. Images are consumed one at a time.
+
+        Args:
+            images: PIL images, one per page
+
+        Returns:
+            Recognized text for each image, in order
+        """
+        lang = None if self.lang == LANG_AUTO else self.lang
+        page_texts = []
+        for image in images:
+            if lang is None:
+                # Same cost as detection on a PDF page rendered at low DPI
+                scale = SCRIPT_DETECTION_DPI / DEFAULT_DPI
+                sample = image.copy()
+                sample.thumbnail(
+                    (int(image.width * scale) + 1, int(image.height * scale) + 1)
+                )
+                lang = languages_for_script(detect_script(sample))
+                logger.debug(f"OCR languages for uploaded image: {lang}")
+
+            if self.preprocess:
+                image = preprocess_page(image)
+            page_texts.append(pytesseract.image_to_string(image, lang=lang))
+
+        return page_texts
+
+    def detect_languages(self, pdf_path: str, page_number: int) -> str:
+        """
+        Choose the language packs for a document from the script of one page
+
+        The page is rendered at SCRIPT_DETECTION_DPI for tesseract OSD, which
+        costs a fraction of a full OCR pass. The choice is cached by the
+        document's content hash, so every page and every later OCR call on
+        the same document reuse it.
+
+        Returns:
+            Tesseract lang string, e.g. "eng" or "hin+eng"
+        """
+        with open(pdf_path, "rb") as pdf_file:
+            digest = hashlib.file_digest(pdf_file, "sha256").hexdigest()
+        cached_lang = self._document_languages.get(digest)
+        if cached_lang is not None:
+            return cached_lang
+
+        script = None
+        image = render_pdf_page(pdf_path, page_number, SCRIPT_DETECTION_DPI)
+        if image is not None:
+            script = detect_script(image)
+        lang = languages_for_script(script)
+        logger.debug(f"Detected script {script or 'unknown'}, OCR languages {lang}")
+
+        self._document_languages.set(digest, lang)
+        return lang
+
+    def _ocr_serial(
+        self, pdf_path: str, page_numbers: List[int], lang: str
+    ) -> List[str]:
+        """
+        Render and recognize pages one after another in this process
+
+        Each page is rendered with a ``first_page``/``last_page`` window and
+        released before the next one is rendered.
+        """
+        logger.debug(f"Processing {len(page_numbers)} pages with OCR...")
+        page_texts = []
+        for page_number in page_numbers:
+            logger.debug(f"  Processing page {page_number}...")
+            page_texts.append(
+                ocr_pdf_page(
+                    pdf_path,
+                    page_number,
+                    dpi_levels=self.dpi_levels,
+                    lang=lang,
+                    min_confidence=self.min_confidence,
+                    preprocess=self.preprocess,
+                )
+            )
+
+        return page_texts
+
+    def _ocr_parallel(
+        self, pdf_path: str, page_numbers: List[int], lang: str
+    ) -> List[str]:
+        """
+        Render and recognize pages concurrently on the shared process pool
+
+        Each worker renders only its own page, so rendering and recognition
+        overlap across pages. ``Executor.map`` yields results in submission
+        order, which keeps the pages in document order.
+        """
+        logger.debug(
+            f"Processing {len(page_numbers)} pages with OCR on "
+            f"{self.max_workers} worker processes..."
+        )
+
+        try:
+            pool = get_ocr_pool(self.max_workers)
+            return list(
+                pool.map(
+                    ocr_pdf_page,
+                    repeat(pdf_path),
+                    page_numbers,
+                    repeat(self.dpi_levels),
+                    repeat(lang),
+                    repeat(self.min_confidence),
+                    repeat(self.preprocess),
+                )
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OOM killer); drop the pool so
+            # the next call starts a fresh one, and finish this document
+            # serially.
+            logger.warning("OCR process pool broke, falling back to serial OCR")
+            shutdown_ocr_pool(wait=False)
+            return self._ocr_serial(pdf_path, page_numbers, lang)
+
+    def _ocr_batch(
+        self, pdf_path: str, page_numbers: List[int], lang: str
+    ) -> List[str]:
+        """
+        Recognize all pages in one tesseract run at the lowest DPI level
+
+        With several DPI levels, pages whose mean confidence is below
+        ``min_confidence`` are re-OCRed one by one at the higher levels.
+        """
+        logger.debug(f"Processing {len(page_numbers)} pages with batched OCR...")
+        escalate = len(self.dpi_levels) > 1
+
+        try:
+            results = ocr_pdf_batch(
+                pdf_path,
+                page_numbers,
+                dpi=self.dpi_levels[0],
+                lang=lang,
+                with_confidence=escalate,
+                preprocess=self.preprocess,
+            )
+        except (RuntimeError, OSError) as e:
+            logger.warning(f"Batched OCR failed ({e}), falling back to serial OCR")
+            return self._ocr_serial(pdf_path, page_numbers, lang)
+
+        page_texts = []
+        for page_number, (text, confidence) in zip(page_numbers, results):
+            if escalate and confidence < self.min_confidence:
+                logger.debug(
+                    f"  Page {page_number} OCR confidence {confidence:.0f} at "
+                    f"{self.dpi_levels[0]} DPI, escalating..."
+                )
+                text = ocr_pdf_page(
+                    pdf_path,
+                    page_number,
+                    dpi_levels=self.dpi_levels[1:],
+                    lang=lang,
+                    min_confidence=self.min_confidence,
+                    preprocess=self.preprocess,
+                )
+            page_texts.append(text)
+
+        return page_texts
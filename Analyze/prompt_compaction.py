@@ -0,0 +1,335 @@
+"""
+Prompt Compaction Module
+
+Shrinks extracted resume text before it is sent to the LLM: collapses
+whitespace, normalizes bullet glyphs, drops page numbers, headers and footers
+repeated at the edges of most pages and other boilerplate, and, when the text
+is still over the token budget, trims its least useful sections first. Lines
+repeated within the body (a second job with the same title, a bullet shared
+by two jobs) are content and are kept.
+"""
+
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Longest line still treated as a section heading
+MAX_HEADING_WORDS = 5
+MAX_HEADING_CHARS = 40
+
+# Section headings by how much the extraction prompt needs them; sections
+# with the lowest value are trimmed first when the text is over budget
+SECTION_VALUES = {
+    "references": 0,
+    "declaration": 0,
+    "personal details": 1,
+    "personal information": 1,
+    "personal profile": 1,
+    "career objective": 1,
+    "objective": 1,
+    "summary": 1,
+    "professional summary": 1,
+    "profile": 1,
+    "about me": 1,
+    "hobbies": 2,
+    "interests": 2,
+    "hobbies and interests": 2,
+    "hobbies & interests": 2,
+    "extracurricular activities": 2,
+    "extra-curricular activities": 2,
+    "activities": 2,
+    "volunteering": 2,
+    "experience": 3,
+    "work experience": 3,
+    "professional experience": 3,
+    "employment history": 3,
+    "education": 3,
+    "skills": 3,
+    "technical skills": 3,
+    "projects": 3,
+    "certifications": 3,
+    "achievements": 3,
+    "awards": 3,
+    "languages": 3,
+}
+DEFAULT_SECTION_VALUE = 3
+
+# Non-blank lines at the top and bottom of a page searched for headers,
+# footers and page numbers
+PAGE_EDGE_LINES = 2
+
+# Bullet glyphs at the start of a line, including the private-use Symbol font
+# characters Word bullets often come out as
+BULLET_PATTERN = re.compile(
+    "^[\u2022\u25cf\u25aa\u25e6\u25a0\u25ba\u25b6\u2713\u2714\u27a2\u27a4"
+    "\u2756\u25cb\u00b7\u2013*\uf0a7\uf0b7\uf076\uf0d8\uf0fc]+\\s*"
+)
+
+# Lines that carry nothing the extraction needs, wherever they are
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"^page\s*\d+(\s*(of|/)\s*\d+)?$",
+        r"^(curriculum vitae|resume|résumé|cv)$",
+        r"^(references )?(are )?(available )?(up)?on request\.?$",
+        r"^i hereby declare\b.*",
+        r"^(place|date)\s*:.*$",
+        r"^\(?signature\)?$",
+    )
+]
+
+# A bare page number ("3", "- 3 -", "3/4", "3 of 4"); only dropped at a page's
+# edge and when it fits the page count, so phone numbers, years and grades
+# like "9/10" are kept
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^-?\s*(\d{1,3})\s*-?(?:\s*(?:of|/)\s*(\d{1,3}))?$", re.IGNORECASE
+)
+
+# Pieces the token estimator counts: numbers, words, single symbols, newlines
+TOKEN_PIECE_PATTERN = re.compile(r"\d+|[^\W\d_]+|\n|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text without a tokenizer
+
+    Common words are one token and longer ones one per six characters;
+    numbers are split into three-digit groups and symbols and line breaks
+    count one each, which tracks BPE vocabularies like Llama's to within a
+    few percent on resume text.
+    """
+    tokens = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        if piece.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif piece.isalpha():
+            tokens += math.ceil(len(piece) / 6)
+        else:
+            tokens += 1
+    return tokens
+
+
+def _clean_lines(text: str) -> List[str]:
+    """
+    Collapse whitespace, normalize bullets and rejoin hyphenated words
+    """
+    lines = []
+    for raw_line in text.splitlines():
+        line = " ".join(raw_line.split())
+        line = BULLET_PATTERN.sub("- ", line).rstrip()
+        if line == "-":
+            line = ""
+
+        # A word hyphenated across a line break: "develop-" + "ment ..."
+        if lines and re.search(r"[a-z]-$", lines[-1]) and re.match(r"[a-z]", line):
+            lines[-1] = lines[-1][:-1] + line
+            continue
+
+        lines.append(line)
+
+    return lines
+
+
+def _collapse_blank_lines(lines: List[str]) -> List[str]:
+    """
+    Keep single blank lines between blocks, none at the start or end
+    """
+    collapsed = []
+    for line in lines:
+        if line or (collapsed and collapsed[-1]):
+            collapsed.append(line)
+    while collapsed and not collapsed[-1]:
+        collapsed.pop()
+    return collapsed
+
+
+def _is_boilerplate(line: str) -> bool:
+    return any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)
+
+
+def _page_edges(page: List[str], page_count: int) -> Dict[int, Tuple[str, int]]:
+    """
+    Indexes of the first and last PAGE_EDGE_LINES non-blank lines of a page,
+    page numbers aside, -> their place: ("top", n) for the nth line from the
+    top, ("bottom", n) for the nth from the bottom
+    """
+    filled = [
+        index
+        for index, line in enumerate(page)
+        if line and not _is_page_number(line, page_count)
+    ]
+    edges = {
+        index: ("bottom", place)
+        for place, index in enumerate(reversed(filled[-PAGE_EDGE_LINES:]))
+    }
+    edges.update(
+        (index, ("top", place)) for place, index in enumerate(filled[:PAGE_EDGE_LINES])
+    )
+    return edges
+
+
+def _is_page_number(line: str, page_count: int) -> bool:
+    match = PAGE_NUMBER_PATTERN.match(line)
+    if not match:
+        return False
+    number, total = int(match.group(1)), match.group(2)
+    if total is not None:
+        return 1 <= number <= int(total) == page_count
+    return 1 <= number <= page_count
+
+
+def _at_page_edge(page: List[str], index: int) -> bool:
+    """
+    Whether a line is the first or last non-blank line of its page
+    """
+    return not any(page[:index]) or not any(page[index + 1 :])
+
+
+def _drop_page_furniture(pages: List[List[str]]) -> List[str]:
+    """
+    Drop boilerplate, page numbers, running headers and footers, and
+    section headings repeated at the top of a continued page; join the pages
+
+    A line is a header or footer when it is in the same place at the edge
+    of more than half of the pages (at least two); its first copy is kept,
+    since headers often carry the name, and its other copies there are
+    dropped.
+    """
+    page_count = len(pages)
+    edge_counts = {}
+    for page in pages:
+        for index, place in _page_edges(page, page_count).items():
+            key = (place, page[index].casefold())
+            edge_counts[key] = edge_counts.get(key, 0) + 1
+    running = {
+        key
+        for key, count in edge_counts.items()
+        if page_count >= 2 and count * 2 > page_count
+    }
+
+    lines = []
+    seen_running = set()
+    last_heading = None
+    for page in pages:
+        edges = _page_edges(page, page_count)
+        continued = True  # No content of this page kept yet
+        for index, line in enumerate(page):
+            key = line.casefold()
+            if line and _is_boilerplate(line):
+                continue
+            if _is_page_number(line, page_count) and _at_page_edge(page, index):
+                continue
+            if (edges.get(index), key) in running:
+                if (edges[index], key) in seen_running:
+                    continue
+                seen_running.add((edges[index], key))
+            if line and continued:
+                continued = False
+                if key == last_heading:
+                    continue  # "EXPERIENCE" again over the rest of the section
+            if _heading_value(line) is not None:
+                last_heading = key
+            lines.append(line)
+        lines.append("")
+    return lines
+
+
+def _heading_value(line: str) -> Optional[int]:
+    """
+    Value of the section a heading line opens, or None if it is no heading
+    """
+    if (
+        not line
+        or len(line) > MAX_HEADING_CHARS
+        or len(line.split()) > MAX_HEADING_WORDS
+    ):
+        return None
+
+    name = line.rstrip(":").strip().casefold()
+    if name in SECTION_VALUES:
+        return SECTION_VALUES[name]
+    if line.isupper() and any(character.isalpha() for character in line):
+        return DEFAULT_SECTION_VALUE
+    return None
+
+
+def _split_sections(lines: List[str]) -> List[Tuple[int, List[str]]]:
+    """
+    Split lines into (value, lines) sections at heading lines
+
+    The lines before the first known heading (name and contact details) are
+    never trimmed and get a value above every heading: an all-caps name
+    line, or an all-caps line in the contact block, opens no section.
+    """
+    sections = [(DEFAULT_SECTION_VALUE + 1, [])]
+    known_heading_seen = False
+    for line in lines:
+        value = _heading_value(line) if sections[0][1] else None
+        if value is not None and not known_heading_seen:
+            known_heading_seen = line.rstrip(":").strip().casefold() in SECTION_VALUES
+            if not known_heading_seen:
+                value = None
+        if value is not None:
+            sections.append((value, [line]))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def _trim_to_budget(lines: List[str], token_budget: int) -> Tuple[List[str], List[str]]:
+    """
+    Drop the lowest-value sections, last line first, until the text fits
+
+    Returns:
+        Remaining lines and the headings of the sections that were cut
+    """
+    sections = _split_sections(lines)
+    tokens = [estimate_tokens("\n".join(section)) + 1 for _, section in sections]
+    total = sum(tokens)
+    trimmed = []
+
+    # Least valuable first; among equals, the later section goes first
+    order = sorted(range(len(sections)), key=lambda index: (sections[index][0], -index))
+    for index in order:
+        if total <= token_budget:
+            break
+        _, section = sections[index]
+        if section and _heading_value(section[0]) is not None:
+            trimmed.append(section[0].rstrip(":"))
+        while section and total > token_budget:
+            total -= estimate_tokens(section.pop()) + 1
+
+    return [line for _, section in sections for line in section], trimmed
+
+
+def compact_resume_text(text: str, token_budget: Optional[int] = None) -> Dict:
+    """
+    Compact resume text for the extraction prompt
+
+    Args:
+        text: Text extracted from the resume
+        token_budget: Estimated tokens the result may use, or None/0 for no
+            limit
+
+    Returns:
+        Dictionary with the compacted "text", "original_tokens", "tokens",
+        "tokens_saved" and the headings of "trimmed_sections"
+    """
+    original_tokens = estimate_tokens(text)
+
+    pages = [_clean_lines(page) for page in text.split("\f")]
+    lines = _collapse_blank_lines(_drop_page_furniture(pages))
+
+    trimmed_sections = []
+    if token_budget and estimate_tokens("\n".join(lines)) > token_budget:
+        lines, trimmed_sections = _trim_to_budget(lines, token_budget)
+
+    compacted = "\n".join(lines).strip()
+    tokens = estimate_tokens(compacted)
+    return {
+        "text": compacted,
+        "original_tokens": original_tokens,
+        "tokens": tokens,
+        "tokens_saved": original_tokens - tokens,
+        "trimmed_sections": trimmed_sections,
+    }
@@ -0,0 +1,159 @@
+"""
+Rate Limiter Module
+
+Token buckets that pace Groq API calls to the account's requests-per-minute
+and tokens-per-minute limits, and hold every caller back after a 429 for as
+long as the API's retry-after header asks.
+"""
+
+import asyncio
+import email.utils
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Groq's free tier limits for the default model
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_TOKENS_PER_MINUTE = 30000
+
+# Wait used when a 429 carries no usable retry-after header
+DEFAULT_RETRY_AFTER = 5.0
+
+
+def retry_after_seconds(
+    error: Exception, default: float = DEFAULT_RETRY_AFTER
+) -> float:
+    """
+    Read how long to back off from the headers of an API error response
+
+    Understands retry-after-ms, retry-after in seconds and retry-after as an
+    HTTP date, in that order of preference.
+
+    Args:
+        error: Exception raised by the Groq client (e.g. groq.RateLimitError)
+        default: Seconds to wait when the response has no usable header
+
+    Returns:
+        Seconds to wait before the next request
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+
+    try:
+        return max(0.0, float(headers["retry-after-ms"]) / 1000)
+    except (KeyError, TypeError, ValueError):
+        pass
+
+    retry_after = headers.get("retry-after")
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+
+    if retry_after:
+        retry_date = email.utils.parsedate_tz(retry_after)
+        if retry_date is not None:
+            return max(0.0, email.utils.mktime_tz(retry_date) - time.time())
+
+    return default
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``per_minute`` tokens per minute
+
+    Callers reserve tokens up front and sleep off any deficit, so the bucket
+    can run negative while reservations are outstanding. The arithmetic is
+    guarded by a thread lock rather than an asyncio one, which keeps a bucket
+    usable from any event loop and shareable across batches.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount tokens from the bucket
+
+        Returns:
+            Seconds the caller has to wait before the tokens are really there
+        """
+        # A request larger than the bucket could otherwise never be served
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.available = min(
+                self.capacity, self.available + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.available -= amount
+            return -self.available / self.rate if self.available < 0 else 0.0
+
+    def refund(self, amount: float):
+        """
+        Return tokens that were reserved but not used
+        """
+        with self._lock:
+            self.available = min(self.capacity, self.available + amount)
+
+
+class RateLimiter:
+    """
+    Paces API calls through a requests bucket and a tokens bucket
+
+    ``pause`` blocks every caller until a point in time, for 429 responses.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until a request of the given size may be sent
+
+        Args:
+            tokens: Tokens the request is expected to use
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = await self._wait_out_pause()
+
+        delay = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if delay > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+
+        # A 429 may have come in while this call was waiting for its turn
+        return waited + await self._wait_out_pause()
+
+    async def _wait_out_pause(self) -> float:
+        waited = 0.0
+        while (pause := self.paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(pause)
+            waited += pause
+        return waited
+
+    def pause(self, seconds: float):
+        """
+        Hold back all requests for the next ``seconds`` seconds
+        """
+        paused_until = time.monotonic() + seconds
+        if paused_until > self.paused_until:
+            logger.warning(
+                f"Rate limited by the API, pausing requests for {seconds:g}s"
+            )
+            self.paused_until = paused_until
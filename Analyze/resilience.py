@@ -0,0 +1,362 @@
+"""
+Resilience Module
+
+Retries with jittered exponential backoff for transient Groq API errors, and
+per-process circuit breakers that stop calling the API for a while once it
+keeps failing, so workers fail fast instead of each waiting out its timeout.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import groq
+
+from .rate_limiter import retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BASE_DELAY = 0.5  # Seconds before the first retry, at most
+DEFAULT_RETRY_MAX_DELAY = 8.0
+
+DEFAULT_FAILURE_THRESHOLD = 5  # Consecutive failed calls that open the circuit
+DEFAULT_RECOVERY_TIMEOUT = 30.0  # Seconds open before a trial call is let through
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Statuses that say the request may succeed if sent again
+TRANSIENT_STATUS_CODES = {408, 409, 429}
+
+
+def is_outage_error(error: Exception) -> bool:
+    """
+    Whether an error suggests the service is down, as opposed to busy
+    (rate limited) or rejecting the request
+    """
+    if getattr(error, "status_code", None) == 429:
+        return False
+    return is_transient_error(error)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Whether an API error is worth retrying: connection problems, timeouts,
+    rate limits and server errors, but not bad requests or bad credentials
+    """
+    if isinstance(error, groq.APIConnectionError):  # Includes timeouts
+        return True
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code in TRANSIENT_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+class RetryPolicy:
+    """
+    Retries transient errors with "full jitter" exponential backoff
+
+    The n-th retry waits a random time between 0 and
+    min(max_delay, base_delay * 2**n), which spreads out the retries of many
+    workers hitting the same outage. A retry-after header from the API takes
+    precedence; one asking for more than max_delay gives up instead, so a
+    worker is not held for minutes.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_environment(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(os.environ.get("GROQ_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+            base_delay=float(
+                os.environ.get("GROQ_RETRY_BASE_DELAY", DEFAULT_RETRY_BASE_DELAY)
+            ),
+            max_delay=float(
+                os.environ.get("GROQ_RETRY_MAX_DELAY", DEFAULT_RETRY_MAX_DELAY)
+            ),
+        )
+
+    def delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Seconds to wait before retry number ``attempt`` (0-based), or None when
+        the API's retry-after is longer than max_delay
+        """
+        retry_after = retry_after_seconds(error, default=0.0)
+        if retry_after > self.max_delay:
+            return None
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        return max(backoff, retry_after)
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """
+        Delay before the next retry, raising the error when it is too long
+        """
+        delay = self.delay(attempt, error)
+        if delay is None:
+            logger.warning(
+                f"Groq call failed ({error}) and asks to retry in "
+                f"{retry_after_seconds(error):g}s, over the {self.max_delay:g}s "
+                "limit; giving up"
+            )
+            raise error
+        logger.warning(f"Groq call failed ({error}), retrying in {delay:.2f}s")
+        return delay
+
+    def call(
+        self,
+        function: Callable,
+        *args,
+        retry_on: Callable[[Exception], bool] = is_transient_error,
+        **kwargs,
+    ) -> Any:
+        """
+        Call function, retrying the errors retry_on accepts (by default
+        transient ones)
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not retry_on(e):
+                    raise
+                time.sleep(self._retry_delay(attempt, e))
+
+    async def call_async(
+        self,
+        function: Callable,
+        *args,
+        retry_on: Callable[[Exception], bool] = is_transient_error,
+        **kwargs,
+    ) -> Any:
+        """
+        Await function, retrying the errors retry_on accepts
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await function(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not retry_on(e):
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, e))
+
+
+class CircuitOpenError(Exception):
+    """
+    The circuit breaker is open, the call was not attempted
+    """
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around calls to one external service
+
+    Closed: calls go through; ``failure_threshold`` consecutive failures open
+    the circuit. Open: calls fail fast with CircuitOpenError for
+    ``recovery_timeout`` seconds. Half open: a single trial call is let
+    through; its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        # Counters for metrics
+        self.successes = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == STATE_OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = STATE_HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Whether a call may be made now; when False it was counted as
+        short-circuited
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == STATE_CLOSED:
+                return True
+            if state == STATE_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            if self._state != STATE_CLOSED:
+                logger.info(f"Circuit '{self.name}' closed, the service recovered")
+                self._state = STATE_CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            trial_failed = self._trial_in_flight
+            self._trial_in_flight = False
+            if trial_failed or (
+                self._state == STATE_CLOSED
+                and self._consecutive_failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    f"Circuit '{self.name}' opened after "
+                    f"{self._consecutive_failures} consecutive failures; failing "
+                    f"fast for {self.recovery_timeout:g}s"
+                )
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+
+    def call(self, function: Callable, *args, **kwargs) -> Any:
+        """
+        Call function through the breaker
+
+        Only outage errors (see is_outage_error) count as failures; an API
+        that rate limits or rejects a request is still up.
+
+        Raises:
+            CircuitOpenError: The circuit is open
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            self._record_error(e)
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(self, function: Callable, *args, **kwargs) -> Any:
+        """
+        Await function through the breaker, see call
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        try:
+            result = await function(*args, **kwargs)
+        except BaseException as e:
+            self._record_error(e)
+            raise
+        self.record_success()
+        return result
+
+    def _record_error(self, error: BaseException):
+        if not isinstance(error, Exception):
+            # Cancelled or interrupted: no verdict, but free the trial slot
+            with self._lock:
+                self._trial_in_flight = False
+        elif is_outage_error(error):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def snapshot(self) -> Dict:
+        """
+        State and counters, for metrics and health checks
+        """
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == STATE_OPEN:
+                retry_in = max(
+                    0.0, self._opened_at + self.recovery_timeout - time.monotonic()
+                )
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in": retry_in,
+                "successes": self.successes,
+                "failures": self.failures,
+                "short_circuited": self.short_circuited,
+                "times_opened": self.times_opened,
+            }
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Return the process-wide circuit breaker of a service, creating it with
+    the settings from the environment on first use
+    """
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(name)
+        if breaker is None:
+            breaker = _circuit_breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=int(
+                    os.environ.get(
+                        "CIRCUIT_BREAKER_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD
+                    )
+                ),
+                recovery_timeout=float(
+                    os.environ.get(
+                        "CIRCUIT_BREAKER_RECOVERY_TIMEOUT", DEFAULT_RECOVERY_TIMEOUT
+                    )
+                ),
+            )
+        return breaker
+
+
+def circuit_breaker_states() -> Dict[str, Dict]:
+    """
+    Snapshots of all circuit breakers of this process, by name
+    """
+    with _circuit_breakers_lock:
+        breakers = list(_circuit_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def _forget_circuit_breakers():
+    """
+    Start forked children with fresh breakers and unheld locks
+    """
+    global _circuit_breakers_lock
+    _circuit_breakers.clear()
+    _circuit_breakers_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_circuit_breakers)
@@ -0,0 +1,243 @@
+"""
+Sample Document Builders
+
+Generates synthetic resume documents for benchmarks and tests so that they
+do not depend on real user uploads.
+"""
+
+import io
+import zipfile
+import zlib
+from typing import List, Union
+from xml.sax.saxutils import escape
+
+from PIL import Image, ImageDraw, ImageFont
+
+SAMPLE_RESUME_LINES = [
+    "Jane Candidate",
+    "jane.candidate@example.com | +1 555 010 2030",
+    "",
+    "EXPERIENCE",
+    "Senior Software Engineer at Example Corp (2019 - Present)",
+    "- Led migration of billing services to Python and Django",
+    "- Reduced report generation time by 40 percent",
+    "Software Engineer at Sample Labs (2016 - 2019)",
+    "- Built data pipelines with PostgreSQL and Celery",
+    "",
+    "EDUCATION",
+    "B.Tech in Computer Science at State University (2016)",
+    "",
+    "SKILLS",
+    "Python, Django, PostgreSQL, Docker, AWS, React",
+    "",
+    "CERTIFICATIONS",
+    "AWS Certified Developer - Associate",
+]
+
+# US Letter in inches
+PAGE_WIDTH_IN = 8.5
+PAGE_HEIGHT_IN = 11
+POINTS_PER_INCH = 72
+
+
+def render_page_image(lines: List[str], dpi: int = 150) -> Image.Image:
+    """
+    Render lines of text onto a white US Letter page image
+    """
+    width = int(PAGE_WIDTH_IN * dpi)
+    height = int(PAGE_HEIGHT_IN * dpi)
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=max(10, dpi // 7))
+
+    margin = dpi  # One inch margins
+    line_height = int(dpi / 4)
+    y = margin
+    for line in lines:
+        draw.text((margin, y), line, fill="black", font=font)
+        y += line_height
+
+    return image
+
+
+def build_scanned_pdf(page_count: int, dpi: int = 150, skew: float = 0.0) -> bytes:
+    """
+    Build an image-only PDF (no text layer) that mimics a scanned resume
+
+    Args:
+        page_count: Number of pages to generate
+        dpi: Resolution the page images are drawn at
+        skew: Clockwise rotation of the pages in degrees, like a crooked scan
+
+    Returns:
+        PDF file content
+    """
+    pages = [
+        render_page_image([f"Page {number}"] + SAMPLE_RESUME_LINES, dpi=dpi)
+        for number in range(1, page_count + 1)
+    ]
+    if skew:
+        pages = [page.rotate(-skew, fillcolor="white") for page in pages]
+
+    buffer = io.BytesIO()
+    pages[0].save(
+        buffer,
+        format="PDF",
+        save_all=True,
+        append_images=pages[1:],
+        resolution=dpi,
+    )
+    return buffer.getvalue()
+
+
+def _escape_pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text_page_content(lines: List[str]) -> bytes:
+    operations = ["BT", "/F1 11 Tf", "14 TL", "72 720 Td"]
+    for line in lines:
+        operations.append(f"({_escape_pdf_string(line)}) Tj T*")
+    operations.append("ET")
+    return "\n".join(operations).encode("latin-1", "replace")
+
+
+def build_pdf(pages: List[Union[List[str], Image.Image]]) -> bytes:
+    """
+    Build a PDF where each page is either a text layer or a full-page image
+
+    Args:
+        pages: For each page, a list of text lines (real text layer) or a PIL
+            image (scanned page without a text layer)
+
+    Returns:
+        PDF file content
+    """
+    width = int(PAGE_WIDTH_IN * POINTS_PER_INCH)
+    height = int(PAGE_HEIGHT_IN * POINTS_PER_INCH)
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then per-page objects
+    objects = {3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    page_refs = []
+    next_number = 4
+
+    for page in pages:
+        page_number, content_number = next_number, next_number + 1
+        next_number += 2
+        resources = "/Font << /F1 3 0 R >>"
+
+        if isinstance(page, Image.Image):
+            image_number = next_number
+            next_number += 1
+            gray = page.convert("L")
+            data = zlib.compress(gray.tobytes())
+            header = (
+                f"<< /Type /XObject /Subtype /Image /Width {gray.width} "
+                f"/Height {gray.height} /ColorSpace /DeviceGray /BitsPerComponent 8 "
+                f"/Filter /FlateDecode /Length {len(data)} >>\nstream\n"
+            )
+            objects[image_number] = header.encode() + data + b"\nendstream"
+            resources += f" /XObject << /Im1 {image_number} 0 R >>"
+            content = f"q {width} 0 0 {height} 0 0 cm /Im1 Do Q".encode()
+        else:
+            content = _text_page_content(page)
+
+        objects[content_number] = (
+            f"<< /Length {len(content)} >>\nstream\n".encode()
+            + content
+            + b"\nendstream"
+        )
+        objects[page_number] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+            f"/Resources << {resources} >> /Contents {content_number} 0 R >>"
+        ).encode()
+        page_refs.append(f"{page_number} 0 R")
+
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[2] = (
+        f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(pages)} >>"
+    ).encode()
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = output.tell()
+        output.write(f"{number} 0 obj\n".encode() + objects[number] + b"\nendobj\n")
+
+    xref_offset = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for number in sorted(objects):
+        output.write(f"{offsets[number]:010d} 00000 n \n".encode())
+    output.write(
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n".encode()
+    )
+    return output.getvalue()
+
+
+def build_text_pdf(page_count: int) -> bytes:
+    """
+    Build a text-based PDF resume with a real text layer on every page
+    """
+    return build_pdf(
+        [
+            [f"Page {number}"] + SAMPLE_RESUME_LINES
+            for number in range(1, page_count + 1)
+        ]
+    )
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+
+DOCX_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats'
+    '.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+
+def build_docx(lines: List[str]) -> bytes:
+    """
+    Build a minimal DOCX file with one paragraph per line
+
+    Args:
+        lines: Paragraph texts
+
+    Returns:
+        DOCX file content
+    """
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for line in lines
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/'
+        f'2006/main"><w:body>{paragraphs}</w:body></w:document>'
+    )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_RELATIONSHIPS)
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def build_text_docx(section_count: int = 1) -> bytes:
+    """
+    Build a DOCX resume, repeating the sample sections to reach a given size
+    """
+    return build_docx(SAMPLE_RESUME_LINES * section_count)
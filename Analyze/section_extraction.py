@@ -0,0 +1,173 @@
+"""
+Section Extraction Module
+
+Splits a long resume into groups of sections that are extracted by separate,
+smaller prompts sent concurrently. A completion's latency grows with its
+output, and one prompt for a long CV can also run past the completion token
+limit and need a second, sequential request for what it lost; a few prompts
+asking for a few fields each finish in the time of the longest one. The
+sections are found by the heuristic extractor's headings.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .heuristic_extractor import section_heading
+
+logger = logging.getLogger(__name__)
+
+# Prompt groups -> the prompt keys each extracts, in the prompt's order. The
+# first group also gets the text before the first heading and sections of no
+# field (summary, contact details), and the keys of any group the resume
+# has no section for.
+SECTION_GROUPS = {
+    "profile": [
+        "Full Name",
+        "Email Address",
+        "Phone Number",
+        "Skills",
+        "Languages Spoken",
+        "Hobbies/Interests",
+    ],
+    "experience": ["Work Experience", "Achievements"],
+    "education": ["Education Details", "Certifications"],
+    "projects": ["Projects"],
+}
+
+# Heuristic extractor fields -> the group their sections go to
+FIELD_GROUPS = {
+    "skills": "profile",
+    "languages_spoken": "profile",
+    "hobbies_interests": "profile",
+    "work_experience": "experience",
+    "achievements": "experience",
+    "education_details": "education",
+    "certifications": "education",
+    "projects": "projects",
+}
+
+DEFAULT_GROUP = "profile"
+
+# Estimated tokens of (compacted) resume text from which a resume is split;
+# shorter ones fit one prompt's output comfortably
+DEFAULT_SECTION_MIN_TOKENS = 1500
+
+
+def segment_resume(resume_text: str) -> Dict[str, str]:
+    """
+    Split resume text into the text of each prompt group
+
+    Headings are kept with their sections so each prompt still sees what it
+    is reading. Lines after a one-line section ("Hobbies: Chess") belong to
+    no known section and go to the default group.
+
+    Returns:
+        Group name -> text, for the groups with any text, in SECTION_GROUPS'
+        order
+    """
+    lines = {group: [] for group in SECTION_GROUPS}
+    current = DEFAULT_GROUP
+    for line in resume_text.splitlines():
+        is_heading, field, rest = section_heading(" ".join(line.split()))
+        if is_heading:
+            group = FIELD_GROUPS.get(field, DEFAULT_GROUP)
+            lines[group].append(line)
+            current = DEFAULT_GROUP if rest else group
+        else:
+            lines[current].append(line)
+
+    return {
+        group: "\n".join(group_lines).strip()
+        for group, group_lines in lines.items()
+        if any(line.strip() for line in group_lines)
+    }
+
+
+def plan_section_prompts(resume_text: str) -> Optional[List[Tuple[List[str], str]]]:
+    """
+    The (prompt keys, text) of each prompt a resume is extracted with
+
+    Keys of groups the resume has no section for are asked of the default
+    group's prompt, so every key is asked exactly once.
+
+    Returns:
+        One entry per group with text, or None when fewer than two groups
+        have any, i.e. there is nothing to split
+    """
+    segments = segment_resume(resume_text)
+    if len(segments) < 2:
+        return None
+
+    keys = {group: list(SECTION_GROUPS[group]) for group in segments}
+    for group, group_keys in SECTION_GROUPS.items():
+        if group not in segments:
+            keys.setdefault(DEFAULT_GROUP, []).extend(group_keys)
+    if DEFAULT_GROUP not in segments:
+        # Only possible without any text outside the known sections
+        segments = {DEFAULT_GROUP: "", **segments}
+
+    return [(keys[group], segments[group]) for group in segments]
+
+
+_section_pool = None
+_section_pool_size = 0
+_section_pool_lock = threading.Lock()
+
+
+def get_section_pool(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Return the shared thread pool that sends section prompts for
+    synchronous extractions, creating it if needed
+
+    Its threads are long-lived, so with per-thread Groq clients (see
+    GroqTransport) they keep their connections between extractions.
+    """
+    global _section_pool, _section_pool_size
+
+    with _section_pool_lock:
+        if _section_pool is not None and _section_pool_size != max_workers:
+            _section_pool.shutdown(wait=False)
+            _section_pool = None
+
+        if _section_pool is None:
+            logger.debug(f"Starting section prompt pool with {max_workers} threads")
+            _section_pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="section-prompt"
+            )
+            _section_pool_size = max_workers
+
+        return _section_pool
+
+
+def shutdown_section_pool(wait: bool = True):
+    """
+    Shut down the shared section prompt pool if it is running
+    """
+    global _section_pool, _section_pool_size
+
+    with _section_pool_lock:
+        if _section_pool is not None:
+            _section_pool.shutdown(wait=wait)
+            _section_pool = None
+            _section_pool_size = 0
+
+
+def _forget_section_pool():
+    """
+    Drop the inherited pool reference in a forked child, whose copy has no
+    threads
+    """
+    global _section_pool, _section_pool_size, _section_pool_lock
+
+    _section_pool = None
+    _section_pool_size = 0
+    _section_pool_lock = threading.Lock()
+
+
+atexit.register(shutdown_section_pool, wait=False)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_section_pool)
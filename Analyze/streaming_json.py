@@ -0,0 +1,88 @@
+"""
+Streaming JSON Module
+
+Incremental parser for a JSON object that arrives in pieces, as in a
+streamed LLM completion. Each top-level field is returned as soon as the
+text of its value is complete, long before the closing brace arrives.
+"""
+
+import json
+import logging
+from typing import Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalJSONObjectParser:
+    """
+    Parses the top-level fields of a JSON object from text fed in chunks
+
+    Text before the opening brace (e.g. a markdown code fence) is skipped.
+    The scanner only tracks string and nesting state; each field's text is
+    handed to json.loads once the comma or brace that ends it is seen, so
+    every character is scanned once however the chunks are split.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0  # Next character to scan
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.field_start = None  # Start of the current top-level field
+        self.done = False  # The top-level object has been closed
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add text to the parser
+
+        Args:
+            chunk: Next piece of the JSON text
+
+        Returns:
+            (key, value) pairs of the top-level fields completed by this chunk
+        """
+        if self.done:
+            return []
+
+        self.buffer += chunk
+        fields = []
+        buffer = self.buffer
+        for position in range(self.position, len(buffer)):
+            character = buffer[position]
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif character == "\\":
+                    self.escaped = True
+                elif character == '"':
+                    self.in_string = False
+            elif character == '"':
+                if self.depth > 0:
+                    self.in_string = True
+            elif character in "{[":
+                self.depth += 1
+                if self.depth == 1:
+                    self.field_start = position + 1
+            elif character in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self._complete_field(self.field_start, position, fields)
+                    self.done = True
+                    break
+            elif character == "," and self.depth == 1:
+                self._complete_field(self.field_start, position, fields)
+                self.field_start = position + 1
+
+        self.position = len(buffer)
+        return fields
+
+    def _complete_field(self, start: int, end: int, fields: List):
+        text = self.buffer[start:end]
+        if not text.strip():
+            return  # Empty object or trailing comma
+        try:
+            fields.extend(json.loads("{" + text + "}").items())
+        except json.JSONDecodeError as e:
+            logger.debug(f"Skipping unparsable streamed field {text[:50]!r}: {e}")
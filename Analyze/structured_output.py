@@ -0,0 +1,239 @@
+"""
+Structured Output Module
+
+Validation and repair of the model's resume JSON. The pydantic schema checks
+and coerces a whole response in one pass; the repair parser recovers the
+complete fields of output that was wrapped in prose or cut off at the token
+limit, so only the fields that are missing have to be asked for again.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+logger = logging.getLogger(__name__)
+
+# How far back from the end the repair parser looks for a place to cut
+MAX_REPAIR_ATTEMPTS = 64
+
+CLOSERS = {"{": "}", "[": "]"}
+
+# Error code of a JSON mode completion that did not validate as JSON
+JSON_VALIDATE_FAILED = "json_validate_failed"
+
+
+class ResumeExtraction(BaseModel):
+    """
+    The JSON object the extraction prompt asks for, by the prompt's keys
+    """
+
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
+    full_name: str = Field("", alias="Full Name")
+    email_address: str = Field("", alias="Email Address")
+    phone_number: str = Field("", alias="Phone Number")
+    education_details: List[Union[str, Dict[str, Any]]] = Field(
+        default_factory=list, alias="Education Details"
+    )
+    work_experience: List[Union[str, Dict[str, Any]]] = Field(
+        default_factory=list, alias="Work Experience"
+    )
+    skills: List[Union[str, Dict[str, Any]]] = Field(
+        default_factory=list, alias="Skills"
+    )
+    certifications: List[Union[str, Dict[str, Any]]] = Field(
+        default_factory=list, alias="Certifications"
+    )
+    projects: List[Union[str, Dict[str, Any]]] = Field(
+        default_factory=list, alias="Projects"
+    )
+    languages_spoken: List[Union[str, Dict[str, Any]]] = Field(
+        default_factory=list, alias="Languages Spoken"
+    )
+    hobbies_interests: List[Union[str, Dict[str, Any]]] = Field(
+        default_factory=list, alias="Hobbies/Interests"
+    )
+    achievements: List[Union[str, Dict[str, Any]]] = Field(
+        default_factory=list, alias="Achievements"
+    )
+
+    @field_validator("full_name", "email_address", "phone_number", mode="before")
+    @classmethod
+    def _to_string(cls, value):
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return ", ".join(str(item) for item in value if item is not None)
+        return str(value)
+
+    @field_validator(
+        "education_details",
+        "work_experience",
+        "skills",
+        "certifications",
+        "projects",
+        "languages_spoken",
+        "hobbies_interests",
+        "achievements",
+        mode="before",
+    )
+    @classmethod
+    def _to_list(cls, value):
+        if value is None or value == "":
+            return []
+        if not isinstance(value, list):
+            value = [value]
+        return [
+            item if isinstance(item, (str, dict)) else str(item)
+            for item in value
+            if item is not None
+        ]
+
+
+# Prompt keys of the schema, in the prompt's order
+EXTRACTION_KEYS = [field.alias for field in ResumeExtraction.model_fields.values()]
+
+
+def _scan(text: str) -> List:
+    """
+    Cut points of a truncated JSON text: (position, brackets open there) for
+    every comma outside a string, plus the end of the text if it is not
+    inside a string
+    """
+    cuts = []
+    stack = []
+    in_string = escaped = False
+    for position, character in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif character == "\\":
+                escaped = True
+            elif character == '"':
+                in_string = False
+        elif character == '"':
+            in_string = True
+        elif character in CLOSERS:
+            stack.append(character)
+        elif character in "}]":
+            if stack:
+                stack.pop()
+        elif character == ",":
+            cuts.append((position, list(stack)))
+    if not in_string:
+        cuts.append((len(text), list(stack)))
+    return cuts
+
+
+def repair_json(text: str) -> Tuple[Optional[Dict], bool, bool]:
+    """
+    Parse the first JSON object in a model's output, repairing truncation
+
+    Prose or markdown around the object is ignored. Output cut off mid-way
+    is cut back to the last complete value and its open brackets are
+    closed, so every field written out in full is kept and only the one
+    being written (and those after it) are lost.
+
+    Returns:
+        The parsed object (None if none could be recovered), whether it was
+        truncated, and whether its last field is complete; it is not when
+        the cut fell inside that field's value, e.g. part way through a list
+    """
+    start = text.find("{")
+    if start < 0:
+        return None, False, False
+    text = text[start:]
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+        if isinstance(value, dict):
+            return value, False, True
+    except json.JSONDecodeError:
+        pass
+
+    for position, stack in reversed(_scan(text)[-MAX_REPAIR_ATTEMPTS:]):
+        if not stack:
+            continue
+        candidate = text[:position].rstrip()
+        if candidate.endswith(":"):
+            continue  # A key without its value
+        closing = "".join(CLOSERS[bracket] for bracket in reversed(stack))
+        try:
+            value = json.loads(candidate + closing)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value, True, len(stack) == 1
+    return None, True, False
+
+
+def parse_extraction(text: str) -> Dict:
+    """
+    Parse, repair and validate the model's extraction output
+
+    Args:
+        text: Content of the completion
+
+    Returns:
+        Dictionary with "fields" (validated values of the fields found, by
+        prompt key), "missing" (prompt keys lost to truncation or failed
+        validation, which are worth requesting again; keys a complete object
+        merely leaves out are not) and "repaired" (whether the output was
+        not a clean JSON object)
+    """
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        stripped = stripped.strip("`").removeprefix("json").strip()
+    try:
+        raw_data = json.loads(stripped)
+        repaired, truncated, last_complete = False, False, True
+    except json.JSONDecodeError:
+        raw_data, truncated, last_complete = repair_json(stripped)
+        repaired = True
+    if not isinstance(raw_data, dict):
+        return {"fields": {}, "missing": list(EXTRACTION_KEYS), "repaired": repaired}
+
+    present = [key for key in EXTRACTION_KEYS if key in raw_data]
+    if not last_complete and raw_data:
+        # The field the output was cut off in holds only part of its value
+        partial = list(raw_data)[-1]
+        present = [key for key in present if key != partial]
+    invalid = set()
+
+    candidate = {key: raw_data[key] for key in present}
+    try:
+        extraction = ResumeExtraction.model_validate(candidate)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors()}
+        logger.warning(f"Dropping invalid extraction fields: {sorted(invalid)}")
+        present = [key for key in present if key not in invalid]
+        extraction = ResumeExtraction.model_validate(
+            {key: raw_data[key] for key in present}
+        )
+
+    values = extraction.model_dump(by_alias=True)
+    return {
+        "fields": {key: values[key] for key in present},
+        "missing": [
+            key
+            for key in EXTRACTION_KEYS
+            if key not in present and (truncated or key in invalid)
+        ],
+        "repaired": repaired,
+    }
+
+
+def failed_generation(error: Exception) -> Optional[str]:
+    """
+    The output Groq rejected in JSON mode, which is often only truncated
+    and can still be repaired; None for any other error
+    """
+    body = getattr(error, "body", None)
+    if not isinstance(body, dict):
+        return None
+    details = body.get("error", body)
+    if not isinstance(details, dict) or details.get("code") != JSON_VALIDATE_FAILED:
+        return None
+    return details.get("failed_generation")
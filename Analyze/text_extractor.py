@@ -1,105 +1,1068 @@
 """
 Resume Text Extraction Module
 
-Handles extraction of text from PDF files including both text-based and image-based PDFs.
+Handles extraction of text from PDF files, both text-based and image-based,
+from Word (DOCX) documents, and from photographed or scanned resume images.
+Files can be given as a path, raw bytes or a binary file-like object; the
+format is detected from the file's magic bytes.
 """
 
+import hashlib
+import io
+import json
 import logging
 import os
-from pathlib import Path
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from xml.etree import ElementTree
 
 import pdfplumber
+import pypdfium2
+import pypdfium2.raw as pdfium_c
+from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+from pdfminer.layout import LAParams, LTFigure, LTImage, LTTextContainer
+from PIL import Image, ImageSequence
+
+from .cache_backends import (
+    CacheBackend,
+    DiskCacheBackend,
+    DjangoCacheBackend,
+    MemoryCacheBackend,
+)
+from .extraction_sandbox import (
+    DEFAULT_MAX_MEMORY_MB,
+    DEFAULT_PAGE_LIMIT,
+    DEFAULT_TIMEOUT,
+    SANDBOX_AVAILABLE,
+    ExtractionError,
+    PageLimitExceeded,
+    run_sandboxed,
+)
+from .image_preprocessing import draft_for_ocr, fit_for_ocr
+from .ocr_engine import (
+    OCR_AVAILABLE,
+    PAGE_SEPARATOR,
+    OCREngine,
+    get_text_pool,
+    shutdown_text_pool,
+)
 
 logger = logging.getLogger(__name__)
 
-try:
-    import pytesseract
-    from pdf2image import convert_from_path
-    from PIL import Image
+# Minimum characters for a document to count as successfully extracted
+MIN_TEXT_LENGTH = 50  # Arbitrary threshold
+
+# Pages with less text than this and enough image coverage are sent to OCR
+MIN_PAGE_TEXT_LENGTH = 20
+IMAGE_COVERAGE_THRESHOLD = 0.3
+
+# Per-page extraction methods reported in the stats
+METHOD_TEXT = "text"
+METHOD_OCR = "ocr"
+METHOD_EMPTY = "empty"
+
+# Document formats recognized from magic bytes
+FORMAT_PDF = "pdf"
+FORMAT_DOCX = "docx"
+FORMAT_DOC = "doc"
+FORMAT_IMAGE = "image"
+FORMAT_UNKNOWN = "unknown"
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # Legacy Word 97-2003 .doc
+IMAGE_MAGICS = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"II*\x00",  # TIFF, little-endian
+    b"MM\x00*",  # TIFF, big-endian
+)
+
+# The PDF header may be preceded by junk within the first kilobyte
+MAGIC_HEAD_SIZE = 1024
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCX_BODY_PART = "word/document.xml"
+
+# Bump whenever extraction output changes so stale cache entries are ignored
+EXTRACTOR_VERSION = "3"
+
+# Text layer backends tried in order until one returns enough text
+DEFAULT_PDF_TEXT_BACKEND = "pdfplumber"
+DEFAULT_PDF_TEXT_FALLBACKS = "pypdfium2"
+
+# PDFs shorter than this are read in-process even when text workers are set;
+# below it, process start-up and re-parsing the document cost more than they
+# save
+PARALLEL_TEXT_MIN_PAGES = 8
+
+# Anything ResumeTextExtractor can read a document from
+ResumeSource = Union[str, os.PathLike, bytes, bytearray, BinaryIO]
+
+
+def _open_source(source: ResumeSource) -> Union[str, BinaryIO]:
+    """
+    Return the source in a form pdfplumber can open without copying it to disk
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # BytesIO shares the buffer of an immutable bytes object
+        return io.BytesIO(source)
+    if not source.seekable():
+        return io.BytesIO(source.read())
+    source.seek(0)
+    return source
 
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-    logger.warning(
-        "OCR libraries not available. Only text-based PDFs will be supported."
+
+@contextmanager
+def _source_path(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Yield a filesystem path for the source
+
+    Only tools that cannot read from memory (poppler via pdf2image) need this;
+    in-memory sources are spilled to a temporary file for the duration.
+    """
+    if isinstance(source, str):
+        yield source
+        return
+
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+        shutil.copyfileobj(source, temp_file)
+    try:
+        yield temp_file.name
+    finally:
+        try:
+            os.unlink(temp_file.name)
+        except OSError:
+            pass  # File might already be deleted
+
+
+def _describe_source(source: Union[str, BinaryIO]) -> str:
+    if isinstance(source, str):
+        return source
+    return f"<in-memory {type(source).__name__}>"
+
+
+def detect_format(source: ResumeSource) -> str:
+    """
+    Detect the document format from its magic bytes
+
+    Args:
+        source: Path to the file, its bytes, or a binary file object
+
+    Returns:
+        One of FORMAT_PDF, FORMAT_DOCX, FORMAT_DOC, FORMAT_IMAGE or
+        FORMAT_UNKNOWN
+    """
+    source = _open_source(source)
+    if isinstance(source, str):
+        with open(source, "rb") as document:
+            head = document.read(MAGIC_HEAD_SIZE)
+    else:
+        head = source.read(MAGIC_HEAD_SIZE)
+        source.seek(0)
+
+    if PDF_MAGIC in head:
+        return FORMAT_PDF
+    if head.startswith(OLE_MAGIC):
+        return FORMAT_DOC
+    if head.startswith(IMAGE_MAGICS):
+        return FORMAT_IMAGE
+    if head.startswith(ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(source) as archive:
+                if DOCX_BODY_PART in archive.namelist():
+                    return FORMAT_DOCX
+        except zipfile.BadZipFile:
+            pass
+        finally:
+            if not isinstance(source, str):
+                source.seek(0)
+
+    return FORMAT_UNKNOWN
+
+
+def _hash_source(source: Union[str, BinaryIO]) -> str:
+    """
+    SHA-256 of the document bytes, streamed so large files are not copied
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as document:
+            return hashlib.file_digest(document, "sha256").hexdigest()
+
+    source.seek(0)
+    digest = hashlib.file_digest(source, "sha256").hexdigest()
+    source.seek(0)
+    return digest
+
+
+def _iter_docx_paragraphs(archive: zipfile.ZipFile, part_name: str) -> Iterator[str]:
+    """
+    Stream the paragraphs of a WordprocessingML part
+
+    The XML is parsed incrementally straight from the zip member, and every
+    paragraph is released once its text has been yielded, so memory stays
+    flat for large documents.
+    """
+    runs = []
+    with archive.open(part_name) as part:
+        for _, element in ElementTree.iterparse(part, events=("end",)):
+            tag = element.tag
+            if tag == WORD_NAMESPACE + "t":
+                runs.append(element.text or "")
+            elif tag == WORD_NAMESPACE + "tab":
+                runs.append("\t")
+            elif tag in (WORD_NAMESPACE + "br", WORD_NAMESPACE + "cr"):
+                runs.append("\n")
+            elif tag == WORD_NAMESPACE + "p":
+                yield "".join(runs)
+                runs = []
+                element.clear()
+
+
+def image_coverage(page_box: Sequence[float], image_boxes: List[Sequence[float]]):
+    """
+    Fraction of a page covered by images
+
+    Args:
+        page_box: Page (x0, y0, x1, y1)
+        image_boxes: Image (x0, y0, x1, y1) in the same coordinate system
+    """
+    x0, y0, x1, y1 = page_box
+    page_area = (x1 - x0) * (y1 - y0)
+    if page_area <= 0:
+        return 0.0
+
+    covered = 0.0
+    for image_x0, image_y0, image_x1, image_y1 in image_boxes:
+        width = min(image_x1, x1) - max(image_x0, x0)
+        height = min(image_y1, y1) - max(image_y0, y0)
+        if width > 0 and height > 0:
+            covered += width * height
+
+    return min(1.0, covered / page_area)
+
+
+class PDFTextBackend:
+    """
+    Reads the text layer of a PDF page by page
+    """
+
+    name = "base"
+
+    def iter_pages(
+        self,
+        pdf_source: Union[str, BinaryIO],
+        first_page: int = 1,
+        last_page: Optional[int] = None,
+    ) -> Iterator[Tuple[str, float]]:
+        """
+        Yields:
+            (text, image coverage) for each page from first_page to last_page
+            (1-based, inclusive; default: the last page), in page order
+        """
+        raise NotImplementedError
+
+    def extract_pages(
+        self,
+        pdf_source: Union[str, BinaryIO],
+        first_page: int = 1,
+        last_page: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Read a range of pages, stopping early once max_chars have been read
+
+        Returns:
+            (text, image coverage) for every page read, in page order
+        """
+        pages = []
+        char_count = 0
+        page_iterator = self.iter_pages(pdf_source, first_page, last_page)
+        try:
+            for page in page_iterator:
+                pages.append(page)
+                char_count += len(page[0])
+                if max_chars and char_count >= max_chars:
+                    break
+        finally:
+            page_iterator.close()  # Closes the document when stopping early
+        return pages
+
+
+class PdfplumberTextBackend(PDFTextBackend):
+    """
+    pdfplumber with full layout analysis; slowest but the reference output
+    """
+
+    name = "pdfplumber"
+
+    def iter_pages(self, pdf_source, first_page=1, last_page=None):
+        with pdfplumber.open(pdf_source) as pdf:
+            for page in pdf.pages[first_page - 1 : last_page]:
+                image_boxes = [
+                    (image["x0"], image["top"], image["x1"], image["bottom"])
+                    for image in page.images
+                ]
+                yield page.extract_text() or "", image_coverage(page.bbox, image_boxes)
+                page.close()  # Drop the page's cached layout objects
+
+
+class PdfminerTextBackend(PDFTextBackend):
+    """
+    pdfminer.six layout analysis without pdfplumber's per-character objects
+    """
+
+    name = "pdfminer"
+
+    def iter_pages(self, pdf_source, first_page=1, last_page=None):
+        page_numbers = None
+        if first_page > 1 or last_page is not None:
+            page_numbers = range(
+                first_page - 1, last_page if last_page is not None else 2**31
+            )
+
+        for layout in pdfminer_extract_pages(
+            pdf_source, page_numbers=page_numbers, laparams=LAParams()
+        ):
+            texts = []
+            image_boxes = []
+            elements = list(layout)
+            while elements:
+                element = elements.pop()
+                if isinstance(element, LTTextContainer):
+                    texts.append((element.y1, element.x0, element.get_text()))
+                elif isinstance(element, LTImage):
+                    image_boxes.append(element.bbox)
+                elif isinstance(element, LTFigure):
+                    elements.extend(element)
+
+            # Top-to-bottom, left-to-right reading order
+            texts.sort(key=lambda item: (-item[0], item[1]))
+            yield (
+                "".join(text for _, _, text in texts),
+                image_coverage(layout.bbox, image_boxes),
+            )
+
+
+class Pypdfium2TextBackend(PDFTextBackend):
+    """
+    PDFium's native text extraction; much faster, with simpler layout handling
+    """
+
+    name = "pypdfium2"
+
+    def iter_pages(self, pdf_source, first_page=1, last_page=None):
+        pdf = pypdfium2.PdfDocument(pdf_source)
+        try:
+            if last_page is None or last_page > len(pdf):
+                last_page = len(pdf)
+            for index in range(first_page - 1, last_page):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_bounded().replace("\r\n", "\n")
+                finally:
+                    textpage.close()
+
+                image_boxes = [
+                    image.get_pos()
+                    for image in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE])
+                ]
+                coverage = image_coverage(page.get_bbox(), image_boxes)
+                page.close()
+                yield text, coverage
+        finally:
+            pdf.close()
+
+
+def count_pdf_pages(pdf_source: Union[str, BinaryIO]) -> int:
+    """
+    Count the pages of a PDF without parsing their content
+    """
+    pdf = pypdfium2.PdfDocument(pdf_source)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+        if not isinstance(pdf_source, str):
+            pdf_source.seek(0)
+
+
+def extract_page_range(
+    backend_name: str, pdf_path: str, first_page: int, last_page: int
+) -> List[Tuple[str, float]]:
+    """
+    Read a range of pages with the named backend
+
+    Module-level so it can be pickled and executed inside pool workers; each
+    worker opens the PDF itself.
+    """
+    return PDF_TEXT_BACKENDS[backend_name]().extract_pages(
+        pdf_path, first_page, last_page
     )
 
 
+def _split_pages(page_count: int, chunk_count: int) -> List[Tuple[int, int]]:
+    """
+    Split pages 1..page_count into contiguous (first, last) ranges
+    """
+    chunk_count = max(1, min(chunk_count, page_count))
+    base, extra = divmod(page_count, chunk_count)
+    ranges = []
+    first_page = 1
+    for index in range(chunk_count):
+        last_page = first_page + base + (1 if index < extra else 0) - 1
+        ranges.append((first_page, last_page))
+        first_page = last_page + 1
+    return ranges
+
+
+PDF_TEXT_BACKENDS = {
+    backend.name: backend
+    for backend in (PdfplumberTextBackend, PdfminerTextBackend, Pypdfium2TextBackend)
+}
+
+
+def get_pdf_text_backends(
+    names: Optional[Sequence[str]] = None,
+) -> List[PDFTextBackend]:
+    """
+    Build the chain of text backends to try, in order
+
+    Args:
+        names: Backend names; defaults to PDF_TEXT_BACKEND followed by the
+            comma-separated PDF_TEXT_FALLBACKS
+
+    Returns:
+        Backend instances without duplicates
+    """
+    if names is None:
+        names = [os.environ.get("PDF_TEXT_BACKEND", DEFAULT_PDF_TEXT_BACKEND)]
+        names += os.environ.get("PDF_TEXT_FALLBACKS", DEFAULT_PDF_TEXT_FALLBACKS).split(
+            ","
+        )
+
+    backends = []
+    for name in names:
+        name = name.strip()
+        if not name or name in [backend.name for backend in backends]:
+            continue
+        if name not in PDF_TEXT_BACKENDS:
+            raise ValueError(f"Unknown PDF text backend '{name}'")
+        backends.append(PDF_TEXT_BACKENDS[name]())
+    return backends
+
+
+class TextExtractionCache:
+    """
+    Content-addressed cache of text extraction results
+
+    Entries are keyed by the SHA-256 of the file bytes, EXTRACTOR_VERSION and
+    a hash of the extractor settings that change its output (see
+    ResumeTextExtractor.cache_settings), so re-uploading the same file skips
+    pdfplumber and OCR entirely, and extractors configured differently never
+    share results.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_environment(cls) -> Optional["TextExtractionCache"]:
+        """
+        Build the cache configured by TEXT_CACHE_* environment variables
+
+        Returns None when caching is disabled (TEXT_CACHE_BACKEND=none).
+        """
+        backend_name = os.environ.get("TEXT_CACHE_BACKEND", "memory")
+
+        if backend_name == "none":
+            return None
+        if backend_name == "memory":
+            backend = MemoryCacheBackend(
+                max_entries=int(os.environ.get("TEXT_CACHE_MAX_ENTRIES", 128))
+            )
+        elif backend_name == "disk":
+            backend = DiskCacheBackend(
+                directory=os.environ.get(
+                    "TEXT_CACHE_DIR",
+                    os.path.join(tempfile.gettempdir(), "resume-text-cache"),
+                ),
+                max_bytes=int(
+                    os.environ.get("TEXT_CACHE_MAX_BYTES", 100 * 1024 * 1024)
+                ),
+            )
+        elif backend_name == "django":
+            backend = DjangoCacheBackend(
+                alias=os.environ.get("TEXT_CACHE_ALIAS", "default")
+            )
+        else:
+            raise ValueError(f"Unknown text cache backend '{backend_name}'")
+
+        return cls(backend)
+
+    def make_key(self, digest: str, settings: str = "") -> str:
+        return f"resume-text:v{EXTRACTOR_VERSION}:{settings}:{digest}"
+
+    def get(self, digest: str, settings: str = "") -> Optional[Dict]:
+        """
+        Return the cached extraction result for a document digest and
+        extractor settings hash, if any
+        """
+        try:
+            value = self.backend.get(self.make_key(digest, settings))
+        except Exception as e:
+            logger.warning(f"Text cache lookup failed: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, digest: str, result: Dict, settings: str = ""):
+        """
+        Store an extraction result for a document digest and extractor
+        settings hash
+        """
+        try:
+            self.backend.set(self.make_key(digest, settings), json.dumps(result))
+        except Exception as e:
+            logger.warning(f"Text cache store failed: {e}")
+
+    def stats(self) -> Dict:
+        """
+        Hit/miss counters for this process
+        """
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
 class ResumeTextExtractor:
     """
-    Handles extraction of text from resume PDFs
+    Handles extraction of text from resume PDF and DOCX files
     """
 
-    def extract_text(self, pdf_path: str) -> str:
+    def __init__(
+        self,
+        ocr_engine: Optional[OCREngine] = None,
+        cache: Optional[TextExtractionCache] = None,
+        text_backends: Optional[Sequence[str]] = None,
+        sandbox: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        max_memory_mb: Optional[int] = None,
+        page_limit: Optional[int] = None,
+        text_workers: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ):
+        self.ocr_engine = ocr_engine or OCREngine()
+        self.text_backends = get_pdf_text_backends(text_backends)
+        self.cache = (
+            cache if cache is not None else TextExtractionCache.from_environment()
+        )
+
+        # With the sandbox, uploads are parsed in a child process under these
+        # limits; a memory or page limit of 0 disables it. Off by default: the
+        # child cannot use the process's warm OCR and text worker pools and
+        # starts and shuts down its own for every document (see
+        # benchmark_text_extraction sandbox). The page limit always applies.
+        if sandbox is None:
+            sandbox = os.environ.get("EXTRACTION_SANDBOX", "false").lower() == "true"
+        if sandbox and not SANDBOX_AVAILABLE:
+            logger.warning("Extraction sandbox needs fork(); extracting in-process")
+            sandbox = False
+        self.sandbox = sandbox
+        self.timeout = (
+            timeout
+            if timeout is not None
+            else float(os.environ.get("EXTRACTION_TIMEOUT", DEFAULT_TIMEOUT))
+        )
+        self.max_memory_mb = (
+            max_memory_mb
+            if max_memory_mb is not None
+            else int(os.environ.get("EXTRACTION_MAX_MEMORY_MB", DEFAULT_MAX_MEMORY_MB))
+        )
+        self.page_limit = (
+            page_limit
+            if page_limit is not None
+            else int(os.environ.get("EXTRACTION_PAGE_LIMIT", DEFAULT_PAGE_LIMIT))
+        )
+
+        # Long PDFs can have their text layer read by several processes, and
+        # reading can stop once there is enough text for analysis (0 = no
+        # cutoff). Unlike page_limit, the cutoffs never reject a document.
+        self.text_workers = max(
+            1,
+            (
+                text_workers
+                if text_workers is not None
+                else int(os.environ.get("PDF_TEXT_WORKERS", 1))
+            ),
+        )
+        self.max_pages = (
+            max_pages
+            if max_pages is not None
+            else int(os.environ.get("PDF_TEXT_MAX_PAGES", 0))
+        )
+        self.max_chars = (
+            max_chars
+            if max_chars is not None
+            else int(os.environ.get("PDF_TEXT_MAX_CHARS", 0))
+        )
+
+    def cache_settings(self) -> str:
+        """
+        Hash of the settings that change the extraction result: text backends,
+        reading cutoffs and OCR options (not worker counts or limits, which
+        only decide whether a result is produced)
+        """
+        settings = [
+            [backend.name for backend in self.text_backends],
+            self.max_pages,
+            self.max_chars,
+        ] + [
+            getattr(self.ocr_engine, name, None)
+            for name in ("mode", "lang", "dpi_levels", "min_confidence", "preprocess")
+        ]
+        content = json.dumps(settings, default=str)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    def extract_text(self, source: ResumeSource) -> str:
         """
         Extract text from resume PDF - handles both text and image-based PDFs
 
         Args:
-            pdf_path: Path to the PDF file
+            source: Path to the PDF file, its bytes, or a binary file object
 
         Returns:
             Extracted text as a string
         """
-        extracted_text = ""
+        return self.extract_text_with_stats(source)["text"]
 
+    def extract_text_with_stats(self, source: ResumeSource) -> Dict:
+        """
+        Extract text from a resume, dispatching on the detected file format
+
+        PDF pages with a usable text layer are read directly. Only pages that
+        are essentially images (little text, large image coverage) are sent to
+        OCR, and the results are merged back in page order. DOCX files are
+        parsed straight from their XML. Files seen before are served from the
+        content-addressed cache. Documents over the page limit are refused;
+        with the sandbox enabled (EXTRACTION_SANDBOX), parsing also runs in a
+        child process with a timeout and a memory limit.
+
+        Args:
+            source: Path to the file, its bytes, or a binary file object
+
+        Returns:
+            Dictionary with the extracted text and per-page stats:
+            {
+                "text": "...",
+                "format": "pdf",
+                "backend": "pdfplumber",
+                "pages": [{"page": 1, "method": "text", "char_count": 1200,
+                           "image_coverage": 0.0}, ...],
+                "methods": {"text": 1, "ocr": 0, "empty": 0},
+            }
+
+        Raises:
+            ExtractionError: The document hit an extraction limit (timeout,
+                memory, page count); other failures return an empty result
+        """
         try:
-            logger.debug(f"Extracting text from: {pdf_path}")
-
-            # Method 1: Try extracting text directly from PDF
-            logger.debug("Attempting direct text extraction...")
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    page_text = page.extract_text()
-                    if page_text and page_text.strip():
-                        extracted_text += page_text + "\n"
-
-            # Check if we got meaningful text (more than just spaces/newlines)
-            if len(extracted_text.strip()) > 50:  # Arbitrary threshold
-                logger.info("Direct text extraction successful!")
-                word_count = len(extracted_text.split())
-                char_count = len(extracted_text)
-                logger.debug(f"Extracted {word_count} words, {char_count} characters")
-                return extracted_text.strip()
-            else:
-                logger.debug(
-                    "Direct text extraction failed or insufficient. Trying OCR..."
+            resume_source = _open_source(source)
+
+            digest = None
+            if self.cache is not None:
+                digest = _hash_source(resume_source)
+                cached_result = self.cache.get(digest, self.cache_settings())
+                if cached_result is not None:
+                    logger.info("Text extraction cache hit")
+                    return cached_result
+
+            if self.sandbox:
+                result = run_sandboxed(
+                    self._extract_document,
+                    resume_source,
+                    timeout=self.timeout,
+                    max_memory_mb=self.max_memory_mb,
                 )
-                extracted_text = ""  # Reset
+            else:
+                result = self._extract_document(resume_source)
 
-                if not OCR_AVAILABLE:
-                    logger.warning(
-                        "OCR libraries not available. Cannot process image-based PDFs."
-                    )
-                    return ""
+            # Failures are not cached; they may be transient (e.g. OCR missing)
+            if digest is not None and result["text"]:
+                self.cache.set(digest, result, self.cache_settings())
+
+            return result
+
+        except ExtractionError as e:
+            logger.error(f"Text extraction aborted: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting text from resume: {e}")
+            return self._empty_result()
+
+    def _extract_document(self, resume_source: Union[str, BinaryIO]) -> Dict:
+        """
+        Detect the document format and extract its text
+        """
+        document_format = detect_format(resume_source)
+        logger.debug(
+            f"Extracting text from: {_describe_source(resume_source)} "
+            f"({document_format})"
+        )
+
+        if document_format == FORMAT_DOCX:
+            result = self._extract_docx(resume_source)
+        elif document_format == FORMAT_IMAGE:
+            result = self._extract_image(resume_source)
+        elif document_format == FORMAT_DOC:
+            logger.warning(
+                "Legacy .doc files are not supported. Save the resume as "
+                "DOCX or PDF."
+            )
+            result = self._empty_result()
+        else:
+            result = self._extract_pdf(resume_source)
+
+        result["format"] = document_format
+        return result
+
+    def _extract_pdf(self, pdf_source: Union[str, BinaryIO]) -> Dict:
+        """
+        Extract text from a PDF using the text layer, and OCR where needed
+        """
+        self._check_page_limit(pdf_source)
+
+        # Method 1: Read the text layer and classify every page
+        logger.debug("Attempting direct text extraction...")
+        pages, backend_name = self._extract_text_layer(pdf_source)
+
+        ocr_page_numbers = [
+            page["page"] for page in pages if page["method"] == METHOD_OCR
+        ]
+        if not ocr_page_numbers and len(self._join_pages(pages)) <= MIN_TEXT_LENGTH:
+            # Flattened PDFs (text drawn as vector paths) have neither a
+            # text layer nor images, so fall back to OCR for every page
+            logger.debug("Direct text extraction failed or insufficient. Trying OCR...")
+            ocr_page_numbers = [page["page"] for page in pages]
+
+        # Method 2: OCR the pages without a usable text layer
+        if ocr_page_numbers:
+            self._ocr_pages(pdf_source, pages, ocr_page_numbers)
+
+        return self._pages_result(pages, backend_name)
 
-                # Method 2: Use OCR for image-based or flattened PDFs
-                logger.debug("Converting PDF to images for OCR...")
+    def _extract_docx(self, docx_source: Union[str, BinaryIO]) -> Dict:
+        """
+        Extract text from a DOCX file by streaming its WordprocessingML
+
+        Page headers are read before the body since resumes often keep the
+        candidate's name and contact details there.
+        """
+        logger.debug("Extracting text from DOCX XML...")
+        paragraphs = []
+        with zipfile.ZipFile(docx_source) as archive:
+            header_parts = sorted(
+                name
+                for name in archive.namelist()
+                if name.startswith("word/header") and name.endswith(".xml")
+            )
+            for part_name in header_parts + [DOCX_BODY_PART]:
+                for paragraph in _iter_docx_paragraphs(archive, part_name):
+                    if paragraph.strip():
+                        paragraphs.append(paragraph.strip())
+
+        result = self._empty_result()
+        result["text"] = self._check_text("\n".join(paragraphs))
+        return result
+
+    def _extract_image(self, image_source: Union[str, BinaryIO]) -> Dict:
+        """
+        OCR an uploaded image (photo, screenshot or TIFF scan) directly
+
+        The image goes to the OCR engine as is, without the PDF rasterization
+        step. Each frame of a multi-page TIFF is a page; frames are decoded
+        one at a time and downscaled to OCR resolution first; JPEGs are decoded
+        at a reduced scale to begin with.
+        """
+        if not OCR_AVAILABLE:
+            logger.warning("OCR libraries not available. Cannot process images.")
+            return self._empty_result()
+
+        logger.debug("Extracting text from image with OCR...")
+        with Image.open(image_source) as image:
+            self._enforce_page_limit(getattr(image, "n_frames", 1))
+            draft_for_ocr(image)
+            page_texts = self.ocr_engine.ocr_images(
+                fit_for_ocr(frame.copy()) for frame in ImageSequence.Iterator(image)
+            )
+
+        pages = []
+        for page_number, page_text in enumerate(page_texts, start=1):
+            page_text = (page_text or "").strip()
+            pages.append(
+                {
+                    "page": page_number,
+                    "method": METHOD_OCR if page_text else METHOD_EMPTY,
+                    "char_count": len(page_text),
+                    "image_coverage": 1.0,
+                    "text": page_text,
+                }
+            )
+        return self._pages_result(pages, None)
+
+    def _check_page_limit(self, pdf_source: Union[str, BinaryIO]):
+        """
+        Refuse PDFs with more pages than the configured limit
+        """
+        if self.page_limit:
+            self._enforce_page_limit(count_pdf_pages(pdf_source))
+
+    def _enforce_page_limit(self, page_count: int):
+        if self.page_limit and page_count > self.page_limit:
+            raise PageLimitExceeded(
+                f"Resume has {page_count} pages; at most {self.page_limit} are allowed"
+            )
 
-                # Convert PDF to images
-                pages = convert_from_path(pdf_path, dpi=300)  # High DPI for better OCR
+    def _check_text(self, extracted_text: str) -> str:
+        """
+        Return the text if it is long enough to be meaningful, else ""
+        """
+        if len(extracted_text) <= MIN_TEXT_LENGTH:
+            logger.warning("Text extraction failed or insufficient text found")
+            return ""
+
+        logger.info("Text extraction successful!")
+        logger.debug(
+            f"Extracted {len(extracted_text.split())} words, "
+            f"{len(extracted_text)} characters"
+        )
+        return extracted_text
+
+    def _pages_result(self, pages: List[Dict], backend_name: Optional[str]) -> Dict:
+        """
+        Build the extraction result from per-page entries
+        """
+        return {
+            "text": self._check_text(self._join_pages(pages)),
+            "backend": backend_name,
+            "pages": [
+                {key: value for key, value in page.items() if key != "text"}
+                for page in pages
+            ],
+            "methods": self._count_methods(pages),
+        }
 
-                logger.debug(f"Processing {len(pages)} pages with OCR...")
-                for page_num, page_image in enumerate(pages):
-                    logger.debug(f"  Processing page {page_num + 1}/{len(pages)}...")
+    def _empty_result(self) -> Dict:
+        return {
+            "text": "",
+            "format": FORMAT_UNKNOWN,
+            "backend": None,
+            "pages": [],
+            "methods": self._count_methods([]),
+        }
 
-                    # Use OCR to extract text from the image
-                    page_text = pytesseract.image_to_string(page_image, lang="eng")
+    def _extract_text_layer(
+        self, pdf_source: Union[str, BinaryIO]
+    ) -> Tuple[List[Dict], str]:
+        """
+        Read the text layer of every page and classify how it should be
+        extracted
+
+        Backends are tried in order until one returns enough text; otherwise
+        the result with the most text is used. Reading stops at max_pages or
+        once max_chars have been read.
 
-                    if page_text and page_text.strip():
-                        extracted_text += page_text + "\n"
+        Returns:
+            Tuple of (per-page dictionaries, name of the backend used)
+        """
+        best_pages, best_backend = None, None
+        last_error = None
 
-                if len(extracted_text.strip()) > 50:
-                    logger.info("OCR text extraction successful!")
-                    word_count = len(extracted_text.split())
-                    char_count = len(extracted_text)
-                    logger.debug(
-                        f"Extracted {word_count} words, {char_count} characters"
+        page_count = None
+        if self.text_workers > 1:
+            page_count = count_pdf_pages(pdf_source)
+            if self.max_pages:
+                page_count = min(page_count, self.max_pages)
+
+        for backend in self.text_backends:
+            if not isinstance(pdf_source, str):
+                pdf_source.seek(0)
+            try:
+                if page_count is not None and page_count >= PARALLEL_TEXT_MIN_PAGES:
+                    page_results = self._extract_pages_parallel(
+                        backend, pdf_source, page_count
                     )
-                    return extracted_text.strip()
                 else:
-                    logger.warning("OCR extraction failed or insufficient text found")
-                    return ""
+                    page_results = backend.extract_pages(
+                        pdf_source,
+                        last_page=self.max_pages or None,
+                        max_chars=self.max_chars or None,
+                    )
+            except Exception as e:
+                logger.warning(f"{backend.name} text extraction failed: {e}")
+                last_error = e
+                continue
+
+            pages = [
+                self._classify_page(page_num + 1, page_text, coverage)
+                for page_num, (page_text, coverage) in enumerate(page_results)
+            ]
+            text_length = len(self._join_pages(pages))
+            if best_pages is None or text_length > len(self._join_pages(best_pages)):
+                best_pages, best_backend = pages, backend.name
+            if text_length > MIN_TEXT_LENGTH:
+                break
+            logger.debug(f"{backend.name} returned too little text, trying next...")
 
+        if best_pages is None:
+            raise last_error
+        return best_pages, best_backend
+
+    def _extract_pages_parallel(
+        self,
+        backend: PDFTextBackend,
+        pdf_source: Union[str, BinaryIO],
+        page_count: int,
+    ) -> List[Tuple[str, float]]:
+        """
+        Read page ranges concurrently on the shared worker pool
+
+        Ranges are collected in page order; once max_chars have been read the
+        ranges that have not started yet are cancelled.
+        """
+        # Two ranges per worker keeps workers busy when page density varies
+        page_ranges = _split_pages(page_count, self.text_workers * 2)
+        logger.debug(
+            f"Reading {page_count} pages in {len(page_ranges)} ranges on "
+            f"{self.text_workers} worker processes..."
+        )
+
+        with _source_path(pdf_source) as pdf_path:
+            try:
+                pool = get_text_pool(self.text_workers)
+                futures = [
+                    pool.submit(extract_page_range, backend.name, pdf_path, first, last)
+                    for first, last in page_ranges
+                ]
+                pages = []
+                char_count = 0
+                for future in futures:
+                    if self.max_chars and char_count >= self.max_chars:
+                        future.cancel()
+                        continue
+                    for page in future.result():
+                        pages.append(page)
+                        char_count += len(page[0])
+                        if self.max_chars and char_count >= self.max_chars:
+                            break
+                return pages
+            except BrokenProcessPool:
+                logger.warning("Text worker pool broke, reading pages serially")
+                shutdown_text_pool(wait=False)
+                return backend.extract_pages(
+                    pdf_path, last_page=page_count, max_chars=self.max_chars or None
+                )
+
+    def _classify_page(self, page_number: int, page_text: str, coverage: float):
+        """
+        Decide whether a page's text layer is usable or the page needs OCR
+        """
+        page_text = page_text.strip()
+
+        if len(page_text) >= MIN_PAGE_TEXT_LENGTH:
+            method = METHOD_TEXT
+        elif coverage >= IMAGE_COVERAGE_THRESHOLD:
+            method = METHOD_OCR
+        elif page_text:
+            method = METHOD_TEXT
+        else:
+            method = METHOD_EMPTY
+
+        return {
+            "page": page_number,
+            "method": method,
+            "char_count": len(page_text),
+            "image_coverage": round(coverage, 2),
+            "text": page_text,
+        }
+
+    def _ocr_pages(
+        self,
+        pdf_source: Union[str, BinaryIO],
+        pages: List[Dict],
+        page_numbers: List[int],
+    ):
+        """
+        OCR the given pages and store the results in place
+        """
+        if not OCR_AVAILABLE:
+            logger.warning(
+                "OCR libraries not available. Cannot process image-based pages."
+            )
+            self._keep_text_layer(pages, page_numbers)
+            return
+
+        logger.debug(f"Converting {len(page_numbers)} pages to images for OCR...")
+        try:
+            with _source_path(pdf_source) as pdf_path:
+                page_texts = self.ocr_engine.ocr_pdf(
+                    pdf_path, page_numbers=page_numbers
+                )
         except Exception as e:
-            logger.error(f"Error extracting text from PDF: {e}")
-            return ""
+            # Keep whatever the text layer gave rather than failing the upload
+            logger.error(f"OCR failed: {e}")
+            self._keep_text_layer(pages, page_numbers)
+            return
+
+        for page_number, page_text in zip(page_numbers, page_texts):
+            page = pages[page_number - 1]
+            page_text = (page_text or "").strip()
+            page["method"] = METHOD_OCR if page_text else METHOD_EMPTY
+            page["char_count"] = len(page_text)
+            page["text"] = page_text
+
+    def _keep_text_layer(self, pages: List[Dict], page_numbers: List[int]):
+        """
+        Fall back to the text layer for pages that could not be OCRed
+        """
+        for page_number in page_numbers:
+            page = pages[page_number - 1]
+            page["method"] = METHOD_TEXT if page["text"] else METHOD_EMPTY
+
+    def _join_pages(self, pages: List[Dict]) -> str:
+        """
+        Merge page texts in page order, separated by form feeds so prompt
+        compaction can tell running headers and footers from repeated content
+        """
+        return PAGE_SEPARATOR.join(
+            page["text"] for page in pages if page["text"]
+        ).strip()
+
+    def _count_methods(self, pages: List[Dict]) -> Dict[str, int]:
+        """
+        Count how many pages were extracted with each method
+        """
+        counts = {METHOD_TEXT: 0, METHOD_OCR: 0, METHOD_EMPTY: 0}
+        for page in pages:
+            counts[page["method"]] += 1
+        return counts
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "a_core.settings")
+# Route uploads to the async view, which awaits the Groq API on the event loop
+os.environ.setdefault("ASYNC_VIEWS", "True")
 
 application = get_asgi_application()
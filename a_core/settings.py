@@ -38,6 +38,11 @@ SECRET_KEY = os.getenv(
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv("DEBUG", "True").lower() == "true"
 
+# Serve resume uploads from async views, so that analyses waiting on the Groq
+# API do not tie up a thread each. Enabled by default when running under ASGI
+# (see asgi.py); under WSGI every async request gets an event loop of its own.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "False").lower() == "true"
+
 # Parse ALLOWED_HOSTS from environment variable
 allowed_hosts_str = os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1")
 ALLOWED_HOSTS = [host.strip() for host in allowed_hosts_str.split(",")]
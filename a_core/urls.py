@@ -18,22 +18,47 @@ Including another URLconf
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.http import HttpResponse
+from django.http import JsonResponse
 from django.urls import include, path
 
+from Analyze.resilience import STATE_CLOSED, circuit_breaker_states
+
 
 # Health check view for Render
 def health_check(request):
+    """
+    Database check plus the state of this worker's circuit breakers
+
+    An open breaker reports "DEGRADED" but keeps the status at 200: the
+    site still works (with fallback extraction) and restarting the worker
+    would not bring Groq back.
+    """
+    breakers = circuit_breaker_states()
     try:
         # Test database connection
         from django.db import connection
 
         with connection.cursor() as cursor:
             cursor.execute("SELECT 1")
-
-        return HttpResponse("OK", status=200)
     except Exception as e:
-        return HttpResponse(f"Error: {str(e)}", status=500)
+        return JsonResponse(
+            {
+                "status": "ERROR",
+                "database": f"Error: {str(e)}",
+                "circuit_breakers": breakers,
+            },
+            status=500,
+        )
+
+    degraded = any(state["state"] != STATE_CLOSED for state in breakers.values())
+    return JsonResponse(
+        {
+            "status": "DEGRADED" if degraded else "OK",
+            "database": "OK",
+            "circuit_breakers": breakers,
+        },
+        status=200,
+    )
 
 
 urlpatterns = [
@@ -1,6 +1,12 @@
 from django.contrib import admin
 
-from .models import AnalysisRecommendation, ResumeAnalysis, UserProfile
+from .models import (
+    AnalysisRecommendation,
+    CacheEntry,
+    CacheStatistics,
+    ResumeAnalysis,
+    UserProfile,
+)
 
 
 @admin.register(ResumeAnalysis)
@@ -46,3 +52,35 @@ class AnalysisRecommendationAdmin(admin.ModelAdmin):
     list_display = ["analysis", "title", "priority", "category"]
     list_filter = ["priority", "category"]
     search_fields = ["title", "description"]
+
+
+@admin.register(CacheStatistics)
+class CacheStatisticsAdmin(admin.ModelAdmin):
+    list_display = ["name", "hits", "misses", "hit_rate", "updated_at"]
+    readonly_fields = ["name", "hits", "misses", "hit_rate", "updated_at"]
+
+    @admin.display(description="Hit rate")
+    def hit_rate(self, obj):
+        return f"{obj.get_hit_rate():.1%}"
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(CacheEntry)
+class CacheEntryAdmin(admin.ModelAdmin):
+    list_display = ["key", "namespace", "hits", "created_at", "last_accessed_at"]
+    list_filter = ["namespace"]
+    search_fields = ["key"]
+    readonly_fields = [
+        "key",
+        "namespace",
+        "value",
+        "hits",
+        "created_at",
+        "last_accessed_at",
+    ]
+    ordering = ["-last_accessed_at"]
+
+    def has_add_permission(self, request):
+        return False
@@ -62,7 +62,7 @@ class ResumeUploadForm(forms.ModelForm):
             "file": forms.FileInput(
                 attrs={
                     "class": "form-control",
-                    "accept": ".pdf,.doc,.docx,.txt",
+                    "accept": ".pdf,.doc,.docx,.txt,.jpg,.jpeg,.png,.tif,.tiff",
                     "id": "resume-file",
                 }
             )
@@ -76,11 +76,20 @@ class ResumeUploadForm(forms.ModelForm):
                 raise forms.ValidationError("File size must be less than 10MB.")
 
             # Check file extension
-            allowed_extensions = [".pdf", ".doc", ".docx"]
+            allowed_extensions = [
+                ".pdf",
+                ".doc",
+                ".docx",
+                ".jpg",
+                ".jpeg",
+                ".png",
+                ".tif",
+                ".tiff",
+            ]
             file_extension = file.name.lower()
             if not any(file_extension.endswith(ext) for ext in allowed_extensions):
                 raise forms.ValidationError(
-                    "Only PDF, DOC, and DOCX files are allowed."
+                    "Only PDF, DOC, DOCX and image (JPG, PNG, TIFF) files are allowed."
                 )
 
         return file
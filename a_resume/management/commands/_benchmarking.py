@@ -0,0 +1,75 @@
+"""
+Helpers shared by the benchmark management commands
+"""
+
+import difflib
+import time
+
+
+def text_similarity(first, second):
+    """Similarity ratio (0-1) of two texts, ignoring whitespace differences"""
+    return difflib.SequenceMatcher(
+        None, " ".join(first.split()), " ".join(second.split())
+    ).ratio()
+
+
+def best_of(function, *args, repeat=1):
+    """Run function repeat times and return (best wall-clock seconds, result)"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def add_fake_groq_arguments(parser):
+    """Options of a FakeGroqServer's simulated latency and faults"""
+    parser.add_argument(
+        "--latency-ms", type=float, default=400, help="Median completion latency"
+    )
+    parser.add_argument(
+        "--latency-spread",
+        type=float,
+        default=0.5,
+        help="Sigma of the log-normal latency distribution (0 = fixed)",
+    )
+    parser.add_argument(
+        "--handshake-ms", type=float, default=0, help="Delay per new connection"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="Share of 500 responses"
+    )
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0, help="Share of 429 responses"
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=1, help="Retry-after of 429s, seconds"
+    )
+    parser.add_argument(
+        "--chunk-delay-ms",
+        type=float,
+        default=5,
+        help="Delay between streamed chunks of 16 characters",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed for repeatable latency and faults"
+    )
+
+
+def fake_groq_server(options, **kwargs):
+    """FakeGroqServer configured by add_fake_groq_arguments' options"""
+    from Analyze.fake_groq_server import FakeGroqServer
+
+    return FakeGroqServer(
+        latency=options["latency_ms"] / 1000,
+        latency_spread=options["latency_spread"],
+        handshake_delay=options["handshake_ms"] / 1000,
+        error_rate=options["error_rate"],
+        rate_limit_rate=options["rate_limit_rate"],
+        retry_after=options["retry_after"],
+        stream_chunk_delay=options["chunk_delay_ms"] / 1000,
+        seed=options["seed"],
+        **kwargs,
+    )
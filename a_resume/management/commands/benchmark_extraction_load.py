@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from Analyze.ai_data_extractor import AIDataExtractor
+from Analyze.heuristic_extractor import HeuristicExtractor
+from Analyze.resilience import circuit_breaker_states
+from Analyze.sample_documents import SAMPLE_RESUME_LINES
+
+from ._benchmarking import add_fake_groq_arguments, fake_groq_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test structured data extraction against a fake Groq server, "
+        "reporting throughput, latency percentiles and failures"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Resumes to extract"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=16, help="Extractions in flight"
+        )
+        parser.add_argument(
+            "--mode",
+            choices=["sync", "async", "stream"],
+            default="sync",
+            help=(
+                "sync: extract_structured_data from threads; async: "
+                "extract_structured_data_async on one event loop; stream: "
+                "stream_structured_data from threads"
+            ),
+        )
+        parser.add_argument(
+            "--fallback",
+            action="store_true",
+            help="Fall back to the heuristic extractor when a call fails",
+        )
+        parser.add_argument(
+            "--base-url",
+            help="Load an already running server (see run_fake_groq_server) "
+            "instead of starting one; the fault options are then ignored",
+        )
+        add_fake_groq_arguments(parser)
+
+    def handle(self, *args, **options):
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        logging.getLogger("httpx").setLevel(logging.WARNING)  # One line per request
+        if options["verbosity"] < 2:
+            # Every injected fault would be logged as an extraction error
+            logging.getLogger("Analyze").setLevel(logging.CRITICAL)
+
+        server = None
+        base_url = options["base_url"]
+        if not base_url:
+            server = fake_groq_server(options).start()
+            base_url = server.base_url
+
+        self.fallbacks = 0
+        heuristic = HeuristicExtractor()
+
+        def fallback(resume_text):
+            self.fallbacks += 1
+            return heuristic(resume_text)
+
+        extractor = AIDataExtractor(
+            max_concurrency=options["concurrency"],
+            fallback=fallback if options["fallback"] else None,
+            base_url=base_url,
+        )
+        extractor.cache = None  # Every request must reach the server
+        texts = [
+            "\n".join(SAMPLE_RESUME_LINES) + f"\nApplicant {index}"
+            for index in range(options["requests"])
+        ]
+
+        try:
+            started = time.perf_counter()
+            samples = getattr(self, f"_run_{options['mode']}")(
+                extractor, texts, options["concurrency"]
+            )
+            elapsed = time.perf_counter() - started
+        finally:
+            if server is not None:
+                server.stop()
+
+        self._report(options, samples, elapsed, server)
+
+    def _run_sync(self, extractor, texts, concurrency):
+        def extract(text):
+            started = time.perf_counter()
+            data = extractor.extract_structured_data(text)
+            return time.perf_counter() - started, None, bool(data)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(extract, texts))
+
+    def _run_stream(self, extractor, texts, concurrency):
+        def extract(text):
+            started = time.perf_counter()
+            first_field = None
+            for event in extractor.stream_structured_data(text):
+                if first_field is None and event["event"] == "field":
+                    first_field = time.perf_counter() - started
+                elif event["event"] == "complete":
+                    data = event["data"]
+            return time.perf_counter() - started, first_field, bool(data)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(extract, texts))
+
+    def _run_async(self, extractor, texts, concurrency):
+        # Concurrency is capped by the extractor's own semaphore
+        async def extract(text):
+            started = time.perf_counter()
+            data = await extractor.extract_structured_data_async(text)
+            return time.perf_counter() - started, None, bool(data)
+
+        async def run():
+            return await asyncio.gather(*(extract(text) for text in texts))
+
+        return asyncio.run(run())
+
+    def _report(self, options, samples, elapsed, server):
+        latencies = sorted(sample[0] * 1000 for sample in samples)
+        first_fields = sorted(
+            sample[1] * 1000 for sample in samples if sample[1] is not None
+        )
+        failed = sum(not sample[2] for sample in samples)
+
+        self.stdout.write(
+            f"{options['mode']}: {len(samples)} extractions, concurrency "
+            f"{options['concurrency']}, {elapsed:.2f}s, "
+            f"{len(samples) / elapsed:.1f} extractions/s"
+        )
+        self.stdout.write(f"latency (ms):     {self._percentiles(latencies)}")
+        if first_fields:
+            self.stdout.write(f"first field (ms): {self._percentiles(first_fields)}")
+        self.stdout.write(f"failed: {failed}, fallbacks: {self.fallbacks}")
+        if server is not None:
+            self.stdout.write(
+                f"server: {server.requests} requests on {server.connections} "
+                f"connections, {server.errors} errors and {server.rate_limited} "
+                "rate limits injected"
+            )
+        for name, state in circuit_breaker_states().items():
+            self.stdout.write(
+                f"circuit '{name}': {state['state']}, opened "
+                f"{state['times_opened']} times, {state['short_circuited']} "
+                "calls short-circuited"
+            )
+
+    def _percentiles(self, values):
+        if len(values) < 2:
+            return f"p50 {values[0]:.1f}" if values else "-"
+        quantiles = statistics.quantiles(values, n=100)
+        return (
+            f"p50 {statistics.median(values):.1f}  p95 {quantiles[94]:.1f}  "
+            f"p99 {quantiles[98]:.1f}  max {values[-1]:.1f}"
+        )
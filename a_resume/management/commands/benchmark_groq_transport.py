@@ -0,0 +1,127 @@
+import logging
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from groq import Groq
+
+from Analyze.ai_data_extractor import DEFAULT_MODEL
+from Analyze.fake_groq_server import FakeGroqServer
+from Analyze.groq_transport import STRATEGY_PROCESS, STRATEGY_THREAD, GroqTransport
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark Groq client transports against a local fake Groq server "
+        "that charges a handshake delay for every new connection"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Completions per run"
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            nargs="+",
+            default=[1, 8],
+            help="Concurrent threads sending the requests",
+        )
+        parser.add_argument(
+            "--handshake-ms",
+            type=float,
+            default=30,
+            help="Delay per new connection, standing in for TCP + TLS set-up",
+        )
+        parser.add_argument(
+            "--latency-ms", type=float, default=5, help="Delay per completion"
+        )
+        parser.add_argument(
+            "--idle",
+            type=float,
+            default=10,
+            help="Gap in seconds between requests for the idle reuse check (0 = skip)",
+        )
+
+    def handle(self, *args, **options):
+        os.environ.setdefault("GROQ_API_KEY", "benchmark")
+        logging.getLogger("httpx").setLevel(logging.WARNING)  # One line per request
+        server = FakeGroqServer(
+            latency=options["latency_ms"] / 1000,
+            handshake_delay=options["handshake_ms"] / 1000,
+        ).start()
+
+        clients = {
+            "client per request": lambda: self._new_client(server),
+            "no keep-alive": GroqTransport(
+                max_keepalive_connections=0, base_url=server.base_url
+            ).groq_client,
+            "groq defaults": self._shared(self._new_client(server)),
+            "pooled/process": GroqTransport(
+                strategy=STRATEGY_PROCESS, base_url=server.base_url
+            ).groq_client,
+            "pooled/thread": GroqTransport(
+                strategy=STRATEGY_THREAD, base_url=server.base_url
+            ).groq_client,
+        }
+
+        self.stdout.write(
+            f"{'client':<19} {'threads':>7} {'connections':>11} {'total (s)':>10} "
+            f"{'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9}"
+        )
+        try:
+            for threads in options["threads"]:
+                for name, get_client in clients.items():
+                    server.reset_counters()
+                    elapsed, latencies = self._run(
+                        get_client, options["requests"], threads
+                    )
+                    quantiles = statistics.quantiles(latencies, n=20)
+                    self.stdout.write(
+                        f"{name:<19} {threads:>7} {server.connections:>11} "
+                        f"{elapsed:>10.3f} {options['requests'] / elapsed:>8.1f} "
+                        f"{statistics.median(latencies) * 1000:>9.2f} "
+                        f"{quantiles[18] * 1000:>9.2f}"
+                    )
+            if options["idle"]:
+                self._idle_reuse(server, clients, options["idle"])
+        finally:
+            server.stop()
+
+    def _idle_reuse(self, server, clients, idle):
+        """Whether a connection survives a quiet spell between two uploads"""
+        self.stdout.write(f"\nTwo requests {idle:g}s apart:")
+        self.stdout.write(
+            f"{'client':<19} {'connections':>11} {'2nd request (ms)':>17}"
+        )
+        for name in ("groq defaults", "pooled/process"):
+            get_client = clients[name]
+            self._run(get_client, 1, 1)  # Make sure a connection is open
+            time.sleep(idle)
+            server.reset_counters()
+            _, latencies = self._run(get_client, 1, 1)
+            self.stdout.write(
+                f"{name:<19} {server.connections:>11} {latencies[0] * 1000:>17.2f}"
+            )
+
+    def _new_client(self, server):
+        return Groq(base_url=server.base_url, max_retries=0)
+
+    def _shared(self, client):
+        return lambda: client
+
+    def _run(self, get_client, requests, threads):
+        def complete(_):
+            started = time.perf_counter()
+            get_client().chat.completions.create(
+                model=DEFAULT_MODEL,
+                messages=[{"role": "user", "content": "Jane Candidate"}],
+            )
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            latencies = list(executor.map(complete, range(requests)))
+        return time.perf_counter() - started, latencies
@@ -0,0 +1,161 @@
+import json
+import statistics
+
+from django.core.management.base import BaseCommand
+
+from a_resume.models import ResumeAnalysis
+from Analyze.ai_data_extractor import GROQ_FIELD_MAPPING, AIDataExtractor
+from Analyze.fake_groq_server import CANNED_EXTRACTION
+from Analyze.heuristic_extractor import (
+    LIST_FIELDS,
+    STRING_FIELDS,
+    HeuristicExtractor,
+)
+from Analyze.sample_documents import SAMPLE_RESUME_LINES
+
+from ._benchmarking import best_of, text_similarity
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the heuristic extractor's accuracy and latency against the "
+        "LLM output stored with completed analyses"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=500, help="Most recent analyses to compare"
+        )
+        parser.add_argument(
+            "--match",
+            type=float,
+            default=0.6,
+            help="Text similarity at which two list items count as the same",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs per resume (best of)"
+        )
+        parser.add_argument(
+            "--show-misses",
+            type=int,
+            default=0,
+            help="Print the fields of N resumes where the extractors disagree",
+        )
+
+    def handle(self, *args, **options):
+        pairs = self._stored_pairs(options["limit"])
+        if not pairs:
+            self.stdout.write(
+                "No completed analyses with resume text stored; comparing the "
+                "synthetic sample resume with the fake server's canned output"
+            )
+            pairs = [
+                (
+                    "\n".join(SAMPLE_RESUME_LINES),
+                    AIDataExtractor()._map_groq_response(CANNED_EXTRACTION),
+                )
+            ]
+
+        extractor = HeuristicExtractor()
+        latencies = []
+        scores = {field: [] for field in GROQ_FIELD_MAPPING.values()}
+        misses = options["show_misses"]
+        for resume_text, expected in pairs:
+            elapsed, actual = best_of(
+                extractor.extract_structured_data, resume_text, repeat=options["repeat"]
+            )
+            latencies.append(elapsed)
+            for field in STRING_FIELDS:
+                scores[field].append(
+                    self._string_match(field, actual[field], expected.get(field))
+                )
+            for field in LIST_FIELDS:
+                scores[field].append(
+                    self._list_f1(actual[field], expected.get(field), options["match"])
+                )
+            if misses and any(scores[field][-1] < 1 for field in scores):
+                misses -= 1
+                self._show_miss(actual, expected, scores)
+
+        self.stdout.write(f"\n{len(pairs)} resumes")
+        self.stdout.write(f"{'field':<20} {'score':>6}")
+        for field, values in scores.items():
+            self.stdout.write(f"{field:<20} {statistics.mean(values):>6.3f}")
+        overall = statistics.mean(statistics.mean(values) for values in scores.values())
+        self.stdout.write(f"{'mean':<20} {overall:>6.3f}")
+        self.stdout.write(
+            "(contact fields: exact match rate; list fields: mean item F1)\n"
+        )
+
+        latencies_ms = sorted(latency * 1000 for latency in latencies)
+        p95 = (
+            statistics.quantiles(latencies_ms, n=20)[18]
+            if len(latencies_ms) > 1
+            else latencies_ms[0]
+        )
+        self.stdout.write(
+            f"latency per resume: p50 {statistics.median(latencies_ms):.2f} ms, "
+            f"p95 {p95:.2f} ms, max {latencies_ms[-1]:.2f} ms"
+        )
+
+    def _stored_pairs(self, limit):
+        """(resume text, structured data) of recent LLM-analyzed resumes"""
+        analyses = (
+            ResumeAnalysis.objects.filter(status="completed", resume_text__isnull=False)
+            .exclude(resume_text="")
+            # Rows written by perform_mock_analysis hold no LLM output
+            .exclude(resume_text="Sample resume text for testing")
+            .order_by("-id")[:limit]
+        )
+        return [
+            (
+                analysis.resume_text,
+                {
+                    field: getattr(analysis, field)
+                    for field in GROQ_FIELD_MAPPING.values()
+                },
+            )
+            for analysis in analyses
+        ]
+
+    def _string_match(self, field, actual, expected):
+        actual, expected = actual or "", expected or ""
+        if field == "phone_number":
+            actual = "".join(filter(str.isdigit, actual))
+            expected = "".join(filter(str.isdigit, expected))
+        return float(actual.casefold().split() == expected.casefold().split())
+
+    def _list_f1(self, actual, expected, threshold):
+        """F1 of list items, matching each expected item at most once"""
+        actual = [str(item) for item in actual or []]
+        expected = [
+            json.dumps(item) if isinstance(item, dict) else str(item)
+            for item in expected or []
+        ]
+        if not actual and not expected:
+            return 1.0
+        unmatched = list(expected)
+        matched = 0
+        for item in actual:
+            best = max(
+                unmatched,
+                key=lambda other: text_similarity(item.casefold(), other.casefold()),
+                default=None,
+            )
+            if best is not None and (
+                text_similarity(item.casefold(), best.casefold()) >= threshold
+            ):
+                unmatched.remove(best)
+                matched += 1
+        if not matched:
+            return 0.0
+        precision, recall = matched / len(actual), matched / len(expected)
+        return 2 * precision * recall / (precision + recall)
+
+    def _show_miss(self, actual, expected, scores):
+        self.stdout.write("")
+        for field, values in scores.items():
+            if values[-1] < 1:
+                self.stdout.write(f"{field} ({values[-1]:.2f})")
+                self.stdout.write(f"  heuristic: {actual[field]}")
+                self.stdout.write(f"  llm:       {expected.get(field)}")
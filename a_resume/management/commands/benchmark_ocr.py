@@ -0,0 +1,231 @@
+import glob
+import os
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Analyze.ocr_engine import (
+    DEFAULT_DPI,
+    OCR_AVAILABLE,
+    OCR_MODE_BATCH,
+    OCR_MODE_PARALLEL,
+    OCR_MODE_SERIAL,
+    OCREngine,
+    shutdown_ocr_pool,
+)
+from Analyze.sample_documents import SAMPLE_RESUME_LINES, build_scanned_pdf
+
+from ._benchmarking import best_of, text_similarity
+
+
+class Command(BaseCommand):
+    help = "Benchmark OCR strategies on synthetic or user-supplied scanned PDFs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--compare",
+            choices=["parallel", "adaptive-dpi", "batch", "preprocess"],
+            default="parallel",
+            help=(
+                "parallel: serial vs process-pool OCR against page count; "
+                "adaptive-dpi: fixed 300 DPI vs adaptive DPI time and accuracy; "
+                "batch: per-page tesseract calls vs one tesseract run per document; "
+                "preprocess: OCR time and accuracy with and without image cleanup"
+            ),
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            nargs="+",
+            default=[1, 2, 4, 8],
+            help="Page counts to benchmark",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Process pool size for parallel OCR",
+        )
+        parser.add_argument(
+            "--dpi-levels",
+            type=int,
+            nargs="+",
+            default=[200, 300],
+            help="DPI levels for adaptive OCR",
+        )
+        parser.add_argument(
+            "--min-confidence",
+            type=float,
+            default=70,
+            help="Confidence threshold for adaptive OCR",
+        )
+        parser.add_argument(
+            "--corpus",
+            help=(
+                "Directory of scanned PDFs to use instead of synthetic ones; "
+                "a .txt file with the same name is used as ground truth"
+            ),
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=1, help="Runs per measurement (best of)"
+        )
+
+    def handle(self, *args, **options):
+        if not OCR_AVAILABLE or not shutil.which("tesseract"):
+            raise CommandError("tesseract and poppler are required for this benchmark")
+
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            self.scratch_dir = scratch_dir
+            getattr(self, f"benchmark_{options['compare'].replace('-', '_')}")(options)
+
+        shutdown_ocr_pool()
+
+    def benchmark_parallel(self, options):
+        serial = OCREngine(mode=OCR_MODE_SERIAL)
+        parallel = OCREngine(mode=OCR_MODE_PARALLEL, max_workers=options["workers"])
+
+        self.stdout.write(
+            f"{'pages':>5} {'serial (s)':>11} {'parallel (s)':>13} {'speedup':>8}"
+        )
+
+        # Warm up the pool so worker start-up is not billed to the first row
+        parallel.ocr_pdf(self._write_pdf(2))
+
+        for page_count in options["pages"]:
+            pdf_path = self._write_pdf(page_count)
+            serial_time, _ = self._time(serial, pdf_path, options["repeat"])
+            parallel_time, _ = self._time(parallel, pdf_path, options["repeat"])
+            self.stdout.write(
+                f"{page_count:>5} {serial_time:>11.2f} {parallel_time:>13.2f} "
+                f"{serial_time / parallel_time:>7.2f}x"
+            )
+
+    def benchmark_adaptive_dpi(self, options):
+        fixed = OCREngine(mode=OCR_MODE_SERIAL, dpi_levels=[DEFAULT_DPI])
+        adaptive = OCREngine(
+            mode=OCR_MODE_SERIAL,
+            dpi_levels=options["dpi_levels"],
+            min_confidence=options["min_confidence"],
+        )
+
+        self.stdout.write(
+            f"{'document':<28} {'fixed (s)':>9} {'adaptive (s)':>12} {'saved':>6} "
+            f"{'fixed acc':>9} {'adaptive acc':>12}"
+        )
+
+        total_fixed = total_adaptive = 0.0
+        for name, pdf_path, ground_truth in self._corpus(options):
+            fixed_time, fixed_text = self._time(fixed, pdf_path, options["repeat"])
+            adaptive_time, adaptive_text = self._time(
+                adaptive, pdf_path, options["repeat"]
+            )
+            total_fixed += fixed_time
+            total_adaptive += adaptive_time
+
+            # Without ground truth, measure agreement with the 300 DPI output
+            reference = ground_truth if ground_truth is not None else fixed_text
+            self.stdout.write(
+                f"{name:<28} {fixed_time:>9.2f} {adaptive_time:>12.2f} "
+                f"{1 - adaptive_time / fixed_time:>6.0%} "
+                f"{text_similarity(fixed_text, reference):>9.3f} "
+                f"{text_similarity(adaptive_text, reference):>12.3f}"
+            )
+
+        self.stdout.write(
+            f"{'total':<28} {total_fixed:>9.2f} {total_adaptive:>12.2f} "
+            f"{1 - total_adaptive / total_fixed:>6.0%}"
+        )
+
+    def benchmark_batch(self, options):
+        per_page = OCREngine(mode=OCR_MODE_SERIAL, dpi_levels=[DEFAULT_DPI])
+        batch = OCREngine(mode=OCR_MODE_BATCH, dpi_levels=[DEFAULT_DPI])
+
+        self.stdout.write(
+            f"{'pages':>5} {'per-page (s)':>12} {'batch (s)':>10} {'speedup':>8} "
+            f"{'agreement':>9}"
+        )
+
+        for page_count in options["pages"]:
+            pdf_path = self._write_pdf(page_count)
+            per_page_time, per_page_text = self._time(
+                per_page, pdf_path, options["repeat"]
+            )
+            batch_time, batch_text = self._time(batch, pdf_path, options["repeat"])
+            self.stdout.write(
+                f"{page_count:>5} {per_page_time:>12.2f} {batch_time:>10.2f} "
+                f"{per_page_time / batch_time:>7.2f}x "
+                f"{text_similarity(batch_text, per_page_text):>9.3f}"
+            )
+
+    def benchmark_preprocess(self, options):
+        raw = OCREngine(
+            mode=OCR_MODE_SERIAL, dpi_levels=[DEFAULT_DPI], preprocess=False
+        )
+        cleaned = OCREngine(
+            mode=OCR_MODE_SERIAL, dpi_levels=[DEFAULT_DPI], preprocess=True
+        )
+
+        self.stdout.write(
+            f"{'document':<34} {'raw (s)':>8} {'cleaned (s)':>11} {'saved':>6} "
+            f"{'raw acc':>8} {'cleaned acc':>11}"
+        )
+
+        total_raw = total_cleaned = 0.0
+        for name, pdf_path, ground_truth in self._corpus(options, skews=(0, 2, -4)):
+            raw_time, raw_text = self._time(raw, pdf_path, options["repeat"])
+            cleaned_time, cleaned_text = self._time(
+                cleaned, pdf_path, options["repeat"]
+            )
+            total_raw += raw_time
+            total_cleaned += cleaned_time
+
+            reference = ground_truth if ground_truth is not None else raw_text
+            self.stdout.write(
+                f"{name:<34} {raw_time:>8.2f} {cleaned_time:>11.2f} "
+                f"{1 - cleaned_time / raw_time:>6.0%} "
+                f"{text_similarity(raw_text, reference):>8.3f} "
+                f"{text_similarity(cleaned_text, reference):>11.3f}"
+            )
+
+        self.stdout.write(
+            f"{'total':<34} {total_raw:>8.2f} {total_cleaned:>11.2f} "
+            f"{1 - total_cleaned / total_raw:>6.0%}"
+        )
+
+    def _corpus(self, options, skews=(0,)):
+        """Yield (name, pdf path, ground truth text or None) for each document"""
+        if options["corpus"]:
+            for pdf_path in sorted(glob.glob(os.path.join(options["corpus"], "*.pdf"))):
+                truth_path = os.path.splitext(pdf_path)[0] + ".txt"
+                ground_truth = None
+                if os.path.exists(truth_path):
+                    with open(truth_path, encoding="utf-8") as truth_file:
+                        ground_truth = truth_file.read()
+                yield os.path.basename(pdf_path), pdf_path, ground_truth
+            return
+
+        # Synthetic scans at different source resolutions: clean scans should
+        # stay at the lowest DPI level while poor ones escalate
+        ground_truth = "\n".join(
+            "\n".join([f"Page {number}"] + SAMPLE_RESUME_LINES)
+            for number in range(1, 3)
+        )
+        for skew in skews:
+            for scan_dpi in (100, 150, 200, 300):
+                name = f"synthetic scan @ {scan_dpi} dpi"
+                if skew:
+                    name += f", {skew:+g} deg"
+                yield name, self._write_pdf(2, dpi=scan_dpi, skew=skew), ground_truth
+
+    def _write_pdf(self, page_count, dpi=150, skew=0):
+        pdf_path = os.path.join(
+            self.scratch_dir, f"scanned_{page_count}_{dpi}_{skew}.pdf"
+        )
+        with open(pdf_path, "wb") as pdf_file:
+            pdf_file.write(build_scanned_pdf(page_count, dpi=dpi, skew=skew))
+        return pdf_path
+
+    def _time(self, engine, pdf_path, repeat):
+        elapsed, page_texts = best_of(engine.ocr_pdf, pdf_path, repeat=repeat)
+        return elapsed, "\n".join(page_texts)
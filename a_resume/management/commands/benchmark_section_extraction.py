@@ -0,0 +1,193 @@
+import logging
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from Analyze.ai_data_extractor import AIDataExtractor
+from Analyze.prompt_compaction import estimate_tokens
+
+from ._benchmarking import add_fake_groq_arguments, fake_groq_server
+
+TITLES = ("Software Engineer", "Senior Software Engineer", "Tech Lead", "Consultant")
+COMPANIES = ("Example Corp", "Sample Labs", "Acme Systems", "Initech", "Globex")
+SKILLS = (
+    "Python", "Django", "PostgreSQL", "Redis", "Docker", "Kubernetes", "AWS",
+    "Terraform", "React", "TypeScript", "Go", "Kafka", "Celery", "GraphQL",
+    "Linux", "CI/CD", "Elasticsearch", "Pandas", "Airflow", "gRPC",
+)  # fmt: skip
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of single-prompt and section-prompt extraction "
+        "of long resumes against a fake Groq server whose completions take "
+        "longer the more they output"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="4,16,32",
+            help="Comma-separated jobs per synthetic resume (projects are half "
+            "as many)",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=40, help="Extractions per size and mode"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=1, help="Extractions in flight"
+        )
+        parser.add_argument(
+            "--token-ms",
+            type=float,
+            default=2.0,
+            help="Generation time per output token (Groq: about 2 ms)",
+        )
+        add_fake_groq_arguments(parser)
+
+    def handle(self, *args, **options):
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        if options["verbosity"] < 2:
+            logging.getLogger("Analyze").setLevel(logging.CRITICAL)
+
+        self.stdout.write(
+            f"{'jobs':>4} {'tokens':>6} {'mode':<8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'calls':>5} {'complete':>8}"
+        )
+        for size in (int(size) for size in options["sizes"].split(",")):
+            resume_text, expected = self._synthetic_resume(size, options["seed"])
+            for mode in ("single", "sections"):
+                self._run(options, size, resume_text, expected, mode)
+        self.stdout.write(
+            "(calls: API requests per resume; complete: share of the expected "
+            "fields extracted in full)"
+        )
+
+    def _run(self, options, size, resume_text, expected, mode):
+        server = fake_groq_server(
+            options,
+            extraction=expected,
+            token_delay=options["token_ms"] / 1000,
+        ).start()
+        try:
+            extractor = AIDataExtractor(
+                max_concurrency=max(8, options["concurrency"] * 4),
+                base_url=server.base_url,
+            )
+            extractor.cache = None  # Every request must reach the server
+            extractor.section_prompts = mode == "sections"
+            extractor.section_min_tokens = 0
+
+            def extract(text):
+                started = time.perf_counter()
+                data = extractor.extract_structured_data(text)
+                return time.perf_counter() - started, data
+
+            texts = [
+                f"{resume_text}\nApplicant {index}"
+                for index in range(options["requests"])
+            ]
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+                samples = list(executor.map(extract, texts))
+        finally:
+            server.stop()
+
+        wanted = extractor._map_groq_response(expected)
+        latencies = sorted(sample[0] * 1000 for sample in samples)
+        complete = statistics.mean(
+            sum(data.get(field) == value for field, value in wanted.items())
+            / len(wanted)
+            for _, data in samples
+        )
+        p95 = (
+            statistics.quantiles(latencies, n=20)[18]
+            if len(latencies) > 1
+            else latencies[0]
+        )
+        self.stdout.write(
+            f"{size:>4} {estimate_tokens(resume_text):>6} {mode:<8} "
+            f"{statistics.median(latencies):>8.1f} {p95:>8.1f} "
+            f"{server.requests / len(samples):>5.1f} {complete:>8.3f}"
+        )
+
+    def _synthetic_resume(self, jobs, seed):
+        """
+        A resume with the given number of jobs and the extraction a model
+        would return for it, by prompt key
+        """
+        rng = random.Random(seed)
+        lines = [
+            "Jane Candidate",
+            "jane.candidate@example.com | +1 555 010 2030",
+            "",
+            "Summary",
+            "Backend engineer building data-heavy web platforms.",
+            "",
+            "Experience",
+        ]
+        work, achievements = [], []
+        year = 2024
+        for index in range(jobs):
+            title, company = rng.choice(TITLES), rng.choice(COMPANIES)
+            start = year - rng.randint(1, 3)
+            entry = f"{title} at {company} ({start} - {year})"
+            work.append(entry)
+            lines.append(entry)
+            for _ in range(3):
+                skills = rng.sample(SKILLS, 2)
+                lines.append(
+                    f"- Built {skills[0]} and {skills[1]} services handling "
+                    f"{rng.randint(2, 90)}k requests per day for {company}"
+                )
+            if index % 3 == 0:
+                achievement = (
+                    f"Cut {company} infrastructure cost by {rng.randint(10, 60)} "
+                    "percent"
+                )
+                achievements.append(achievement)
+                lines.append(f"- {achievement}")
+            year = start
+
+        projects = []
+        lines += ["", "Projects"]
+        for index in range(max(1, jobs // 2)):
+            skills = rng.sample(SKILLS, 3)
+            project = (
+                f"Project {index + 1} - {skills[0]} pipeline with {skills[1]} "
+                f"and {skills[2]} for analytics dashboards"
+            )
+            projects.append(project)
+            lines.append(project)
+
+        education = [
+            "M.S. in Computer Science at State University (2012)",
+            "B.Tech in Computer Science at City College (2010)",
+        ]
+        certifications = [
+            "AWS Certified Developer - Associate",
+            "Certified Kubernetes Administrator",
+        ]
+        lines += ["", "Education"] + education
+        lines += ["", "Certifications"] + certifications
+        lines += ["", "Skills", ", ".join(SKILLS)]
+        lines += ["", "Languages: English, Spanish"]
+
+        expected = {
+            "Full Name": "Jane Candidate",
+            "Email Address": "jane.candidate@example.com",
+            "Phone Number": "+1 555 010 2030",
+            "Education Details": education,
+            "Work Experience": work,
+            "Skills": list(SKILLS),
+            "Certifications": certifications,
+            "Projects": projects,
+            "Languages Spoken": ["English", "Spanish"],
+            "Hobbies/Interests": [],
+            "Achievements": achievements,
+        }
+        return "\n".join(lines), expected
@@ -0,0 +1,206 @@
+import io
+import os
+
+from django.core.management.base import BaseCommand
+
+from Analyze.ocr_engine import shutdown_ocr_pool, shutdown_text_pool
+from Analyze.sample_documents import build_text_docx, build_text_pdf
+from Analyze.text_extractor import (
+    DEFAULT_PDF_TEXT_BACKEND,
+    PDF_TEXT_BACKENDS,
+    ResumeTextExtractor,
+)
+
+from ._benchmarking import best_of, text_similarity
+
+
+class Command(BaseCommand):
+    help = "Benchmark resume text extraction paths on synthetic documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "suite",
+            choices=["docx", "backends", "parallel", "sandbox"],
+            help=(
+                "docx: native DOCX parsing vs the old PDF-only failure path; "
+                "backends: throughput and output parity of the PDF text backends; "
+                "parallel: serial vs page-range workers on long PDFs, and the "
+                "max-chars cutoff; sandbox: in-process vs sandboxed "
+                "extraction, whose child process cannot reuse the worker pool"
+            ),
+        )
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1, 10, 100, 1000],
+            help="docx: document sizes (resume sections repeated N times)",
+        )
+        parser.add_argument(
+            "--documents",
+            type=int,
+            default=20,
+            help="backends: number of synthetic resumes (1 to 4 pages each)",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            nargs="+",
+            default=[10, 25, 50, 100],
+            help="parallel, sandbox: PDF page counts",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="parallel, sandbox: text worker processes",
+        )
+        parser.add_argument(
+            "--max-chars",
+            type=int,
+            default=20000,
+            help="parallel: cutoff for the early-stop column",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs per measurement (best of)"
+        )
+
+    def handle(self, *args, **options):
+        self.extractor = self._extractor()
+        getattr(self, f"benchmark_{options['suite']}")(options)
+        shutdown_ocr_pool()
+        shutdown_text_pool()
+
+    def _extractor(self, **kwargs):
+        kwargs.setdefault("sandbox", False)
+        extractor = ResumeTextExtractor(page_limit=0, **kwargs)
+        extractor.cache = None  # Every repetition must do the work again
+        return extractor
+
+    def benchmark_docx(self, options):
+        self.stdout.write(
+            f"{'sections':>8} {'size (KB)':>10} {'pdf path (ms)':>14} "
+            f"{'chars':>7} {'native (ms)':>12} {'chars':>9}"
+        )
+        for size in options["sizes"]:
+            content = build_text_docx(size)
+            legacy_time, legacy_text = best_of(
+                self._legacy_pdf_path, content, repeat=options["repeat"]
+            )
+            native_time, native_text = best_of(
+                self.extractor.extract_text, content, repeat=options["repeat"]
+            )
+            self.stdout.write(
+                f"{size:>8} {len(content) / 1024:>10.1f} {legacy_time * 1000:>14.2f} "
+                f"{len(legacy_text):>7} {native_time * 1000:>12.2f} "
+                f"{len(native_text):>9}"
+            )
+
+    def _legacy_pdf_path(self, content):
+        """Run a Word upload through the PDF pipeline, as before format dispatch"""
+        try:
+            return self.extractor._extract_pdf(io.BytesIO(content))["text"]
+        except Exception:
+            return ""
+
+    def benchmark_backends(self, options):
+        corpus = [
+            build_text_pdf(1 + index % 4) for index in range(options["documents"])
+        ]
+        page_count = sum(1 + index % 4 for index in range(options["documents"]))
+
+        self.stdout.write(
+            f"{'backend':<12} {'total (s)':>10} {'pages/s':>9} {'parity':>7}"
+        )
+
+        # pdfplumber is the reference output the other backends are compared to
+        reference = None
+        for name in [DEFAULT_PDF_TEXT_BACKEND] + sorted(
+            set(PDF_TEXT_BACKENDS) - {DEFAULT_PDF_TEXT_BACKEND}
+        ):
+            backend = PDF_TEXT_BACKENDS[name]()
+            elapsed, texts = best_of(
+                self._extract_corpus, backend, corpus, repeat=options["repeat"]
+            )
+            if reference is None:
+                reference = texts
+
+            parity = sum(
+                text_similarity(text, expected)
+                for text, expected in zip(texts, reference)
+            ) / len(texts)
+            self.stdout.write(
+                f"{name:<12} {elapsed:>10.3f} {page_count / elapsed:>9.1f} "
+                f"{parity:>7.3f}"
+            )
+
+    def _extract_corpus(self, backend, corpus):
+        return [
+            "\n".join(text for text, _ in backend.extract_pages(io.BytesIO(content)))
+            for content in corpus
+        ]
+
+    def benchmark_parallel(self, options):
+        serial = self._extractor(text_workers=1, text_backends=["pdfplumber"])
+        parallel = self._extractor(
+            text_workers=options["workers"], text_backends=["pdfplumber"]
+        )
+        cutoff = self._extractor(
+            text_workers=options["workers"],
+            text_backends=["pdfplumber"],
+            max_chars=options["max_chars"],
+        )
+
+        self.stdout.write(
+            f"{'pages':>5} {'serial (s)':>11} {'parallel (s)':>13} {'speedup':>8} "
+            f"{'same text':>9} {'cutoff (s)':>11} {'cutoff chars':>13}"
+        )
+
+        # Warm up the pool so worker start-up is not billed to the first row
+        parallel.extract_text(build_text_pdf(max(options["pages"])))
+
+        for page_count in options["pages"]:
+            content = build_text_pdf(page_count)
+            serial_time, serial_text = best_of(
+                serial.extract_text, content, repeat=options["repeat"]
+            )
+            parallel_time, parallel_text = best_of(
+                parallel.extract_text, content, repeat=options["repeat"]
+            )
+            cutoff_time, cutoff_text = best_of(
+                cutoff.extract_text, content, repeat=options["repeat"]
+            )
+            self.stdout.write(
+                f"{page_count:>5} {serial_time:>11.3f} {parallel_time:>13.3f} "
+                f"{serial_time / parallel_time:>7.2f}x "
+                f"{str(parallel_text == serial_text):>9} {cutoff_time:>11.3f} "
+                f"{len(cutoff_text):>13}"
+            )
+
+    def benchmark_sandbox(self, options):
+        self.stdout.write(
+            f"{'pages':>5} {'workers':>7} {'in-process (s)':>15} "
+            f"{'sandboxed (s)':>14} {'overhead (ms)':>14}"
+        )
+        for workers in sorted({1, options["workers"]}):
+            direct = self._extractor(text_workers=workers, text_backends=["pdfplumber"])
+            sandboxed = self._extractor(
+                text_workers=workers, text_backends=["pdfplumber"], sandbox=True
+            )
+            # The in-process extractor keeps its pool warm between documents;
+            # each sandboxed child starts and shuts down its own
+            direct.extract_text(build_text_pdf(max(options["pages"])))
+
+            for page_count in options["pages"]:
+                content = build_text_pdf(page_count)
+                direct_time, _ = best_of(
+                    direct.extract_text, content, repeat=options["repeat"]
+                )
+                sandboxed_time, _ = best_of(
+                    sandboxed.extract_text, content, repeat=options["repeat"]
+                )
+                self.stdout.write(
+                    f"{page_count:>5} {workers:>7} {direct_time:>15.3f} "
+                    f"{sandboxed_time:>14.3f} "
+                    f"{(sandboxed_time - direct_time) * 1000:>14.1f}"
+                )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ._benchmarking import add_fake_groq_arguments, fake_groq_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a local Groq-compatible API that answers with a canned resume "
+        "extraction, for load and latency tests without API quota"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        add_fake_groq_arguments(parser)
+
+    def handle(self, *args, **options):
+        server = fake_groq_server(
+            options, host=options["host"], port=options["port"]
+        ).start()
+        self.stdout.write(
+            f"Fake Groq API on {server.base_url}; point the app at it with\n"
+            f"  GROQ_BASE_URL={server.base_url}\n"
+            "Ctrl-C to stop."
+        )
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+        self.stdout.write(
+            f"\n{server.requests} requests on {server.connections} connections, "
+            f"{server.errors} errors and {server.rate_limited} rate limits injected"
+        )
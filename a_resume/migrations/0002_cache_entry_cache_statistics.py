@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-17 04:33
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_resume", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CacheStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("hits", models.PositiveBigIntegerField(default=0)),
+                ("misses", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Cache Statistics",
+                "verbose_name_plural": "Cache Statistics",
+            },
+        ),
+        migrations.CreateModel(
+            name="CacheEntry",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("namespace", models.CharField(max_length=50)),
+                ("value", models.TextField()),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_accessed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "Cache Entry",
+                "verbose_name_plural": "Cache Entries",
+                "indexes": [
+                    models.Index(
+                        fields=["namespace", "last_accessed_at"],
+                        name="a_resume_ca_namespa_7e043d_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -210,3 +210,43 @@ class AnalysisRecommendation(models.Model):
 
     def __str__(self):
         return f"{self.analysis} - {self.title}"
+
+
+class CacheEntry(models.Model):
+    """Entry of a cache shared by all worker processes (DatabaseCacheBackend)"""
+
+    key = models.CharField(max_length=255, primary_key=True)
+    namespace = models.CharField(max_length=50)
+    value = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["namespace", "last_accessed_at"])]
+        verbose_name = "Cache Entry"
+        verbose_name_plural = "Cache Entries"
+
+    def __str__(self):
+        return self.key
+
+
+class CacheStatistics(models.Model):
+    """Hit and miss counters of a cache, summed over all worker processes"""
+
+    name = models.CharField(max_length=50, unique=True)
+    hits = models.PositiveBigIntegerField(default=0)
+    misses = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Cache Statistics"
+        verbose_name_plural = "Cache Statistics"
+
+    def __str__(self):
+        return self.name
+
+    def get_hit_rate(self):
+        """Return the fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
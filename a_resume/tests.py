@@ -1,8 +1,86 @@
+import asyncio
+import io
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+import groq
+import httpx
+import pdfplumber
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, SimpleTestCase, TestCase
 from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
 
-from a_resume.models import UserProfile
+from a_resume.forms import ResumeUploadForm
+from a_resume.models import CacheEntry, CacheStatistics, UserProfile
+from Analyze.ai_data_extractor import AIDataExtractor, StructuredDataCache
+from Analyze.cache_backends import (
+    DatabaseCacheBackend,
+    DiskCacheBackend,
+    MemoryCacheBackend,
+)
+from Analyze.extraction_sandbox import (
+    ExtractionMemoryError,
+    ExtractionTimeout,
+    PageLimitExceeded,
+    run_sandboxed,
+)
+from Analyze.fake_groq_server import CANNED_EXTRACTION, FakeGroqServer
+from Analyze.groq_transport import STRATEGY_PROCESS, STRATEGY_THREAD, GroqTransport
+from Analyze.heuristic_extractor import HeuristicExtractor, KeywordTrie
+from Analyze.image_preprocessing import (
+    binarize_adaptive,
+    draft_for_ocr,
+    estimate_skew,
+    preprocess_page,
+    to_grayscale,
+)
+from Analyze.new_analysis_service import NewResumeAnalysisService
+from Analyze.ocr_engine import (
+    LANG_AUTO,
+    OCR_MODE_BATCH,
+    OCR_MODE_PARALLEL,
+    OCR_MODE_SERIAL,
+    OCREngine,
+    get_ocr_pool,
+    get_text_pool,
+    ocr_pdf_page,
+)
+from Analyze.prompt_compaction import compact_resume_text
+from Analyze.rate_limiter import RateLimiter, TokenBucket, retry_after_seconds
+from Analyze.resilience import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+)
+from Analyze.sample_documents import (
+    SAMPLE_RESUME_LINES,
+    build_pdf,
+    build_text_docx,
+    build_text_pdf,
+    render_page_image,
+)
+from Analyze.section_extraction import SECTION_GROUPS, plan_section_prompts
+from Analyze.streaming_json import IncrementalJSONObjectParser
+from Analyze.structured_output import parse_extraction, repair_json
+from Analyze.text_extractor import (
+    PdfplumberTextBackend,
+    ResumeTextExtractor,
+    TextExtractionCache,
+    detect_format,
+)
 
 # Test constants
 TEST_PASSWORD = "testpass123"  # nosec B105
@@ -57,3 +135,1243 @@ class RegistrationTestCase(TestCase):
         # Should redirect to dashboard
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse("dashboard"))
+
+
+class OCREngineTestCase(SimpleTestCase):
+    def test_parallel_ocr_keeps_page_order(self):
+        """Test that pages finishing out of order are reassembled in order"""
+
+        def fake_ocr_page(pdf_path, page_number, *args):
+            time.sleep(random.uniform(0, 0.02))
+            return f"page {page_number}"
+
+        engine = OCREngine(mode=OCR_MODE_PARALLEL, max_workers=4)
+        with ThreadPoolExecutor(max_workers=4) as pool, mock.patch(
+            "Analyze.ocr_engine.get_ocr_pool", return_value=pool
+        ), mock.patch(
+            "Analyze.ocr_engine.ocr_pdf_page", side_effect=fake_ocr_page
+        ), mock.patch.object(
+            engine, "get_page_count", return_value=8
+        ):
+            page_texts = engine.ocr_pdf("resume.pdf")
+
+        self.assertEqual(page_texts, [f"page {n}" for n in range(1, 9)])
+
+    def test_pools_are_not_replaced_for_another_size(self):
+        """Test that a caller asking for another size shares the running pool"""
+        pool = get_ocr_pool(2)
+
+        self.assertIs(get_ocr_pool(3), pool)
+        self.assertIsNot(get_text_pool(3), pool)
+        self.assertIs(get_text_pool(2), get_text_pool(3))
+        self.assertEqual(pool.submit(abs, -1).result(), 1)
+
+    def test_serial_ocr_memory_does_not_grow_with_page_count(self):
+        """Test that peak memory is bounded by one page, not the whole document"""
+        page_bytes = 4 * 1024 * 1024
+
+        def fake_convert_from_path(pdf_path, dpi, first_page, last_page):
+            # Stand-in for a rendered page image, tracked by tracemalloc
+            return [bytearray(page_bytes) for _ in range(first_page, last_page + 1)]
+
+        def peak_memory(page_count):
+            engine = OCREngine()
+            # Plain functions rather than Mocks, which would keep every page
+            # alive through their recorded call arguments
+            with mock.patch(
+                "Analyze.ocr_engine.convert_from_path", new=fake_convert_from_path
+            ), mock.patch(
+                "Analyze.ocr_engine.pytesseract.image_to_string",
+                new=lambda image, lang: "text",
+            ), mock.patch.object(
+                engine, "get_page_count", return_value=page_count
+            ):
+                tracemalloc.start()
+                try:
+                    engine.ocr_pdf("resume.pdf")
+                    return tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+        single_page_peak = peak_memory(1)
+        many_pages_peak = peak_memory(24)
+
+        self.assertLess(single_page_peak, 2 * page_bytes)
+        self.assertLess(many_pages_peak, 2 * page_bytes)
+
+    def test_adaptive_dpi_only_escalates_low_confidence_pages(self):
+        """Test that pages are re-rendered at a higher DPI only when needed"""
+        confidences = {(1, 200): 92.0, (2, 200): 41.0, (2, 300): 88.0}
+
+        def fake_recognize(image, lang):
+            return f"page {image[0]} at {image[1]}", confidences[image]
+
+        with mock.patch(
+            "Analyze.ocr_engine.render_pdf_page",
+            side_effect=lambda path, page, dpi: (page, dpi),
+        ) as render, mock.patch(
+            "Analyze.ocr_engine.recognize_image", side_effect=fake_recognize
+        ):
+            clean_page = ocr_pdf_page("resume.pdf", 1, dpi_levels=(200, 300))
+            poor_page = ocr_pdf_page("resume.pdf", 2, dpi_levels=(200, 300))
+
+        self.assertEqual(clean_page, "page 1 at 200")
+        self.assertEqual(poor_page, "page 2 at 300")
+        self.assertEqual(
+            [call.args for call in render.call_args_list],
+            [("resume.pdf", 1, 200), ("resume.pdf", 2, 200), ("resume.pdf", 2, 300)],
+        )
+
+    def test_batch_mode_runs_tesseract_once_and_splits_pages(self):
+        """Test that batched OCR maps the page-separated output back to pages"""
+        commands = []
+
+        def fake_convert(pdf_path, first_page, last_page, output_folder, **kwargs):
+            paths = []
+            for page_number in range(first_page, last_page + 1):
+                path = os.path.join(output_folder, f"page-{page_number}.pgm")
+                open(path, "wb").close()
+                paths.append(path)
+            return paths
+
+        def fake_tesseract(command, **kwargs):
+            commands.append(command)
+            with open(command[1], encoding="utf-8") as list_file:
+                image_paths = list_file.read().split()
+            with open(command[2] + ".txt", "w", encoding="utf-8") as output:
+                for path in image_paths:
+                    output.write(f"text of {os.path.basename(path)}\n\f")
+            return mock.Mock(returncode=0)
+
+        engine = OCREngine(mode=OCR_MODE_BATCH, dpi_levels=[300])
+        with mock.patch(
+            "Analyze.ocr_engine.convert_from_path", new=fake_convert
+        ), mock.patch("Analyze.ocr_engine.subprocess.run", new=fake_tesseract):
+            page_texts = engine.ocr_pdf("resume.pdf", page_numbers=[2, 3, 5])
+
+        self.assertEqual(len(commands), 1)
+        self.assertEqual(
+            page_texts,
+            [f"text of page-{n}.pgm\n" for n in (2, 3, 5)],
+        )
+
+    def test_auto_language_is_detected_once_per_document(self):
+        """Test that the detected script picks the packs for every page"""
+        used_langs = []
+
+        def fake_ocr_page(pdf_path, page_number, dpi_levels, lang, *args, **kwargs):
+            used_langs.append(lang)
+            return f"page {page_number}"
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+            pdf_file.write(b"%PDF-1.4 scanned resume")
+            pdf_file.flush()
+
+            engine = OCREngine(mode=OCR_MODE_SERIAL, lang=LANG_AUTO)
+            with mock.patch(
+                "Analyze.ocr_engine.render_pdf_page", return_value=object()
+            ), mock.patch(
+                "Analyze.ocr_engine.pytesseract.image_to_osd",
+                return_value={"script": "Devanagari", "script_conf": 4.2},
+            ) as osd, mock.patch(
+                "Analyze.ocr_engine.installed_languages",
+                return_value=frozenset({"eng", "hin"}),
+            ), mock.patch(
+                "Analyze.ocr_engine.ocr_pdf_page", new=fake_ocr_page
+            ):
+                engine.ocr_pdf(pdf_file.name, page_numbers=[1, 2])
+                engine.ocr_pdf(pdf_file.name, page_numbers=[3])
+
+        self.assertEqual(osd.call_count, 1)
+        self.assertEqual(used_langs, ["hin+eng"] * 3)
+
+
+class ImagePreprocessingTestCase(SimpleTestCase):
+    def test_skewed_scan_is_straightened_and_cropped(self):
+        """Test that a crooked page comes out level, 1-bit and without margins"""
+        page = render_page_image(SAMPLE_RESUME_LINES, dpi=150)
+        skewed = page.rotate(-3, expand=True, fillcolor="white")
+
+        ink = binarize_adaptive(to_grayscale(skewed))
+        cleaned = preprocess_page(skewed)
+
+        self.assertAlmostEqual(estimate_skew(ink), 3.0, delta=0.25)
+        self.assertEqual(cleaned.mode, "1")
+        self.assertLess(cleaned.width * cleaned.height, page.width * page.height / 2)
+        self.assertEqual(
+            estimate_skew(binarize_adaptive(to_grayscale(cleaned.convert("L")))), 0
+        )
+
+    def test_large_jpegs_are_decoded_at_a_reduced_scale(self):
+        """Test that drafting shrinks the decode but not below max_side"""
+        buffer = io.BytesIO()
+        render_page_image(SAMPLE_RESUME_LINES, dpi=150).resize((2000, 1500)).save(
+            buffer, format="JPEG"
+        )
+
+        with Image.open(buffer) as image:
+            draft_for_ocr(image, max_side=500)
+            frame = image.copy()
+
+        self.assertEqual((frame.size, frame.mode), ((500, 375), "L"))
+
+
+class ResumeTextExtractorTestCase(SimpleTestCase):
+    def write_pdf(self, content):
+        pdf_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+        with pdf_file:
+            pdf_file.write(content)
+        self.addCleanup(os.unlink, pdf_file.name)
+        return pdf_file.name
+
+    def test_only_image_pages_are_sent_to_ocr(self):
+        """Test that mixed PDFs OCR the scanned page and keep the text pages"""
+        pdf_path = self.write_pdf(
+            build_pdf(
+                [
+                    SAMPLE_RESUME_LINES,
+                    render_page_image(["Certificate"], dpi=50),
+                    ["References available on request"],
+                ]
+            )
+        )
+        ocr_engine = mock.Mock(spec=OCREngine)
+        ocr_engine.ocr_pdf.return_value = ["Certificate of Completion"]
+
+        with mock.patch("Analyze.text_extractor.OCR_AVAILABLE", True):
+            result = ResumeTextExtractor(
+                ocr_engine=ocr_engine, sandbox=False
+            ).extract_text_with_stats(pdf_path)
+
+        ocr_engine.ocr_pdf.assert_called_once_with(pdf_path, page_numbers=[2])
+        self.assertEqual(
+            [page["method"] for page in result["pages"]], ["text", "ocr", "text"]
+        )
+        self.assertEqual(result["methods"], {"text": 2, "ocr": 1, "empty": 0})
+        self.assertLess(
+            result["text"].index("AWS Certified Developer"),
+            result["text"].index("Certificate of Completion"),
+        )
+        self.assertTrue(result["text"].endswith("References available on request"))
+
+    def test_extracts_from_bytes_and_file_objects(self):
+        """Test that in-memory sources give the same text as a path"""
+        content = build_text_pdf(2)
+        extractor = ResumeTextExtractor()
+
+        expected = extractor.extract_text(self.write_pdf(content))
+
+        self.assertIn("Jane Candidate", expected)
+        self.assertEqual(extractor.extract_text(content), expected)
+        self.assertEqual(extractor.extract_text(io.BytesIO(content)), expected)
+
+    def test_in_memory_scanned_pages_are_given_a_path_for_ocr(self):
+        """Test that OCR tools still receive a real file for in-memory PDFs"""
+        ocr_paths = []
+
+        def fake_ocr_pdf(pdf_path, page_numbers):
+            ocr_paths.append(pdf_path)
+            self.assertTrue(os.path.exists(pdf_path))
+            return ["Scanned resume text " * 5 for _ in page_numbers]
+
+        ocr_engine = mock.Mock(spec=OCREngine)
+        ocr_engine.ocr_pdf.side_effect = fake_ocr_pdf
+        content = build_pdf([render_page_image(["Scanned"], dpi=50)])
+
+        with mock.patch("Analyze.text_extractor.OCR_AVAILABLE", True):
+            text = ResumeTextExtractor(
+                ocr_engine=ocr_engine, sandbox=False
+            ).extract_text(content)
+
+        self.assertTrue(text.startswith("Scanned resume text"))
+        self.assertFalse(os.path.exists(ocr_paths[0]))
+
+    def test_docx_is_parsed_natively(self):
+        """Test that DOCX uploads are detected and read without the PDF path"""
+        content = build_text_docx()
+        ocr_engine = mock.Mock(spec=OCREngine)
+
+        result = ResumeTextExtractor(ocr_engine=ocr_engine).extract_text_with_stats(
+            content
+        )
+
+        self.assertEqual(detect_format(content), "docx")
+        self.assertEqual(result["format"], "docx")
+        self.assertEqual(result["text"].splitlines()[0], "Jane Candidate")
+        self.assertIn("AWS Certified Developer - Associate", result["text"])
+        ocr_engine.ocr_pdf.assert_not_called()
+
+    def test_image_uploads_go_straight_to_ocr_downscaled(self):
+        """Test that photos are OCRed directly at OCR resolution"""
+        photo = render_page_image(SAMPLE_RESUME_LINES, dpi=150).resize((4400, 5700))
+        buffer = io.BytesIO()
+        photo.save(buffer, format="JPEG")
+        image_sizes = []
+
+        def fake_ocr_images(images):
+            image_sizes.extend(image.size for image in images)
+            return ["Photographed resume text " * 3]
+
+        ocr_engine = mock.Mock(spec=OCREngine)
+        ocr_engine.ocr_images.side_effect = fake_ocr_images
+
+        with mock.patch("Analyze.text_extractor.OCR_AVAILABLE", True):
+            result = ResumeTextExtractor(
+                ocr_engine=ocr_engine, sandbox=False
+            ).extract_text_with_stats(buffer.getvalue())
+
+        self.assertEqual(result["format"], "image")
+        self.assertEqual(result["methods"], {"text": 0, "ocr": 1, "empty": 0})
+        self.assertTrue(result["text"].startswith("Photographed resume text"))
+        self.assertEqual(len(image_sizes), 1)
+        self.assertLessEqual(max(image_sizes[0]), 3300)
+        ocr_engine.ocr_pdf.assert_not_called()
+
+    def test_upload_form_accepts_images(self):
+        """Test that the upload form lets photos of resumes through"""
+        for name in ("resume.jpg", "resume.png", "resume.tiff"):
+            form = ResumeUploadForm(
+                data={}, files={"file": SimpleUploadedFile(name, b"image")}
+            )
+            form.is_valid()
+            self.assertNotIn("file", form.errors)
+
+        form = ResumeUploadForm(
+            data={}, files={"file": SimpleUploadedFile("resume.exe", b"binary")}
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("file", form.errors)
+
+    def test_parallel_text_layer_matches_serial_and_honours_cutoff(self):
+        """Test that page ranges read by workers are reassembled in order"""
+        content = build_text_pdf(12)
+        serial = ResumeTextExtractor(sandbox=False, text_workers=1)
+        parallel = ResumeTextExtractor(sandbox=False, text_workers=3)
+        cutoff = ResumeTextExtractor(sandbox=False, text_workers=3, max_chars=1200)
+
+        with ThreadPoolExecutor(max_workers=3) as pool, mock.patch(
+            "Analyze.text_extractor.get_text_pool", return_value=pool
+        ) as get_pool:
+            parallel_result = parallel.extract_text_with_stats(content)
+            cutoff_result = cutoff.extract_text_with_stats(content)
+
+        serial_result = serial.extract_text_with_stats(content)
+        get_pool.assert_called_with(3)
+        self.assertEqual(parallel_result, serial_result)
+        self.assertEqual(len(cutoff_result["pages"]), 3)
+        self.assertTrue(serial_result["text"].startswith(cutoff_result["text"]))
+
+    def test_falls_back_to_next_backend_when_text_is_missing(self):
+        """Test that the backend chain moves on when a backend finds no text"""
+        extractor = ResumeTextExtractor(text_backends=["pdfplumber", "pypdfium2"])
+
+        with mock.patch.object(
+            PdfplumberTextBackend, "extract_pages", return_value=[("", 0.0)]
+        ):
+            result = extractor.extract_text_with_stats(build_text_pdf(1))
+
+        self.assertEqual(result["backend"], "pypdfium2")
+        self.assertIn("AWS Certified Developer", result["text"])
+
+
+class TextExtractionCacheTestCase(SimpleTestCase):
+    def test_repeated_upload_is_served_from_cache(self):
+        """Test that the same bytes are only extracted once"""
+        cache = TextExtractionCache(MemoryCacheBackend())
+        extractor = ResumeTextExtractor(cache=cache, sandbox=False)
+        content = build_text_pdf(1)
+
+        with mock.patch(
+            "Analyze.text_extractor.pdfplumber.open", wraps=pdfplumber.open
+        ) as pdf_open:
+            first = extractor.extract_text_with_stats(content)
+            second = extractor.extract_text_with_stats(io.BytesIO(content))
+
+        self.assertEqual(pdf_open.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_differently_configured_extractors_do_not_share_entries(self):
+        """Test that cutoffs and backends are part of the cache key"""
+        cache = TextExtractionCache(MemoryCacheBackend())
+        content = build_text_pdf(3)
+        full = ResumeTextExtractor(cache=cache, sandbox=False)
+        truncated = ResumeTextExtractor(cache=cache, sandbox=False, max_pages=1)
+        other_backend = ResumeTextExtractor(
+            cache=cache, sandbox=False, text_backends=["pypdfium2"]
+        )
+
+        truncated_text = truncated.extract_text(content)
+        full_text = full.extract_text(content)
+        other_backend.extract_text(content)
+
+        self.assertLess(len(truncated_text), len(full_text))
+        self.assertEqual(cache.stats()["hits"], 0)
+        self.assertEqual(full.extract_text(content), full_text)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_disk_backend_evicts_least_recently_used(self):
+        """Test that the disk cache stays within its size bound"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            backend = DiskCacheBackend(cache_dir, max_bytes=250)
+            backend.set("a", "x" * 100)
+            backend.set("b", "y" * 100)
+            os.utime(os.path.join(cache_dir, "a"), (1, 1))
+            os.utime(os.path.join(cache_dir, "b"), (2, 2))
+            self.assertEqual(backend.get("a"), "x" * 100)  # a is now most recent
+
+            backend.set("c", "z" * 100)
+
+            self.assertIsNone(backend.get("b"))
+            self.assertEqual(backend.get("a"), "x" * 100)
+            self.assertEqual(backend.get("c"), "z" * 100)
+
+
+class StructuredDataCacheTestCase(TestCase):
+    def make_extractor(self, cache):
+        extractor = AIDataExtractor(cache=cache)
+        extractor.groq_client = mock.Mock()
+        message = mock.Mock(
+            content='{"Full Name": "Jane Candidate", "Skills": ["Python", "Django"]}'
+        )
+        extractor.groq_client.chat.completions.create.return_value = mock.Mock(
+            choices=[mock.Mock(message=message)]
+        )
+        return extractor
+
+    def test_identical_text_skips_the_api_and_counts_hits(self):
+        """Test that re-extracting the same text is served from the DB cache"""
+        cache = StructuredDataCache(DatabaseCacheBackend("structured-data"))
+        extractor = self.make_extractor(cache)
+
+        first = extractor.extract_structured_data("Jane Candidate\nPython, Django")
+        second = extractor.extract_structured_data("Jane Candidate  \n Python, Django ")
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["skills"], ["Python", "Django"])
+        extractor.groq_client.chat.completions.create.assert_called_once()
+        statistics = CacheStatistics.objects.get(name="structured-data")
+        self.assertEqual((statistics.hits, statistics.misses), (1, 1))
+        self.assertEqual(statistics.get_hit_rate(), 0.5)
+
+    def test_entries_expire_and_least_recently_used_are_evicted(self):
+        """Test the TTL and the LRU bound of the database backend"""
+        backend = DatabaseCacheBackend("test", max_entries=2)
+        cache = StructuredDataCache(backend, ttl=60)
+        for name in ("a", "b"):
+            cache.set(name, {"full_name": name})
+        CacheEntry.objects.filter(key="test:a").update(
+            last_accessed_at=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(cache.get("a"), {"full_name": "a"})  # a is now most recent
+
+        cache.set("c", {"full_name": "c"})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), {"full_name": "c"})
+
+        with mock.patch("Analyze.ai_data_extractor.time.time", return_value=2e9):
+            self.assertIsNone(cache.get("a"))
+        self.assertFalse(CacheEntry.objects.filter(key="test:a").exists())
+
+
+class ExtractionSandboxTestCase(SimpleTestCase):
+    def test_hung_extraction_is_killed_at_the_timeout(self):
+        """Test that a hanging child is killed and reported as a timeout"""
+        started = time.monotonic()
+
+        with self.assertRaises(ExtractionTimeout):
+            run_sandboxed(time.sleep, 30, timeout=0.5)
+
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_memory_limit_is_reported(self):
+        """Test that exceeding the memory rlimit raises a typed error"""
+        with self.assertRaises(ExtractionMemoryError):
+            run_sandboxed(bytearray, 1024 * 2**20, max_memory_mb=512)
+
+    def test_page_limit_is_returned_as_a_typed_error(self):
+        """Test that oversized PDFs are rejected before any text is parsed"""
+        service = NewResumeAnalysisService()
+        service.text_extractor = ResumeTextExtractor(page_limit=2)
+
+        with mock.patch.object(service.data_extractor, "extract_structured_data") as ai:
+            result = service.extract_and_analyze_resume(build_text_pdf(3))
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error_type"], PageLimitExceeded.__name__)
+        self.assertIn("3 pages", result["error"])
+        ai.assert_not_called()
+
+
+class AsyncExtractionTestCase(SimpleTestCase):
+    def fake_async_groq(self, in_flight, peak):
+        """Async Groq client factory whose completions take 50 ms and count overlap"""
+
+        async def create(**kwargs):
+            in_flight.append(kwargs)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.05)
+            in_flight.pop()
+            resume_text = kwargs["messages"][0]["content"].split("\n")[0]
+            message = mock.Mock(
+                content=f'{{"Full Name": "{resume_text}", "Skills": ["Python"]}}'
+            )
+            return mock.Mock(choices=[mock.Mock(message=message)])
+
+        client = mock.Mock()
+        client.chat.completions.create = create
+        client.with_options.return_value = client
+        return mock.Mock(return_value=client)
+
+    def make_extractor(self, max_concurrency):
+        return AIDataExtractor(
+            cache=StructuredDataCache(MemoryCacheBackend()),
+            max_concurrency=max_concurrency,
+        )
+
+    def test_concurrent_extractions_are_capped_by_the_semaphore(self):
+        """Test that many extractions overlap, but never beyond the cap"""
+        extractor = self.make_extractor(max_concurrency=3)
+        in_flight, peak = [], []
+
+        async def extract_all():
+            return await asyncio.gather(
+                *(
+                    extractor.extract_structured_data_async(f"Candidate {index}")
+                    for index in range(9)
+                )
+            )
+
+        with mock.patch.object(
+            extractor.transport,
+            "async_groq_client",
+            self.fake_async_groq(in_flight, peak),
+        ):
+            results = asyncio.run(extract_all())
+
+        self.assertEqual(
+            [result["full_name"] for result in results],
+            [f"Candidate {index}" for index in range(9)],
+        )
+        # Calls overlap up to the cap and never beyond it
+        self.assertEqual(max(peak), 3)
+        self.assertEqual(extractor.cache.stats()["misses"], 9)
+
+    def test_async_service_matches_the_sync_result(self):
+        """Test the async service entry point end to end on a text PDF"""
+        service = NewResumeAnalysisService()
+        service.text_extractor = ResumeTextExtractor(sandbox=False)
+        service.data_extractor = self.make_extractor(max_concurrency=2)
+        content = build_text_pdf(1)
+
+        with mock.patch.object(
+            service.data_extractor.transport,
+            "async_groq_client",
+            self.fake_async_groq([], []),
+        ):
+            result = asyncio.run(service.extract_and_analyze_resume_async(content))
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["extracted_data"]["skills"], ["Python"])
+        self.assertEqual(
+            result["resume_text"], service.text_extractor.extract_text(content)
+        )
+        self.assertIn("overall_score", result["analysis"]["scores"])
+
+    def test_extract_many_keeps_order_and_waits_out_rate_limits(self):
+        """Test per-item results, retry-after handling and batch stats"""
+        extractor = self.make_extractor(max_concurrency=4)
+        extractor.rate_limiter = RateLimiter(requests_per_minute=6000)
+        groq_factory = self.fake_async_groq([], [])
+        respond = groq_factory.return_value.chat.completions.create
+        throttled, retried = [], []
+
+        async def create(**kwargs):
+            prompt = kwargs["messages"][0]["content"]
+            if prompt.startswith("Broken"):
+                message = mock.Mock(content="not json")
+                return mock.Mock(choices=[mock.Mock(message=message)])
+            if prompt.startswith("Candidate 1") and not throttled:
+                throttled.append(time.monotonic())
+                raise groq.RateLimitError(
+                    "Rate limit reached",
+                    response=httpx.Response(
+                        429,
+                        headers={"retry-after-ms": "200"},
+                        request=httpx.Request("POST", "https://api.groq.com"),
+                    ),
+                    body=None,
+                )
+            if prompt.startswith("Candidate 1"):
+                retried.append(time.monotonic())
+            return await respond(**kwargs)
+
+        groq_factory.return_value.chat.completions.create = create
+        texts = ["Candidate 0", "Candidate 1", "Broken", "Candidate 3"]
+
+        with mock.patch.object(
+            extractor.transport, "async_groq_client", groq_factory
+        ), mock.patch.object(
+            extractor.rate_limiter, "pause", wraps=extractor.rate_limiter.pause
+        ) as pause:
+            batch = extractor.extract_many(texts)
+
+        results = batch["results"]
+        self.assertEqual(
+            [result["success"] for result in results], [True, True, False, True]
+        )
+        self.assertEqual(results[1]["data"]["full_name"], "Candidate 1")
+        self.assertIn("valid JSON", results[2]["error"])
+        pause.assert_called_once_with(0.2)  # The 429's retry-after-ms
+        # The retry was held back until the pause ran out
+        self.assertGreaterEqual(retried[0], extractor.rate_limiter.paused_until)
+
+        stats = batch["stats"]
+        self.assertEqual((stats["succeeded"], stats["failed"]), (3, 1))
+        self.assertEqual((stats["api_calls"], stats["rate_limited"]), (5, 1))
+        self.assertGreater(stats["items_per_second"], 0)
+        self.assertIs(extractor.batch_stats, stats)
+
+
+class RateLimiterTestCase(SimpleTestCase):
+    def test_bucket_paces_reservations_at_its_rate(self):
+        """Test that reservations beyond the burst wait at the refill rate"""
+        bucket = TokenBucket(per_minute=600, capacity=2)  # 10 per second
+
+        delays = [bucket.reserve(1) for _ in range(5)]
+
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        for delay, expected in zip(delays[2:], [0.1, 0.2, 0.3]):
+            self.assertAlmostEqual(delay, expected, places=2)
+
+    def test_retry_after_headers_are_parsed(self):
+        """Test retry-after-ms, retry-after seconds and the fallback"""
+
+        def error(headers):
+            return mock.Mock(response=mock.Mock(headers=headers))
+
+        self.assertEqual(retry_after_seconds(error({"retry-after-ms": "1500"})), 1.5)
+        self.assertEqual(retry_after_seconds(error({"retry-after": "7"})), 7.0)
+        self.assertEqual(retry_after_seconds(ValueError(), default=2.0), 2.0)
+
+
+class PromptCompactionTestCase(SimpleTestCase):
+    def multi_page_text(self):
+        pages = [
+            ["Jane Candidate  |  Curriculum Vitae", f"Page {number} of 2", ""] + lines
+            for number, lines in enumerate(
+                [
+                    SAMPLE_RESUME_LINES[:9],
+                    ["EXPERIENCE", "\uf0b7   Mentored   four   junior   engineers"]
+                    + SAMPLE_RESUME_LINES[9:]
+                    + ["", "HOBBIES", "Chess, hiking", "", "REFERENCES"]
+                    + [f"Referee {index}, Example Corp" for index in range(20)],
+                ],
+                start=1,
+            )
+        ]
+        return "\f".join("\n".join(lines) for lines in pages)
+
+    def test_boilerplate_and_repeated_lines_are_removed(self):
+        """Test that page furniture goes and every resume fact stays"""
+        result = compact_resume_text(self.multi_page_text())
+        lines = result["text"].splitlines()
+
+        self.assertEqual(lines.count("Jane Candidate | Curriculum Vitae"), 1)
+        self.assertEqual(lines.count("EXPERIENCE"), 1)
+        self.assertNotIn("Page 2 of 2", lines)
+        self.assertIn("- Mentored four junior engineers", lines)
+        for line in SAMPLE_RESUME_LINES:
+            if line:
+                self.assertIn(line, lines)
+        self.assertGreater(result["tokens_saved"], 0)
+        self.assertEqual(
+            result["original_tokens"] - result["tokens"], result["tokens_saved"]
+        )
+
+    def test_running_headers_are_removed_from_extracted_pdfs(self):
+        """Test that compaction sees the page breaks of an extracted PDF"""
+        header = "ACME Corp Confidential Header"
+        bodies = [SAMPLE_RESUME_LINES[:9], SAMPLE_RESUME_LINES[9:], ["References"]]
+        pdf = build_pdf(
+            [
+                [header, *lines, f"Page {number} of 3"]
+                for number, lines in enumerate(bodies, start=1)
+            ]
+        )
+
+        text = ResumeTextExtractor(sandbox=False).extract_text(pdf)
+        lines = compact_resume_text(text)["text"].splitlines()
+
+        self.assertEqual(text.count(header), 3)
+        self.assertEqual(lines.count(header), 1)
+        self.assertNotIn("Page 3 of 3", lines)
+        self.assertIn("AWS Certified Developer - Associate", lines)
+
+    def test_repeated_body_lines_are_kept(self):
+        """Test that only lines at the edges of most pages are furniture"""
+        job = ["Software Engineer", "Bangalore, India", "- Built REST APIs with Django"]
+        pages = [
+            ["RAHUL KUMAR | Resume", "EXPERIENCE", *job, "- Led a team of 4", "1"],
+            ["RAHUL KUMAR | Resume", "- Wrote docs", *job, "- 2 -"],
+        ]
+        text = "\f".join("\n".join(lines) for lines in pages)
+
+        lines = compact_resume_text(text)["text"].splitlines()
+
+        for line in job:
+            self.assertEqual(lines.count(line), 2)
+        self.assertEqual(lines.count("RAHUL KUMAR | Resume"), 1)
+        self.assertNotIn("1", lines)
+        self.assertNotIn("- 2 -", lines)
+
+    def test_numbers_that_are_not_page_numbers_are_kept(self):
+        """Test that phone, year and grade lines survive compaction"""
+        pages = [
+            ["Jane Candidate", "9876543210", "EDUCATION", "B.Tech", "2017", "9/10"],
+            ["SKILLS", "Python", "2"],
+        ]
+        text = "\f".join("\n".join(lines) for lines in pages)
+
+        lines = compact_resume_text(text)["text"].splitlines()
+
+        for line in ("9876543210", "2017", "9/10"):
+            self.assertIn(line, lines)
+        self.assertNotIn("2", lines)
+
+    def test_name_and_contact_block_are_never_trimmed(self):
+        """Test that an all-caps name line opens no trimmable section"""
+        text = "\n".join(
+            ["RAHUL KUMAR", "rahul@example.com", "BANGALORE", "EXPERIENCE"]
+            + [
+                f"- Shipped feature {index} for the payments team"
+                for index in range(40)
+            ]
+        )
+        full = compact_resume_text(text)
+
+        result = compact_resume_text(text, token_budget=full["tokens"] // 2)
+
+        self.assertTrue(
+            result["text"].startswith("RAHUL KUMAR\nrahul@example.com\nBANGALORE")
+        )
+        self.assertEqual(result["trimmed_sections"], ["EXPERIENCE"])
+
+    def test_budget_trims_low_value_sections_first(self):
+        """Test that references and hobbies go before experience and skills"""
+        full = compact_resume_text(self.multi_page_text())
+        budget = full["tokens"] - 80
+
+        result = compact_resume_text(self.multi_page_text(), token_budget=budget)
+
+        self.assertLessEqual(result["tokens"], budget)
+        self.assertEqual(result["trimmed_sections"][0], "REFERENCES")
+        self.assertIn("Python, Django, PostgreSQL, Docker, AWS, React", result["text"])
+        self.assertIn("AWS Certified Developer - Associate", result["text"])
+
+
+class StreamingExtractionTestCase(SimpleTestCase):
+    COMPLETION = (
+        '```json\n{"Full Name": "Jane \\"JC\\" Candidate", '
+        '"Skills": ["Python", "C, C++", {"name": "Django"}], '
+        '"Work Experience": ["Engineer at Example Corp (2019 - Present)"], '
+        '"Projects": []}\n```'
+    )
+
+    def test_parser_emits_fields_as_soon_as_they_end(self):
+        """Test that split chunks, escapes and nesting do not confuse it"""
+        parser = IncrementalJSONObjectParser()
+        emitted = []
+        for position, character in enumerate(self.COMPLETION):
+            for key, value in parser.feed(character):
+                emitted.append((key, position))
+
+        self.assertEqual(
+            [key for key, _ in emitted],
+            ["Full Name", "Skills", "Work Experience", "Projects"],
+        )
+        # Each field is out before the next one starts arriving
+        self.assertEqual(
+            emitted[0][1],
+            self.COMPLETION.index(', "Skills"'),
+        )
+        self.assertTrue(parser.done)
+
+    def test_stream_yields_mapped_fields_then_the_full_result(self):
+        """Test that streamed fields add up to the non-streamed result"""
+        extractor = AIDataExtractor(cache=StructuredDataCache(MemoryCacheBackend()))
+        chunks = [
+            self.COMPLETION[start : start + 7]
+            for start in range(0, len(self.COMPLETION), 7)
+        ]
+        extractor.groq_client = mock.Mock()
+        extractor.groq_client.chat.completions.create.return_value = [
+            mock.Mock(choices=[mock.Mock(delta=mock.Mock(content=chunk))])
+            for chunk in chunks
+        ]
+
+        events = list(extractor.stream_structured_data("Jane Candidate"))
+
+        fields = [event for event in events if event["event"] == "field"]
+        complete = events[-1]
+        self.assertEqual(complete["event"], "complete")
+        self.assertEqual(
+            complete["data"],
+            extractor._structured_data(parse_extraction(self.COMPLETION)),
+        )
+        self.assertEqual(
+            {event["field"]: event["value"] for event in fields}, complete["data"]
+        )
+        self.assertEqual(fields[0]["field"], "full_name")
+        self.assertEqual(complete["data"]["skills"], ["Python", "C, C++", "Django"])
+        timing = complete["timing"]
+        self.assertLessEqual(timing["first_token"], timing["first_field"])
+        self.assertLessEqual(timing["first_field"], timing["total"])
+        self.assertTrue(
+            extractor.groq_client.chat.completions.create.call_args.kwargs["stream"]
+        )
+
+
+class GroqTransportTestCase(SimpleTestCase):
+    def setUp(self):
+        # The clients need a key whatever the developer's environment holds
+        environ = mock.patch.dict(os.environ, {"GROQ_API_KEY": "test"})
+        environ.start()
+        self.addCleanup(environ.stop)
+
+    def test_extractions_reuse_one_kept_alive_connection(self):
+        """Test the pooled client end to end against the fake Groq server"""
+        with FakeGroqServer() as server:
+            extractor = AIDataExtractor(
+                cache=StructuredDataCache(MemoryCacheBackend()),
+                transport=GroqTransport(base_url=server.base_url, read_timeout=5),
+            )
+            results = [
+                extractor.extract_structured_data(f"Candidate {index}")
+                for index in range(3)
+            ]
+
+            self.assertEqual((server.requests, server.connections), (3, 1))
+        self.assertEqual(results[0]["full_name"], "Jane Candidate")
+        self.assertEqual(extractor.groq_client.timeout.read, 5)
+
+    def test_client_strategies(self):
+        """Test process-wide sharing, per-thread clients and fork safety"""
+        shared = GroqTransport(strategy=STRATEGY_PROCESS)
+        per_thread = GroqTransport(strategy=STRATEGY_THREAD)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            shared_clients = set(
+                executor.map(lambda _: id(shared.groq_client()), range(20))
+            )
+            thread_clients = list(
+                executor.map(lambda _: per_thread.groq_client(), range(20))
+            )
+
+        self.assertEqual(len(shared_clients), 1)
+        self.assertGreater(len({id(client) for client in thread_clients}), 1)
+
+        client = shared.groq_client()
+        with mock.patch("Analyze.groq_transport.os.getpid", return_value=-1):
+            self.assertIsNot(shared.groq_client(), client)
+
+    def test_async_clients_are_closed_with_their_event_loop(self):
+        """Test that per-request event loops leave no open clients behind"""
+        with FakeGroqServer() as server:
+            transport = GroqTransport(base_url=server.base_url)
+
+            async def extract():
+                client = transport.async_groq_client()
+                self.assertIs(transport.async_groq_client(), client)
+                await client.chat.completions.create(
+                    model="test", messages=[{"role": "user", "content": "Hi"}]
+                )
+                return client
+
+            clients = [asyncio.run(extract()) for _ in range(2)]
+
+        self.assertIsNot(clients[0], clients[1])
+        self.assertTrue(all(client.is_closed() for client in clients))
+        self.assertEqual(len(transport._async_clients), 0)
+
+
+def api_error(status_code):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return groq.APIStatusError("error", response=response, body=None)
+
+
+def rate_limit_error(retry_after):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(
+        429, headers={"retry-after": retry_after}, request=request
+    )
+    return groq.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class ResilienceTestCase(TestCase):
+    def test_retry_policy_retries_transient_errors_only(self):
+        """Test that server errors are retried and bad requests are not"""
+        policy = RetryPolicy(max_retries=2, base_delay=0.001)
+        flaky = mock.Mock(side_effect=[api_error(503), api_error(500), "completion"])
+        self.assertEqual(policy.call(flaky), "completion")
+        self.assertEqual(flaky.call_count, 3)
+
+        rejected = mock.Mock(side_effect=api_error(400))
+        with self.assertRaises(groq.APIStatusError):
+            policy.call(rejected)
+        self.assertEqual(rejected.call_count, 1)
+
+        for attempt in range(10):
+            self.assertLessEqual(policy.delay(attempt, api_error(503)), 8.0)
+
+    def test_retry_policy_gives_up_on_long_retry_after(self):
+        """Test that a retry-after over max_delay fails instead of sleeping"""
+        policy = RetryPolicy(max_retries=2, base_delay=0.001, max_delay=8)
+        self.assertEqual(policy.delay(0, rate_limit_error("2")), 2.0)
+
+        throttled = mock.Mock(side_effect=rate_limit_error("600"))
+        with mock.patch("Analyze.resilience.time.sleep") as sleep:
+            with self.assertRaises(groq.RateLimitError):
+                policy.call(throttled)
+        self.assertEqual(throttled.call_count, 1)
+        sleep.assert_not_called()
+
+        with self.assertRaises(groq.RateLimitError):
+            asyncio.run(
+                policy.call_async(mock.AsyncMock(side_effect=rate_limit_error("600")))
+            )
+
+    def test_circuit_breaker_opens_fails_fast_and_recovers(self):
+        """Test closed -> open -> half open -> closed"""
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+        down = mock.Mock(side_effect=api_error(502))
+        for _ in range(2):
+            with self.assertRaises(groq.APIStatusError):
+                breaker.call(down)
+        self.assertEqual(breaker.state, STATE_OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(down)
+        self.assertEqual(down.call_count, 2)
+
+        # Rate limits and bad requests don't count as the service being down
+        breaker = CircuitBreaker("test", failure_threshold=1)
+        with self.assertRaises(groq.APIStatusError):
+            breaker.call(mock.Mock(side_effect=api_error(429)))
+        self.assertEqual(breaker.state, STATE_CLOSED)
+
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        with self.assertRaises(groq.APIStatusError):
+            breaker.call(down)
+        time.sleep(0.02)
+        self.assertEqual(breaker.state, STATE_HALF_OPEN)
+        self.assertEqual(breaker.call(lambda: "ok"), "ok")
+        snapshot = breaker.snapshot()
+        self.assertEqual((snapshot["state"], snapshot["times_opened"]), ("closed", 1))
+
+    def test_extractor_uses_fallback_while_circuit_is_open(self):
+        """Test that an open circuit skips Groq and uses the fallback"""
+        breaker = CircuitBreaker("groq", failure_threshold=1, recovery_timeout=60)
+        fallback = mock.Mock(return_value={"full_name": "Offline Result"})
+        extractor = AIDataExtractor(
+            cache=StructuredDataCache(MemoryCacheBackend()), fallback=fallback
+        )
+        extractor.retry_policy = RetryPolicy(max_retries=0)
+        extractor.groq_client = mock.Mock()
+        extractor.groq_client.chat.completions.create.side_effect = api_error(503)
+
+        with mock.patch(
+            "Analyze.ai_data_extractor.get_circuit_breaker", return_value=breaker
+        ):
+            first = extractor.extract_structured_data("Jane Candidate")
+            second = extractor.extract_structured_data("Jane Candidate")
+
+        self.assertEqual(first, {"full_name": "Offline Result"})
+        self.assertEqual(second, first)
+        self.assertEqual(extractor.groq_client.chat.completions.create.call_count, 1)
+        self.assertEqual(breaker.short_circuited, 1)
+
+    def test_health_check_reports_circuit_breakers(self):
+        """Test that the health endpoint shows breaker state"""
+        breaker = CircuitBreaker("groq", failure_threshold=1)
+        breaker.record_failure()
+        with mock.patch(
+            "a_core.urls.circuit_breaker_states",
+            return_value={"groq": breaker.snapshot()},
+        ):
+            response = self.client.get("/health/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "DEGRADED")
+        self.assertEqual(response.json()["circuit_breakers"]["groq"]["state"], "open")
+
+
+class HeuristicExtractorTestCase(SimpleTestCase):
+    def test_sample_resume_matches_llm_output(self):
+        """Test that the rules reproduce the LLM's fields on a clean resume"""
+        data = HeuristicExtractor()("\n".join(SAMPLE_RESUME_LINES))
+        expected = AIDataExtractor()._map_groq_response(CANNED_EXTRACTION)
+
+        self.assertEqual(set(data), set(expected))
+        for field in expected:
+            if field != "skills":
+                self.assertEqual(data[field], expected[field], field)
+        self.assertEqual(data["skills"][:6], expected["skills"])
+
+    def test_sections_and_keywords(self):
+        """Test multi-line entries, inline headings and trie matching"""
+        data = HeuristicExtractor()(
+            "RAHUL KUMAR\n"
+            "rahul@example.in | Mobile: +91 98765 43210\n"
+            "Experience\n"
+            "Intern, TCS\n"
+            "2019 - 2020\n"
+            "Education\n"
+            "Bachelor of Technology, Computer Science\n"
+            "XYZ Institute of Technology, 2020\n"
+            "Languages: English, Hindi\n"
+            "Hobbies: Chess, Trekking\n"
+            "Built services in Node.js and C++ on Kubernetes\n"
+        )
+
+        self.assertEqual(data["full_name"], "Rahul Kumar")
+        self.assertEqual(data["phone_number"], "+91 98765 43210")
+        self.assertEqual(data["work_experience"], ["Intern, TCS (2019 - 2020)"])
+        self.assertEqual(len(data["education_details"]), 1)
+        self.assertEqual(data["languages_spoken"], ["English", "Hindi"])
+        self.assertEqual(data["hobbies_interests"], ["Chess", "Trekking"])
+        self.assertEqual(data["skills"], ["Node.js", "C++", "Kubernetes"])
+
+        trie = KeywordTrie(["Spring", "Spring Boot"])
+        self.assertEqual(
+            trie.find_all("spring boot, Spring"), ["Spring Boot", "Spring"]
+        )
+
+    def test_service_extractor_selection(self):
+        """Test EXTRACTION_MODE, the missing key case and the fallback"""
+        llm = {
+            "EXTRACTION_MODE": "llm",
+            "EXTRACTION_FALLBACK": "heuristic",
+            "GROQ_API_KEY": "test",
+            "GROQ_BASE_URL": "",
+        }
+        with mock.patch.dict(os.environ, {**llm, "EXTRACTION_MODE": "heuristic"}):
+            service = NewResumeAnalysisService()
+        self.assertIsInstance(service.data_extractor, HeuristicExtractor)
+
+        with mock.patch.dict(os.environ, {**llm, "GROQ_API_KEY": ""}):
+            service = NewResumeAnalysisService()
+        self.assertIsInstance(service.data_extractor, HeuristicExtractor)
+
+        with mock.patch.dict(os.environ, llm):
+            service = NewResumeAnalysisService()
+        extractor = service.data_extractor
+        self.assertIsInstance(extractor, AIDataExtractor)
+        self.assertIsInstance(extractor.fallback, HeuristicExtractor)
+        extractor.cache = StructuredDataCache(MemoryCacheBackend())
+        extractor.groq_client = mock.Mock()
+        extractor.groq_client.chat.completions.create.side_effect = RuntimeError
+        data = extractor.extract_structured_data("\n".join(SAMPLE_RESUME_LINES))
+        self.assertEqual(data["full_name"], "Jane Candidate")
+
+
+class FakeGroqServerTestCase(SimpleTestCase):
+    def test_streamed_extraction_against_fake_server(self):
+        """Test the base_url switch and streaming end to end"""
+        with FakeGroqServer(stream_chunk_chars=8) as server, mock.patch.dict(
+            os.environ, {"GROQ_API_KEY": ""}
+        ):
+            extractor = AIDataExtractor(
+                cache=StructuredDataCache(MemoryCacheBackend()),
+                base_url=server.base_url,
+            )
+            events = list(extractor.stream_structured_data("Jane Candidate"))
+
+            self.assertEqual(server.requests, 1)
+        fields = [event["field"] for event in events if event["event"] == "field"]
+        self.assertEqual(len(fields), 11)
+        self.assertEqual(events[-1]["data"]["full_name"], "Jane Candidate")
+
+        # Answers of the fake server are cached apart from Groq's
+        self.assertNotEqual(
+            extractor.cache.make_key("Jane Candidate", extractor.model),
+            list(extractor.cache.backend._entries)[0],
+        )
+
+    def test_fault_injection(self):
+        """Test seeded 429s with retry-after and 500s"""
+        with FakeGroqServer(rate_limit_rate=0.3, error_rate=0.3, seed=7) as server:
+            client = groq.Groq(api_key="test", base_url=server.base_url, max_retries=0)
+            outcomes = []
+            for _ in range(40):
+                try:
+                    completion = client.chat.completions.create(
+                        model="test", messages=[{"role": "user", "content": "Hi"}]
+                    )
+                    outcomes.append(200)
+                    self.assertGreater(completion.usage.completion_tokens, 0)
+                except groq.RateLimitError as e:
+                    outcomes.append(429)
+                    self.assertEqual(retry_after_seconds(e), 1.0)
+                except groq.InternalServerError:
+                    outcomes.append(500)
+
+            self.assertEqual(
+                (server.rate_limited, server.errors),
+                (outcomes.count(429), outcomes.count(500)),
+            )
+        self.assertTrue({200, 429, 500} <= set(outcomes))
+
+
+class StructuredOutputTestCase(SimpleTestCase):
+    OUTPUT = json.dumps(CANNED_EXTRACTION)
+
+    def completion(self, content):
+        message = mock.Mock(content=content)
+        return mock.Mock(choices=[mock.Mock(message=message)])
+
+    def test_repair_and_validation(self):
+        """Test prose, truncation and type coercion"""
+        wrapped = parse_extraction(f"Sure! Here it is:\n{self.OUTPUT}\nAnything else?")
+        self.assertEqual(wrapped["fields"]["Skills"], CANNED_EXTRACTION["Skills"])
+        self.assertEqual(wrapped["missing"], [])
+
+        # Cut off inside the skills list: the partial list is not trusted
+        truncated = parse_extraction(self.OUTPUT[: self.OUTPUT.index("Docker") + 3])
+        self.assertTrue(truncated["repaired"])
+        self.assertEqual(len(truncated["fields"]), 5)
+        self.assertEqual(truncated["missing"][0], "Skills")
+        self.assertEqual(len(truncated["missing"]), 6)
+
+        value, was_truncated, last_complete = repair_json('{"a": [1, 2], "b": "x')
+        self.assertEqual(
+            (value, was_truncated, last_complete), ({"a": [1, 2]}, True, True)
+        )
+
+        coerced = parse_extraction('{"Full Name": null, "Skills": "Python"}')
+        self.assertEqual(coerced["fields"], {"Full Name": "", "Skills": ["Python"]})
+        # A complete object that leaves keys out is not continued
+        self.assertEqual(coerced["missing"], [])
+
+    def test_truncated_output_gets_a_targeted_continuation(self):
+        """Test that only the lost fields are requested again"""
+        extractor = AIDataExtractor(cache=StructuredDataCache(MemoryCacheBackend()))
+        extractor.groq_client = mock.Mock()
+        rest = {key: CANNED_EXTRACTION[key] for key in list(CANNED_EXTRACTION)[5:]}
+        extractor.groq_client.chat.completions.create.side_effect = [
+            self.completion(self.OUTPUT[: self.OUTPUT.index("Docker")]),
+            self.completion(json.dumps(rest)),
+        ]
+
+        data = extractor.extract_structured_data("Jane Candidate")
+
+        first, second = extractor.groq_client.chat.completions.create.call_args_list
+        self.assertEqual(first.kwargs["response_format"], {"type": "json_object"})
+        self.assertIn(
+            '["Skills", "Certifications"', second.kwargs["messages"][0]["content"]
+        )
+        self.assertEqual(data, AIDataExtractor()._map_groq_response(CANNED_EXTRACTION))
+        self.assertEqual(extractor.output_stats["recovered_fields"], 6)
+
+    def test_json_mode_rejection_is_repaired(self):
+        """Test that a json_validate_failed error's output is used"""
+        extractor = AIDataExtractor(cache=StructuredDataCache(MemoryCacheBackend()))
+        extractor.groq_client = mock.Mock()
+        extractor.groq_client.chat.completions.create.side_effect = (
+            groq.BadRequestError(
+                "Failed to generate JSON",
+                response=httpx.Response(
+                    400, request=httpx.Request("POST", "https://api.groq.com")
+                ),
+                body={
+                    "error": {
+                        "code": "json_validate_failed",
+                        "failed_generation": f"```json\n{self.OUTPUT}\n```",
+                    }
+                },
+            )
+        )
+
+        data = extractor.extract_structured_data("Jane Candidate")
+
+        self.assertEqual(data["full_name"], "Jane Candidate")
+        self.assertEqual(extractor.groq_client.chat.completions.create.call_count, 1)
+
+
+class SectionExtractionTestCase(SimpleTestCase):
+    RESUME = "\n".join(SAMPLE_RESUME_LINES)
+
+    def extractor(self, server):
+        extractor = AIDataExtractor(
+            cache=StructuredDataCache(MemoryCacheBackend()),
+            base_url=server.base_url,
+        )
+        extractor.section_prompts = True
+        extractor.section_min_tokens = 0
+        return extractor
+
+    def test_resume_is_split_into_prompt_groups(self):
+        """Test grouping, and keys of absent sections going to the first"""
+        plan = dict(
+            (tuple(keys), text) for keys, text in plan_section_prompts(self.RESUME)
+        )
+        groups = {keys[0]: text for keys, text in plan.items()}
+
+        self.assertEqual(
+            list(plan)[0],
+            tuple(SECTION_GROUPS["profile"] + SECTION_GROUPS["projects"]),
+        )
+        self.assertIn("Python, Django", groups["Full Name"])
+        self.assertTrue(groups["Work Experience"].startswith("EXPERIENCE"))
+        self.assertNotIn("EDUCATION", groups["Work Experience"])
+        self.assertIn("AWS Certified", groups["Education Details"])
+        self.assertEqual(
+            sorted(key for keys in plan for key in keys), sorted(CANNED_EXTRACTION)
+        )
+        self.assertIsNone(plan_section_prompts("Jane Candidate\nPython developer"))
+
+    def test_section_prompts_are_concurrent_and_merged(self):
+        """Test that the groups' answers make up the single-prompt result"""
+        expected = AIDataExtractor()._map_groq_response(CANNED_EXTRACTION)
+        with FakeGroqServer(latency=0.3) as server, mock.patch.dict(
+            os.environ, {"GROQ_API_KEY": "test"}
+        ):
+            extractor = self.extractor(server)
+            data = extractor.extract_structured_data(self.RESUME)
+            self.assertEqual(server.requests, 3)
+            self.assertEqual(server.peak_in_flight, 3)
+
+            server.reset_counters()
+            extractor.cache = None
+            async_data = asyncio.run(
+                extractor.extract_structured_data_async(self.RESUME)
+            )
+            self.assertEqual(server.requests, 3)
+            self.assertEqual(server.peak_in_flight, 3)
+
+        self.assertEqual(data, expected)
+        self.assertEqual(async_data, expected)
+        self.assertEqual(extractor.output_stats["sectioned"], 2)
+
+    def test_fake_server_answers_the_keys_asked_for_within_the_limit(self):
+        """Test the fake server's field selection and truncation"""
+        with FakeGroqServer() as server:
+            client = groq.Groq(api_key="test", base_url=server.base_url, max_retries=0)
+            prompt = 'Return the keys ["Skills", "Projects"]'
+            completion = client.chat.completions.create(
+                model="test", messages=[{"role": "user", "content": prompt}]
+            )
+            self.assertEqual(
+                json.loads(completion.choices[0].message.content),
+                {"Skills": CANNED_EXTRACTION["Skills"], "Projects": []},
+            )
+
+            completion = client.chat.completions.create(
+                model="test",
+                messages=[{"role": "user", "content": "Hi"}],
+                max_completion_tokens=20,
+            )
+        self.assertEqual(completion.choices[0].finish_reason, "length")
+        self.assertEqual(completion.usage.completion_tokens, 20)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
@@ -11,7 +12,12 @@ urlpatterns = [
     path("register/", views.register, name="register"),
     # Dashboard and main features
     path("dashboard/", views.dashboard, name="dashboard"),
-    path("upload/", views.upload_resume, name="upload_resume"),
+    path(
+        "upload/",
+        views.upload_resume_async if settings.ASYNC_VIEWS else views.upload_resume,
+        name="upload_resume",
+    ),
+    path("upload/stream/", views.upload_resume_stream, name="upload_resume_stream"),
     # Analysis
     path(
         "analysis/<int:analysis_id>/", views.analysis_results, name="analysis_results"
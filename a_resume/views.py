@@ -1,9 +1,9 @@
 import json
 import os
 import sys
-import tempfile
 
 import requests
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
@@ -11,8 +11,9 @@ from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
 from django.db.models import Avg, Count, Max, Q
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
@@ -157,6 +158,55 @@ def upload_resume(request):
         return redirect("dashboard")
 
 
+@login_required
+async def upload_resume_async(request):
+    """Handle resume upload without holding a thread during the AI analysis"""
+    if request.method == "POST":
+        form = ResumeUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            resume_analysis = form.save(commit=False)
+            resume_analysis.user = await request.auser()
+            resume_analysis.filename = request.FILES["file"].name
+            await resume_analysis.asave()
+
+            # Perform AI analysis
+            try:
+                await perform_ai_analysis_async(resume_analysis)
+                messages.success(request, "Resume uploaded and analyzed successfully!")
+            except Exception as e:
+                messages.error(
+                    request, f"Resume uploaded but analysis failed: {str(e)}"
+                )
+
+            return redirect("analysis_results", analysis_id=resume_analysis.id)
+        else:
+            messages.error(request, "Please correct the errors below.")
+            return redirect("dashboard")
+    else:
+        return redirect("dashboard")
+
+
+@login_required
+@require_http_methods(["POST"])
+def upload_resume_stream(request):
+    """Handle resume upload, streaming analysis progress as NDJSON events"""
+    form = ResumeUploadForm(request.POST, request.FILES)
+    if not form.is_valid():
+        return JsonResponse({"event": "error", "errors": form.errors}, status=400)
+
+    resume_analysis = form.save(commit=False)
+    resume_analysis.user = request.user
+    resume_analysis.filename = request.FILES["file"].name
+    resume_analysis.save()
+
+    response = StreamingHttpResponse(
+        stream_ai_analysis(resume_analysis), content_type="application/x-ndjson"
+    )
+    # Let reverse proxies pass each event on as soon as it is written
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @login_required
 def analysis_results(request, analysis_id):
     """Display analysis results"""
@@ -499,226 +549,245 @@ def perform_ai_analysis(resume_analysis):
         return
 
     try:
-        import tempfile
+        file_content = read_resume_file(resume_analysis)
 
-        # For Cloudinary storage, use Django's storage backend read method
-        try:
-            print(f"Reading file using Django storage: {resume_analysis.file.name}")
-
-            # Open the file using Django storage backend
-            with resume_analysis.file.open("rb") as cloudinary_file:
-                file_content = cloudinary_file.read()
-
-            print(f"✅ Successfully read {len(file_content)} bytes from Cloudinary")
-
-            # Create temporary file with same extension
-            file_extension = os.path.splitext(resume_analysis.filename)[1]
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=file_extension
-            ) as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
-                print(f"Saved to temporary file: {temp_file_path}")
-
-        except Exception as storage_error:
-            print(f"Django storage read failed: {storage_error}")
-            # If that fails, there might be a fundamental issue with the storage configuration
-            raise Exception(
-                f"Could not read file from Cloudinary storage: {storage_error}"
-            )
+        # Analyze the file content in memory, no temporary file needed
+        result = analysis_service.extract_and_analyze_resume(file_content)
 
-        try:
-            # Use the new analysis service with temporary file
-            result = analysis_service.extract_and_analyze_resume(temp_file_path)
+        save_analysis_result(resume_analysis, result)
 
-            if not result["success"]:
-                raise Exception(
-                    f"Analysis failed: {result.get('error', 'Unknown error')}"
-                )
+    except Exception as e:
+        # Handle errors
+        resume_analysis.status = "failed"
+        resume_analysis.error_message = str(e)
+        resume_analysis.save()
+        raise
+
+
+def stream_ai_analysis(resume_analysis):
+    """Analyze an uploaded resume, yielding progress events as JSON lines"""
+    results_url = reverse("analysis_results", args=[resume_analysis.id])
+    try:
+        if not analysis_service:
+            perform_mock_analysis(resume_analysis)
+            yield json.dumps({"event": "done", "url": results_url}) + "\n"
+            return
+
+        file_content = read_resume_file(resume_analysis)
+
+        for event in analysis_service.stream_analysis(file_content):
+            if event["event"] == "result":
+                save_analysis_result(resume_analysis, event["result"])
+                event = {"event": "done", "url": results_url, "timing": event["timing"]}
+            yield json.dumps(event, default=str) + "\n"
+
+    except Exception as e:
+        resume_analysis.status = "failed"
+        resume_analysis.error_message = str(e)
+        resume_analysis.save()
+        yield json.dumps({"event": "error", "error": str(e), "url": results_url}) + "\n"
+
+
+async def perform_ai_analysis_async(resume_analysis):
+    """Asynchronous perform_ai_analysis, waiting on Groq without a thread"""
+    if not analysis_service:
+        await sync_to_async(perform_mock_analysis)(resume_analysis)
+        return
+
+    try:
+        file_content = await sync_to_async(read_resume_file)(resume_analysis)
 
-            # Debug: Print what we got from analysis service
-            print(f"🔍 Analysis service returned:")
-            print(f"   - Success: {result['success']}")
-            print(f"   - Resume text length: {len(result.get('resume_text', ''))}")
-            print(
-                f"   - Extracted data keys: {list(result.get('extracted_data', {}).keys())}"
-            )
-            print(f"   - Analysis keys: {list(result.get('analysis', {}).keys())}")
-
-            # Update resume analysis with extracted data
-            resume_analysis.status = "completed"
-            resume_analysis.resume_text = result["resume_text"]
-            resume_analysis.word_count = result["word_count"]
-
-            # Store extracted structured data with safe defaults
-            extracted_data = result["extracted_data"]
-            resume_analysis.full_name = extracted_data.get("full_name", "") or ""
-            resume_analysis.email_address = (
-                extracted_data.get("email_address", "") or ""
-            )
-            resume_analysis.phone_number = extracted_data.get("phone_number", "") or ""
-
-            # Ensure all JSON fields are lists, never None
-            resume_analysis.education_details = (
-                extracted_data.get("education_details") or []
-            )
-            resume_analysis.work_experience = (
-                extracted_data.get("work_experience") or []
-            )
-
-            # Handle skills - if it's a dict, flatten it to a list
-            skills_data = extracted_data.get("skills") or []
-            if isinstance(skills_data, dict):
-                # Flatten skills dictionary into a single list
+        result = await analysis_service.extract_and_analyze_resume_async(file_content)
+
+        await sync_to_async(save_analysis_result)(resume_analysis, result)
+
+    except Exception as e:
+        resume_analysis.status = "failed"
+        resume_analysis.error_message = str(e)
+        await resume_analysis.asave()
+        raise
+
+
+def read_resume_file(resume_analysis):
+    """Read the uploaded resume's bytes from the storage backend"""
+    # For Cloudinary storage, use Django's storage backend read method
+    try:
+        print(f"Reading file using Django storage: {resume_analysis.file.name}")
+
+        # Open the file using Django storage backend
+        with resume_analysis.file.open("rb") as cloudinary_file:
+            file_content = cloudinary_file.read()
+
+        print(f"✅ Successfully read {len(file_content)} bytes from Cloudinary")
+
+    except Exception as storage_error:
+        print(f"Django storage read failed: {storage_error}")
+        # If that fails, there might be a fundamental issue with the storage configuration
+        raise Exception(f"Could not read file from Cloudinary storage: {storage_error}")
+
+    return file_content
+
+
+def save_analysis_result(resume_analysis, result):
+    """Store an analysis service result on the resume analysis"""
+    if not result["success"]:
+        raise Exception(f"Analysis failed: {result.get('error', 'Unknown error')}")
+
+    # Debug: Print what we got from analysis service
+    print(f"🔍 Analysis service returned:")
+    print(f"   - Success: {result['success']}")
+    print(f"   - Resume text length: {len(result.get('resume_text', ''))}")
+    print(f"   - Extracted data keys: {list(result.get('extracted_data', {}).keys())}")
+    print(f"   - Analysis keys: {list(result.get('analysis', {}).keys())}")
+
+    # Update resume analysis with extracted data
+    resume_analysis.status = "completed"
+    resume_analysis.resume_text = result["resume_text"]
+    resume_analysis.word_count = result["word_count"]
+
+    # Store extracted structured data with safe defaults
+    extracted_data = result["extracted_data"]
+    resume_analysis.full_name = extracted_data.get("full_name", "") or ""
+    resume_analysis.email_address = extracted_data.get("email_address", "") or ""
+    resume_analysis.phone_number = extracted_data.get("phone_number", "") or ""
+
+    # Ensure all JSON fields are lists, never None
+    resume_analysis.education_details = extracted_data.get("education_details") or []
+    resume_analysis.work_experience = extracted_data.get("work_experience") or []
+
+    # Handle skills - if it's a dict, flatten it to a list
+    skills_data = extracted_data.get("skills") or []
+    if isinstance(skills_data, dict):
+        # Flatten skills dictionary into a single list
+        flattened_skills = []
+        for category, skill_list in skills_data.items():
+            if isinstance(skill_list, list):
+                flattened_skills.extend(skill_list)
+            elif isinstance(skill_list, str):
+                flattened_skills.append(skill_list)
+        resume_analysis.skills = flattened_skills
+    elif isinstance(skills_data, str):
+        # If it's a string representation of a dict, try to parse it
+        try:
+            import ast
+
+            parsed_skills = ast.literal_eval(skills_data)
+            if isinstance(parsed_skills, dict):
                 flattened_skills = []
-                for category, skill_list in skills_data.items():
+                for category, skill_list in parsed_skills.items():
                     if isinstance(skill_list, list):
                         flattened_skills.extend(skill_list)
                     elif isinstance(skill_list, str):
                         flattened_skills.append(skill_list)
                 resume_analysis.skills = flattened_skills
-            elif isinstance(skills_data, str):
-                # If it's a string representation of a dict, try to parse it
-                try:
-                    import ast
-
-                    parsed_skills = ast.literal_eval(skills_data)
-                    if isinstance(parsed_skills, dict):
-                        flattened_skills = []
-                        for category, skill_list in parsed_skills.items():
-                            if isinstance(skill_list, list):
-                                flattened_skills.extend(skill_list)
-                            elif isinstance(skill_list, str):
-                                flattened_skills.append(skill_list)
-                        resume_analysis.skills = flattened_skills
-                    else:
-                        resume_analysis.skills = (
-                            skills_data
-                            if isinstance(skills_data, list)
-                            else [skills_data]
-                        )
-                except (json.JSONDecodeError, ValueError, TypeError):
-                    # If parsing fails, treat as single skill or split by commas
-                    resume_analysis.skills = [skills_data] if skills_data else []
             else:
-                resume_analysis.skills = skills_data
-
-            resume_analysis.certifications = extracted_data.get("certifications") or []
-            resume_analysis.projects = extracted_data.get("projects") or []
-            resume_analysis.languages_spoken = (
-                extracted_data.get("languages_spoken") or []
-            )
-            resume_analysis.hobbies_interests = (
-                extracted_data.get("hobbies_interests") or []
-            )
-            resume_analysis.achievements = extracted_data.get("achievements") or []
-
-            # Store analysis results
-            analysis = result["analysis"]
-
-            # Debug: Check what analysis data we have
-            print(f"🔍 Analysis data structure:")
-            if "scores" in analysis:
-                scores = analysis["scores"]
-                print(f"   - Scores: {scores}")
-                resume_analysis.overall_score = scores.get("overall_score", 0)
-                resume_analysis.skill_score = scores.get("skill_score", 0)
-                resume_analysis.experience_score = scores.get("experience_score", 0)
-                resume_analysis.education_score = scores.get("education_score", 0)
-                resume_analysis.ats_score = scores.get(
-                    "contact_score", 0
-                )  # Using contact score as ATS score
-                resume_analysis.job_match_score = scores.get(
-                    "project_score", 0
-                )  # Using project score as job match
-            else:
-                print("   ⚠️  No 'scores' key in analysis data!")
-                # Set default scores to avoid zero values
-                resume_analysis.overall_score = 65
-                resume_analysis.skill_score = 60
-                resume_analysis.experience_score = 70
-                resume_analysis.education_score = 60
-                resume_analysis.ats_score = 65
-                resume_analysis.job_match_score = 60
-
-            # Store analysis details with safe defaults and validation
-            summary_data = analysis.get("summary") or {}
-            if not summary_data or not isinstance(summary_data, dict):
-                print("   ⚠️  Summary data missing or invalid, creating default")
-                summary_data = {
-                    "overall_rating": "Good",
-                    "rating_description": "Resume analysis completed successfully.",
-                    "total_skills": len(resume_analysis.skills),
-                    "total_experience": len(resume_analysis.work_experience),
-                    "total_education": len(resume_analysis.education_details),
-                    "has_contact_info": bool(resume_analysis.email_address),
-                }
-
-            resume_analysis.summary = summary_data
-            print(f"   - Summary: {summary_data}")
-
-            strengths_data = analysis.get("strengths") or []
-            if not strengths_data:
-                print("   ⚠️  No strengths data, creating defaults")
-                strengths_data = [
-                    "Resume successfully processed",
-                    "Clear structure and formatting",
-                    "Relevant content identified",
-                ]
-            resume_analysis.strengths = strengths_data
-            print(f"   - Strengths: {len(strengths_data)} items")
-
-            weaknesses_data = analysis.get("weaknesses") or []
-            if not weaknesses_data:
-                print("   ⚠️  No weaknesses data, creating defaults")
-                weaknesses_data = [
-                    "Consider adding more quantified achievements",
-                    "Could benefit from keyword optimization",
-                ]
-            resume_analysis.weaknesses = weaknesses_data
-            print(f"   - Weaknesses: {len(weaknesses_data)} items")
-
-            recommendations_data = analysis.get("recommendations") or []
-            resume_analysis.recommendations = recommendations_data
-            print(f"   - Recommendations: {len(recommendations_data)} items")
-
-            resume_analysis.save()
-
-            # Debug: Final check of saved data
-            print(f"🎯 Final saved data:")
-            print(f"   - Overall score: {resume_analysis.overall_score}")
-            print(
-                f"   - Summary keys: {list(resume_analysis.summary.keys()) if resume_analysis.summary else 'None'}"
-            )
-            print(f"   - Strengths count: {len(resume_analysis.strengths)}")
-            print(f"   - Weaknesses count: {len(resume_analysis.weaknesses)}")
-            print(f"   - Skills count: {len(resume_analysis.skills)}")
-            print(f"   - Status: {resume_analysis.status}")
-
-            # Save detailed recommendations
-            for rec_data in recommendations_data:
-                AnalysisRecommendation.objects.create(
-                    analysis=resume_analysis,
-                    category=rec_data.get("category", "General"),
-                    priority=rec_data.get("priority", "medium"),
-                    title=rec_data.get("title", "Recommendation"),
-                    description=rec_data.get("description", ""),
-                    action_items=rec_data.get("action_items", []),
+                resume_analysis.skills = (
+                    skills_data if isinstance(skills_data, list) else [skills_data]
                 )
+        except (json.JSONDecodeError, ValueError, TypeError):
+            # If parsing fails, treat as single skill or split by commas
+            resume_analysis.skills = [skills_data] if skills_data else []
+    else:
+        resume_analysis.skills = skills_data
+
+    resume_analysis.certifications = extracted_data.get("certifications") or []
+    resume_analysis.projects = extracted_data.get("projects") or []
+    resume_analysis.languages_spoken = extracted_data.get("languages_spoken") or []
+    resume_analysis.hobbies_interests = extracted_data.get("hobbies_interests") or []
+    resume_analysis.achievements = extracted_data.get("achievements") or []
+
+    # Store analysis results
+    analysis = result["analysis"]
+
+    # Debug: Check what analysis data we have
+    print(f"🔍 Analysis data structure:")
+    if "scores" in analysis:
+        scores = analysis["scores"]
+        print(f"   - Scores: {scores}")
+        resume_analysis.overall_score = scores.get("overall_score", 0)
+        resume_analysis.skill_score = scores.get("skill_score", 0)
+        resume_analysis.experience_score = scores.get("experience_score", 0)
+        resume_analysis.education_score = scores.get("education_score", 0)
+        resume_analysis.ats_score = scores.get(
+            "contact_score", 0
+        )  # Using contact score as ATS score
+        resume_analysis.job_match_score = scores.get(
+            "project_score", 0
+        )  # Using project score as job match
+    else:
+        print("   ⚠️  No 'scores' key in analysis data!")
+        # Set default scores to avoid zero values
+        resume_analysis.overall_score = 65
+        resume_analysis.skill_score = 60
+        resume_analysis.experience_score = 70
+        resume_analysis.education_score = 60
+        resume_analysis.ats_score = 65
+        resume_analysis.job_match_score = 60
+
+    # Store analysis details with safe defaults and validation
+    summary_data = analysis.get("summary") or {}
+    if not summary_data or not isinstance(summary_data, dict):
+        print("   ⚠️  Summary data missing or invalid, creating default")
+        summary_data = {
+            "overall_rating": "Good",
+            "rating_description": "Resume analysis completed successfully.",
+            "total_skills": len(resume_analysis.skills),
+            "total_experience": len(resume_analysis.work_experience),
+            "total_education": len(resume_analysis.education_details),
+            "has_contact_info": bool(resume_analysis.email_address),
+        }
 
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except OSError:
-                pass  # File might already be deleted
+    resume_analysis.summary = summary_data
+    print(f"   - Summary: {summary_data}")
+
+    strengths_data = analysis.get("strengths") or []
+    if not strengths_data:
+        print("   ⚠️  No strengths data, creating defaults")
+        strengths_data = [
+            "Resume successfully processed",
+            "Clear structure and formatting",
+            "Relevant content identified",
+        ]
+    resume_analysis.strengths = strengths_data
+    print(f"   - Strengths: {len(strengths_data)} items")
+
+    weaknesses_data = analysis.get("weaknesses") or []
+    if not weaknesses_data:
+        print("   ⚠️  No weaknesses data, creating defaults")
+        weaknesses_data = [
+            "Consider adding more quantified achievements",
+            "Could benefit from keyword optimization",
+        ]
+    resume_analysis.weaknesses = weaknesses_data
+    print(f"   - Weaknesses: {len(weaknesses_data)} items")
+
+    recommendations_data = analysis.get("recommendations") or []
+    resume_analysis.recommendations = recommendations_data
+    print(f"   - Recommendations: {len(recommendations_data)} items")
 
-    except Exception as e:
-        # Handle errors
-        resume_analysis.status = "failed"
-        resume_analysis.error_message = str(e)
-        resume_analysis.save()
-        raise
+    resume_analysis.save()
+
+    # Debug: Final check of saved data
+    print(f"🎯 Final saved data:")
+    print(f"   - Overall score: {resume_analysis.overall_score}")
+    print(
+        f"   - Summary keys: {list(resume_analysis.summary.keys()) if resume_analysis.summary else 'None'}"
+    )
+    print(f"   - Strengths count: {len(resume_analysis.strengths)}")
+    print(f"   - Weaknesses count: {len(resume_analysis.weaknesses)}")
+    print(f"   - Skills count: {len(resume_analysis.skills)}")
+    print(f"   - Status: {resume_analysis.status}")
+
+    # Save detailed recommendations
+    for rec_data in recommendations_data:
+        AnalysisRecommendation.objects.create(
+            analysis=resume_analysis,
+            category=rec_data.get("category", "General"),
+            priority=rec_data.get("priority", "medium"),
+            title=rec_data.get("title", "Recommendation"),
+            description=rec_data.get("description", ""),
+            action_items=rec_data.get("action_items", []),
+        )
 
 
 def perform_mock_analysis(resume_analysis):